@@ -0,0 +1,50 @@
+"""
+Time batch backtests of random portfolios over a synthetic price panel.
+
+Run from the finance/ directory:
+
+    python -m benchmarks.bench_backtest
+    python -m benchmarks.bench_backtest --tickers 500 --days 2500 --portfolios 20000 --workers 4
+
+For each rebalancing schedule it prepares a Backtest (5 bp costs) and runs
+the whole weight matrix in memory-bounded chunks, in process and, with
+--workers, on a process pool.
+"""
+
+import argparse
+import os
+import time
+
+from marketdata.backtest import REBALANCE, Backtest, random_weights
+
+from .synthetic import synthetic_table
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark marketdata.backtest on synthetic data.")
+    parser.add_argument("--tickers", type=int, default=500)
+    parser.add_argument("--days", type=int, default=2500)
+    parser.add_argument("--portfolios", type=int, default=5000)
+    parser.add_argument("--workers", type=int, default=min(4, os.cpu_count() or 1))
+    parser.add_argument("--cost-bps", type=float, default=5.0)
+    args = parser.parse_args(argv)
+
+    table = synthetic_table(args.tickers, args.days)
+    weights = random_weights(args.portfolios, args.tickers)
+    print(f"{args.portfolios:,} portfolios x {args.tickers} tickers x {args.days} days, "
+          f"{os.cpu_count()} CPUs")
+    print(f"{'schedule':>9} {'workers':>8} {'prepare s':>10} {'run s':>8} {'portfolios/s':>13}")
+    for schedule in REBALANCE:
+        start = time.perf_counter()
+        backtest = Backtest.from_table(table, rebalance=schedule, cost_bps=args.cost_bps)
+        prepare = time.perf_counter() - start
+        for workers in dict.fromkeys([None, args.workers if args.workers > 1 else None]):
+            start = time.perf_counter()
+            backtest.run(weights, workers=workers)
+            seconds = time.perf_counter() - start
+            print(f"{schedule:>9} {workers or 1:>8} {prepare:>10.2f} {seconds:>8.2f} "
+                  f"{args.portfolios / seconds:>13,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Time the batch efficient-frontier solver and the cached moments.
+
+Run from the finance/ directory:
+
+    python -m benchmarks.bench_frontier
+    python -m benchmarks.bench_frontier --tickers 20,50,100,200 --points 60
+
+For each ticker count, prints the time to solve the long-only and the
+short-allowed frontier, the largest miss of a target return, and the time
+to compute the moments from scratch versus updating them for a shifted
+period (what the dashboard does when the period selector changes).
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from marketdata.correlation import aligned_returns
+from marketdata.frontier import FRONTIER_POINTS, MomentCache, efficient_frontier
+
+from .synthetic import synthetic_table
+
+
+def timed(function, *args, **kwargs):
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark marketdata.frontier on synthetic data.")
+    parser.add_argument("--tickers", default="20,50,100", help="comma-separated ticker counts")
+    parser.add_argument("--days", type=int, default=1500)
+    parser.add_argument("--points", type=int, default=FRONTIER_POINTS)
+    args = parser.parse_args(argv)
+
+    print(f"{args.days} days of history, {args.points} frontier points")
+    print(f"{'tickers':>8} {'long-only s':>12} {'target miss':>12} {'shorts s':>9} "
+          f"{'moments s':>10} {'shifted s':>10}")
+    for n in (int(t) for t in args.tickers.split(",") if t):
+        dates, tickers, returns = aligned_returns(synthetic_table(n, args.days))
+        cache = MomentCache()
+        (mean, cov), full = timed(cache.moments, (dates, tickers, returns))
+        # A window moved by a quarter: most of it overlaps the cached one
+        shift = len(dates) // 4
+        _, shifted = timed(cache.moments, (dates, tickers, returns), dates[shift], dates[-shift])
+
+        frontier, long_only = timed(efficient_frontier, mean, cov, args.points)
+        targets = np.linspace(frontier["returns"][0], mean.max(), args.points)
+        miss = np.abs(frontier["returns"] - targets).max()
+        _, shorts = timed(efficient_frontier, mean, cov, args.points, long_only=False)
+        print(f"{n:>8} {long_only:>12.3f} {miss:>12.2e} {shorts:>9.3f} {full:>10.4f} {shifted:>10.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Time the chunked Monte Carlo simulator and check that memory stays flat.
+
+Run from the finance/ directory:
+
+    python -m benchmarks.bench_montecarlo
+    python -m benchmarks.bench_montecarlo --paths 100000,1000000,5000000 --workers 4
+
+Simulates an equal-weight portfolio of synthetic tickers with both models,
+in process and on a process pool, and prints paths/s, the 95% VaR/CVaR and
+the peak RSS after each run (which should not grow with the path count).
+"""
+
+import argparse
+import os
+import resource
+import time
+
+from marketdata.correlation import aligned_returns
+from marketdata.montecarlo import MODELS, PortfolioSimulator
+
+from .synthetic import synthetic_table
+
+
+def peak_mb():
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark marketdata.montecarlo on synthetic data.")
+    parser.add_argument("--tickers", type=int, default=8)
+    parser.add_argument("--days", type=int, default=1000)
+    parser.add_argument("--paths", default="100000,1000000", help="comma-separated path counts")
+    parser.add_argument("--horizon", type=int, default=252)
+    parser.add_argument("--workers", type=int, default=min(4, os.cpu_count() or 1))
+    args = parser.parse_args(argv)
+
+    aligned = aligned_returns(synthetic_table(args.tickers, args.days))
+    print(f"{args.tickers} tickers, {args.days} days of history, horizon {args.horizon}, {os.cpu_count()} CPUs")
+    print(f"{'model':>10} {'paths':>10} {'workers':>8} {'s':>7} {'paths/s':>10} {'VaR95':>7} {'CVaR95':>7} {'peak MB':>8}")
+    for model in MODELS:
+        simulator = PortfolioSimulator.from_aligned(aligned, model=model)
+        for paths in (int(p) for p in args.paths.split(",") if p):
+            for workers in dict.fromkeys([None, args.workers if args.workers > 1 else None]):
+                start = time.perf_counter()
+                summary = simulator.run(paths, args.horizon, workers=workers)
+                seconds = time.perf_counter() - start
+                print(f"{model:>10} {paths:>10,} {workers or 1:>8} {seconds:>7.2f} {paths / seconds:>10,.0f} "
+                      f"{summary.var():>7.2%} {summary.cvar():>7.2%} {peak_mb():>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
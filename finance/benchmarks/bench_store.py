@@ -0,0 +1,67 @@
+"""
+Compare loading stock_data.json against the columnar price store.
+
+Run from the finance/ directory:
+
+    python -m benchmarks.bench_store
+
+For each size it writes both formats to a temporary directory, then times the
+full load into the dashboard DataFrame and records peak traced memory.
+"""
+
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+
+from marketdata.store import export_json, read_store, write_store
+
+from .synthetic import synthetic_table
+
+SIZES = [(4, 100), (50, 1000), (500, 2500)]
+
+
+def load_json(path):
+    with open(path) as f:
+        df = pd.DataFrame(json.load(f))
+    df["Date"] = pd.to_datetime(df["Date"])
+    return df
+
+
+def load_store(path):
+    return read_store(path).to_frame()
+
+
+def measure(fn, path, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(path)
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    fn(path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+
+def main():
+    print(f"{'size':>12} {'format':>6} {'bytes':>12} {'load ms':>9} {'peak MB':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_tickers, n_days in SIZES:
+            table = synthetic_table(n_tickers, n_days)
+            json_path = os.path.join(tmp, "stock_data.json")
+            store_path = os.path.join(tmp, "stock_data.col")
+            export_json(table, json_path)
+            write_store(table, store_path)
+            for name, fn, path in (("json", load_json, json_path), ("store", load_store, store_path)):
+                seconds, peak = measure(fn, path)
+                print(f"{n_tickers:>5}x{n_days:<6} {name:>6} {os.path.getsize(path):>12,} "
+                      f"{seconds * 1000:>9.1f} {peak / 2**20:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
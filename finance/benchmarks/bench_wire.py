@@ -0,0 +1,66 @@
+"""
+Compare the size and decode time of the published data formats.
+
+Run from the finance/ directory:
+
+    python -m benchmarks.bench_wire
+
+For each size it encodes the same table as stock_data.json (pretty-printed
+and compact), the columnar store and the wire encoding (raw, gzip and, if
+the `brotli` package is installed, brotli), then times decoding each into a
+PriceTable. "3G s" is the transfer time on a 1.6 Mbit/s mobile connection.
+"""
+
+import gzip
+import json
+import time
+
+from marketdata.store import PriceTable, decode_store, encode_store
+from marketdata.wire import compressed_variants, decode_wire, decompress, encode_wire
+
+from .synthetic import synthetic_table
+
+SIZES = [(4, 100), (50, 1000), (500, 2500)]
+MOBILE_BYTES_PER_SECOND = 1.6e6 / 8
+
+
+def best_time(fn, body, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(body)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def formats(table):
+    """name -> (encoded bytes, decoder)."""
+    records = table.to_records()
+    from_json = lambda body: PriceTable.from_records(json.loads(body))
+    wire = encode_wire(table)
+    result = {
+        "json": (json.dumps(records, indent=2).encode(), from_json),
+        "json-min": (json.dumps(records, separators=(",", ":")).encode(), from_json),
+        "json.gz": (gzip.compress(json.dumps(records, separators=(",", ":")).encode()),
+                    lambda body: from_json(gzip.decompress(body))),
+        "store": (encode_store(table), decode_store),
+        "wire": (wire, decode_wire),
+    }
+    for suffix, data in compressed_variants(wire).items():
+        # Brotli is decoded by the browser (Content-Encoding), so time the raw decode
+        result[f"wire{suffix}"] = (data, (lambda body: decode_wire(decompress(body))) if suffix == ".gz" else None)
+    return result
+
+
+def main():
+    print(f"{'size':>12} {'format':>9} {'bytes':>12} {'3G s':>7} {'decode ms':>10}")
+    for n_tickers, n_days in SIZES:
+        table = synthetic_table(n_tickers, n_days)
+        for name, (body, decode) in formats(table).items():
+            decode_ms = f"{best_time(decode, body) * 1000:>10.1f}" if decode else f"{'-':>10}"
+            print(f"{n_tickers:>5}x{n_days:<6} {name:>9} {len(body):>12,} "
+                  f"{len(body) / MOBILE_BYTES_PER_SECOND:>7.2f} {decode_ms}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+"""
+Load test of the data pipeline against the offline provider stand-in.
+
+Run from the finance/ directory (nothing leaves the machine):
+
+    python -m benchmarks.load_test --symbols 2000 --latency 0.05 --jitter 0.05 --error-rate 0.02 --note-rate 0.02
+    python -m benchmarks.load_test --scenarios collector --av-symbols 200 --per-minute 120
+
+It starts benchmarks/standin.py on a local port and runs, in a temporary
+directory:
+
+    bulk        marketdata.bulk over the universe into a fresh yfinance cache,
+                then the same run again (should make no network calls)
+    dashboard   --users concurrent YFinanceSource loads of random selections
+                on that cache (latency percentiles, coalesced queries)
+    collector   collector.collect() over --av-symbols through Alpha Vantage
+                (needs `requests`), with the collector's scheduler limits
+    wikipedia   pd.read_html of the constituents page (needs lxml)
+
+and prints throughput, retries and the stand-in's counters (requests,
+429/503/Note responses, bytes, peak concurrency) per scenario. The same
+--seed gives the same data and the same fault sequence.
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+import numpy as np
+
+from marketdata import bulk, collector
+from marketdata.scheduler import DailyBudget, RetryPolicy, Scheduler, TokenBucket
+from marketdata.sources import AlphaVantageSource, YFinanceSource
+from marketdata.yfcache import YFinanceCache, period_start
+
+from .standin import WIKI_PATH, StandInServer, add_fault_arguments, load_universe, standin_from_args, yahoo_download
+
+SCENARIOS = ("bulk", "dashboard", "collector", "wikipedia")
+
+
+def counters_since(standin, before):
+    """Stand-in counters accumulated since the `before` snapshot."""
+    after = standin.snapshot()
+    delta = {}
+    for key, value in after.items():
+        if isinstance(value, dict):
+            delta[key] = {k: v - before[key].get(k, 0) for k, v in value.items() if v - before[key].get(k, 0)}
+        elif key == "max_concurrency":
+            delta[key] = value
+        else:
+            delta[key] = value - before[key]
+    return delta
+
+
+def report(name, seconds, server_counters, **fields):
+    print(f"\n📊 {name}: {seconds:.2f}s  " + "  ".join(f"{k}={v}" for k, v in fields.items()))
+    print(f"   stand-in: {server_counters['requests']:,} requests, {server_counters['bytes'] / 1e6:.1f} MB, "
+          f"status {server_counters['status']}, notes {server_counters['notes']}, "
+          f"errors {server_counters['errors']}, peak concurrency {server_counters['max_concurrency']}")
+    return {"scenario": name, "seconds": seconds, "server": server_counters, **fields}
+
+
+def run_bulk(server, symbols, cache_dir, args):
+    download = yahoo_download(server.url, workers=args.download_workers)
+    store = YFinanceCache(cache_dir, download=download, ttl=float("inf"))
+    today = date.today()
+    start = period_start(args.period, today)
+    results = []
+    for label in ("bulk (cold)", "bulk (warm)"):
+        before = server.standin.snapshot(reset_peak=True)
+        calls = store.network_calls
+        started = time.perf_counter()
+        downloaded, failed = bulk.bulk_download(
+            symbols, store, start, today, args.batch_size, bulk.make_scheduler(args.workers, args.client_per_minute)
+        )
+        seconds = time.perf_counter() - started
+        results.append(report(
+            label, seconds, counters_since(server.standin, before),
+            symbols=len(downloaded), failed=len(failed),
+            symbols_per_s=round(len(downloaded) / max(seconds, 1e-9), 1),
+            network_calls=store.network_calls - calls,
+        ))
+    return results
+
+
+def run_dashboard(server, symbols, cache_dir, args):
+    source = YFinanceSource(cache_dir, download=yahoo_download(server.url, workers=args.download_workers))
+    source.store.ttl = float("inf")
+    rng = random.Random(args.seed)
+    start = date.today() - timedelta(days=365)
+    # Popular selections repeat, as they do across real dashboard users
+    popular = [rng.sample(symbols, min(8, len(symbols))) for _ in range(10)]
+    queries = [rng.choice(popular) if rng.random() < 0.5 else rng.sample(symbols, min(8, len(symbols)))
+               for _ in range(args.queries)]
+
+    def one(tickers):
+        started = time.perf_counter()
+        source.load(tickers, start=start)
+        return time.perf_counter() - started
+
+    before = server.standin.snapshot(reset_peak=True)
+    calls = source.store.network_calls
+    started = time.perf_counter()
+    with ThreadPoolExecutor(args.users) as pool:
+        latencies = np.array(list(pool.map(one, queries)))
+    seconds = time.perf_counter() - started
+    return [report(
+        "dashboard", seconds, counters_since(server.standin, before),
+        queries=len(queries), users=args.users,
+        p50_ms=round(float(np.percentile(latencies, 50)) * 1000, 1),
+        p95_ms=round(float(np.percentile(latencies, 95)) * 1000, 1),
+        coalesced=source.stats["coalesced"], network_calls=source.store.network_calls - calls,
+    )]
+
+
+def run_collector(server, symbols, data_dir, args):
+    try:
+        import requests  # noqa: F401
+    except ImportError:
+        print("\n⏭️ collector: skipped (the Alpha Vantage client needs `requests`)")
+        return []
+    tickers = symbols[:args.av_symbols]
+    source = AlphaVantageSource("standin", api_url=f"{server.url}/query")
+    # The collector's own limits and retry policy, with shorter back-off so a run ends in minutes
+    retry = RetryPolicy(attempts=4, base_delay=args.retry_delay)
+    scheduler = Scheduler(TokenBucket(args.client_per_minute, per=60.0), DailyBudget(float("inf")), retry,
+                          workers=args.workers)
+    before = server.standin.snapshot(reset_peak=True)
+    started = time.perf_counter()
+    summary = collector.collect(tickers, source, data_dir, scheduler)
+    seconds = time.perf_counter() - started
+    return [report(
+        "collector", seconds, counters_since(server.standin, before),
+        symbols=len(summary["successful"]), failed=len(tickers) - len(summary["successful"]),
+        symbols_per_s=round(len(summary["successful"]) / max(seconds, 1e-9), 1),
+        rows_added=summary["rows_added"],
+    )]
+
+
+def run_wikipedia(server, args):
+    import pandas as pd
+
+    before = server.standin.snapshot(reset_peak=True)
+    started = time.perf_counter()
+    try:
+        constituents = pd.read_html(server.url + WIKI_PATH)[0]
+    except ImportError as e:
+        print(f"\n⏭️ wikipedia: skipped ({e})")
+        return []
+    seconds = time.perf_counter() - started
+    return [report("wikipedia", seconds, counters_since(server.standin, before), rows=len(constituents))]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the collector and caches against the provider stand-in.")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help=f"comma-separated, from {', '.join(SCENARIOS)}")
+    parser.add_argument("--symbols", type=int, default=2000, help="universe size (sp500data.csv plus generated symbols)")
+    parser.add_argument("--period", default="1y", choices=["1mo", "3mo", "6mo", "1y", "2y", "5y"])
+    parser.add_argument("--batch-size", type=int, default=bulk.BATCH_SIZE)
+    parser.add_argument("--workers", type=int, default=bulk.WORKERS, help="concurrent batches / Alpha Vantage calls")
+    parser.add_argument("--download-workers", type=int, default=8, help="chart requests per yf.download call")
+    parser.add_argument("--client-per-minute", type=int, default=6000, help="client-side call rate limit")
+    parser.add_argument("--retry-delay", type=float, default=1.0, help="base back-off of the collector's retries")
+    parser.add_argument("--av-symbols", type=int, default=100)
+    parser.add_argument("--users", type=int, default=16)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--output", help="write the results as JSON")
+    add_fault_arguments(parser)
+    args = parser.parse_args(argv)
+    scenarios = [s for s in args.scenarios.split(",") if s]
+
+    base = load_universe()
+    universe = load_universe(extra=max(0, args.symbols - len(base)))
+    symbols = list(universe)[:args.symbols]
+    results = []
+    with StandInServer(standin_from_args(args, universe)) as server, tempfile.TemporaryDirectory() as workdir:
+        print(f"🧪 Stand-in at {server.url}: {len(symbols)} symbols, latency {args.latency}s+{args.jitter}s, "
+              f"errors {args.error_rate:.0%}, notes {args.note_rate:.0%}")
+        cache_dir = os.path.join(workdir, "yfinance")
+        if "bulk" in scenarios:
+            results += run_bulk(server, symbols, cache_dir, args)
+        if "dashboard" in scenarios:
+            results += run_dashboard(server, symbols, cache_dir, args)
+        if "collector" in scenarios:
+            results += run_collector(server, symbols, os.path.join(workdir, "data"), args)
+        if "wikipedia" in scenarios:
+            results += run_wikipedia(server, args)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"args": vars(args), "results": results}, f, indent=2)
+        print(f"\n💾 Saved {len(results)} results to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,573 @@
+"""
+Offline stand-in for the market data providers, for load tests.
+
+    python -m benchmarks.standin serve --port 8765 --symbols 3000 --latency 0.05 --error-rate 0.02 --note-rate 0.05
+    ALPHA_VANTAGE_API_KEY=demo ALPHA_VANTAGE_URL=http://127.0.0.1:8765/query python -m marketdata.collector ...
+    python -m benchmarks.standin record --out recordings --tickers AAPL,MSFT
+
+It answers in each provider's own response format:
+
+    /query?function=TIME_SERIES_DAILY&symbol=..&outputsize=compact|full&apikey=..
+                                     Alpha Vantage JSON (newest day first, values as strings)
+    /v8/finance/chart/<SYMBOL>?period1=..&period2=..&interval=1d
+                                     Yahoo's chart JSON, the endpoint yf.download reads
+    /wiki/List_of_S%26P_500_companies
+                                     Wikipedia's constituents table (pd.read_html)
+    /stats                           request counters as JSON
+
+Bars come from a recordings directory when one holds the symbol (written by
+`record`), otherwise from a random walk seeded by the symbol, so every run
+serves identical data for any number of symbols. The universe is
+sp500data.csv plus `--symbols` generated names; other symbols get each
+provider's "not found" answer.
+
+Faults are configurable: fixed latency plus jitter, an error rate (HTTP 503),
+a rate of Alpha Vantage "Note" / Yahoo 429 responses, and per-minute and
+per-day limits that answer the way the real services do once exceeded.
+Random faults are drawn from an RNG seeded by (seed, request, repeat count),
+so the same request sequence sees the same faults on every run.
+
+yahoo_download(url) is a drop-in for yf.download that reads the stand-in
+(YFinanceCache(download=...), YFinanceSource(download=...)); only the
+standard library is needed to serve.
+"""
+
+import argparse
+import csv
+import json
+import os
+import random
+import threading
+import time
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timezone
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.error import HTTPError
+from urllib.parse import parse_qs, quote, urlsplit
+from urllib.request import Request, urlopen
+
+import numpy as np
+
+DEFAULT_UNIVERSE = os.path.join(os.path.dirname(__file__), "..", "baba-finance", "sp500data.csv")
+HISTORY_START = np.datetime64("2000-01-03")
+# Alpha Vantage compact responses hold the latest 100 trading days
+COMPACT_ROWS = 100
+WIKI_PATH = "/wiki/List_of_S%26P_500_companies"
+USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64) marketdata-standin"
+
+AV_NOTE = ("Thank you for using Alpha Vantage! Our standard API call frequency is 5 calls per minute "
+           "and 500 calls per day. Please visit https://www.alphavantage.co/premium/ if you would like "
+           "to target a higher API call frequency.")
+AV_DAILY = ("Thank you for using Alpha Vantage! Our standard API rate limit is 25 requests per day. "
+            "Please subscribe to any of the premium plans at https://www.alphavantage.co/premium/ "
+            "to instantly remove all daily rate limits.")
+AV_INVALID = ("Invalid API call. Please retry or visit the documentation "
+              "(https://www.alphavantage.co/documentation/) for TIME_SERIES_DAILY.")
+
+
+def load_universe(path=DEFAULT_UNIVERSE, extra=0):
+    """{symbol: (name, sector)} from a Symbol,Name,Sector CSV plus `extra` generated symbols."""
+    universe = {}
+    if path:
+        with open(path, newline="") as f:
+            for row in csv.DictReader(f):
+                if row.get("Symbol"):
+                    universe[row["Symbol"].strip().upper()] = (row.get("Name", ""), row.get("Sector", ""))
+    for i in range(extra):
+        universe[f"SYN{i:04d}"] = (f"Synthetic Holdings {i}", "Synthetic")
+    return universe
+
+
+def synthetic_bars(symbol, end):
+    """
+    Business-day OHLCV arrays for `symbol` from 2000-01-03 to `end`.
+
+    Seeded by the symbol, so any date range of it is a slice of the same series.
+    """
+    days = np.arange(HISTORY_START, np.datetime64(end, "D") + 1, dtype="datetime64[D]")
+    days = days[np.is_busday(days)]
+    rng = np.random.default_rng(zlib.crc32(symbol.encode()))
+    n = len(days)
+    close = rng.uniform(10, 400) * np.exp(np.cumsum(rng.normal(0.0003, 0.02, n)))
+    close = np.maximum(close.round(2), 0.01)
+    open_ = np.maximum((close * (1 + rng.normal(0, 0.006, n))).round(2), 0.01)
+    high = np.maximum((np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.008, n)))).round(2),
+                      np.maximum(open_, close))
+    low = np.minimum((np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.008, n)))).round(2),
+                     np.minimum(open_, close))
+    volume = rng.integers(500_000, 80_000_000, n)
+    return {"Date": days, "Open": open_, "High": high, "Low": low, "Close": close, "Volume": volume}
+
+
+def _epoch(days):
+    """Unix time Yahoo stamps daily bars with (the 09:30 New York open, taken as 14:30 UTC)."""
+    return np.asarray(days, dtype="datetime64[D]").astype(np.int64) * 86400 + 52200
+
+
+def alpha_vantage_response(symbol, bars, outputsize="compact"):
+    """TIME_SERIES_DAILY JSON body for `bars` (oldest first)."""
+    order = np.arange(len(bars["Date"]))[::-1]
+    if outputsize != "full":
+        order = order[:COMPACT_ROWS]
+    series = {
+        str(bars["Date"][i]): {
+            "1. open": f"{bars['Open'][i]:.4f}",
+            "2. high": f"{bars['High'][i]:.4f}",
+            "3. low": f"{bars['Low'][i]:.4f}",
+            "4. close": f"{bars['Close'][i]:.4f}",
+            "5. volume": str(int(bars["Volume"][i])),
+        }
+        for i in order
+    }
+    return {
+        "Meta Data": {
+            "1. Information": "Daily Prices (open, high, low, close) and Volumes",
+            "2. Symbol": symbol,
+            "3. Last Refreshed": str(bars["Date"][-1]) if len(bars["Date"]) else "",
+            "4. Output Size": "Full size" if outputsize == "full" else "Compact",
+            "5. Time Zone": "US/Eastern",
+        },
+        "Time Series (Daily)": series,
+    }
+
+
+def yahoo_chart_response(symbol, bars, period1, period2):
+    """v8 chart JSON body for the bars with period1 <= timestamp < period2."""
+    stamps = _epoch(bars["Date"])
+    keep = (stamps >= period1) & (stamps < period2)
+    close = bars["Close"][keep]
+    quote_ = {name.lower(): bars[name][keep].tolist() for name in ("Open", "High", "Low", "Close", "Volume")}
+    return {"chart": {"result": [{
+        "meta": {
+            "currency": "USD",
+            "symbol": symbol,
+            "exchangeName": "NMS",
+            "instrumentType": "EQUITY",
+            "timezone": "EST",
+            "exchangeTimezoneName": "America/New_York",
+            "regularMarketPrice": float(close[-1]) if len(close) else None,
+            "dataGranularity": "1d",
+        },
+        "timestamp": stamps[keep].tolist(),
+        "indicators": {"quote": [quote_], "adjclose": [{"adjclose": close.tolist()}]},
+    }], "error": None}}
+
+
+def yahoo_not_found(symbol):
+    return {"chart": {"result": None, "error": {
+        "code": "Not Found", "description": f"No data found, symbol may be delisted ({symbol})"}}}
+
+
+def wikipedia_html(universe):
+    """The S&P 500 article's constituents table (first table on the page)."""
+    rows = "\n".join(
+        f"<tr><td><a href=\"https://www.nyse.com/quote/XNYS:{escape(s)}\">{escape(s)}</a></td>"
+        f"<td>{escape(name)}</td><td>{escape(sector)}</td><td>{escape(sector)}</td>"
+        f"<td>New York, New York</td><td>2000-01-01</td><td>{zlib.crc32(s.encode()) % 10**7:010d}</td>"
+        f"<td>1900</td></tr>"
+        for s, (name, sector) in universe.items()
+    )
+    return (
+        "<!DOCTYPE html><html><head><title>List of S&amp;P 500 companies - Wikipedia</title></head><body>"
+        "<table class=\"wikitable sortable\" id=\"constituents\"><tbody>"
+        "<tr><th>Symbol</th><th>Security</th><th>GICS Sector</th><th>GICS Sub-Industry</th>"
+        "<th>Headquarters Location</th><th>Date added</th><th>CIK</th><th>Founded</th></tr>\n"
+        f"{rows}\n</tbody></table></body></html>"
+    )
+
+
+class Recordings:
+    """Provider responses saved by `record`: <dir>/alphavantage/<SYMBOL>.json, yahoo/<SYMBOL>.json, wikipedia.html."""
+
+    def __init__(self, path):
+        self.path = path
+
+    def _file(self, *parts):
+        return os.path.join(self.path, *parts) if self.path else None
+
+    def json(self, provider, symbol):
+        path = self._file(provider, f"{symbol}.json")
+        if path is None or not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    def bars(self, symbol):
+        """Recorded bars of `symbol` as arrays (from the Yahoo or Alpha Vantage recording), or None."""
+        chart = self.json("yahoo", symbol)
+        if chart and chart["chart"]["result"]:
+            result = chart["chart"]["result"][0]
+            q = result["indicators"]["quote"][0]
+            days = np.array(result["timestamp"], dtype="datetime64[s]").astype("datetime64[D]")
+            columns = {name: np.array(q[name.lower()], dtype=np.float64) for name in ("Open", "High", "Low", "Close")}
+            keep = ~np.isnan(columns["Close"])
+            volume = np.nan_to_num(np.array(q["volume"], dtype=np.float64)).astype(np.int64)
+            return {"Date": days[keep], **{k: v[keep] for k, v in columns.items()}, "Volume": volume[keep]}
+        series = (self.json("alphavantage", symbol) or {}).get("Time Series (Daily)")
+        if series:
+            days = sorted(series)
+            bars = {"Date": np.array(days, dtype="datetime64[D]")}
+            for i, name in enumerate(("Open", "High", "Low", "Close", "Volume"), 1):
+                bars[name] = np.array([float(series[d][f"{i}. {name.lower()}"]) for d in days])
+            bars["Volume"] = bars["Volume"].astype(np.int64)
+            return bars
+        return None
+
+    def wikipedia(self):
+        path = self._file("wikipedia.html")
+        if path is None or not os.path.exists(path):
+            return None
+        with open(path, encoding="utf-8") as f:
+            return f.read()
+
+
+class StandIn:
+    """Response generator, fault injection and counters shared by the server's threads."""
+
+    def __init__(self, universe=None, recordings=None, end=None, latency=0.0, jitter=0.0, error_rate=0.0,
+                 note_rate=0.0, per_minute=None, per_day=None, seed=0, clock=time.monotonic, sleep=time.sleep):
+        self.universe = load_universe() if universe is None else universe
+        self.recordings = Recordings(recordings)
+        self.end = end or date.today()
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.note_rate = note_rate
+        self.per_minute = per_minute
+        self.per_day = per_day
+        self.seed = seed
+        self.clock = clock
+        self.sleep = sleep
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.seen = {}
+            self.windows = {}
+            self.daily = {}
+            self.inflight = 0
+            self.stats = {"requests": 0, "by_provider": {}, "status": {}, "notes": 0, "errors": 0,
+                          "not_found": 0, "bytes": 0, "symbols": 0, "max_concurrency": 0}
+
+    def snapshot(self, reset_peak=False):
+        """Copy of the counters; reset_peak starts a new max_concurrency measurement."""
+        with self.lock:
+            stats = json.loads(json.dumps(self.stats))
+            if reset_peak:
+                self.stats["max_concurrency"] = self.inflight
+            return stats
+
+    # -- faults ------------------------------------------------------------
+
+    def _rng(self, key):
+        """RNG for the n-th occurrence of request `key`: same sequence, same faults."""
+        with self.lock:
+            n = self.seen[key] = self.seen.get(key, 0) + 1
+        return random.Random(f"{self.seed}|{key}|{n}")
+
+    def _over_limit(self, client):
+        """(per-minute exceeded, per-day exceeded) for one more call by `client`."""
+        now = self.clock()
+        with self.lock:
+            day = self.daily[client] = self.daily.get(client, 0) + 1
+            window = self.windows.setdefault(client, deque())
+            while window and now - window[0] >= 60.0:
+                window.popleft()
+            window.append(now)
+            minute = len(window)
+        return (self.per_minute is not None and minute > self.per_minute,
+                self.per_day is not None and day > self.per_day)
+
+    def bars(self, symbol):
+        recorded = self.recordings.bars(symbol)
+        return recorded if recorded is not None else synthetic_bars(symbol, self.end)
+
+    def known(self, symbol):
+        return symbol in self.universe or self.recordings.json("yahoo", symbol) is not None \
+            or self.recordings.json("alphavantage", symbol) is not None
+
+    # -- providers ---------------------------------------------------------
+
+    def handle(self, path, query):
+        """(status, content type, body bytes) for one request."""
+        with self.lock:
+            self.inflight += 1
+            self.stats["max_concurrency"] = max(self.stats["max_concurrency"], self.inflight)
+        try:
+            if path == "/query":
+                provider, (status, body) = "alphavantage", self._alpha_vantage(query)
+            elif path.startswith("/v8/finance/chart/"):
+                provider, (status, body) = "yahoo", self._yahoo(path.rsplit("/", 1)[-1].upper(), query)
+            elif path == WIKI_PATH or path == "/wiki/List_of_S&P_500_companies":
+                provider, (status, body) = "wikipedia", self._wikipedia(query)
+            elif path == "/stats":
+                return 200, "application/json", json.dumps(self.snapshot(), indent=2).encode()
+            else:
+                provider, status, body = "other", 404, {"error": f"no stand-in for {path}"}
+        finally:
+            with self.lock:
+                self.inflight -= 1
+
+        if isinstance(body, str):
+            kind, data = "text/html; charset=utf-8", body.encode("utf-8")
+        else:
+            kind, data = "application/json", json.dumps(body).encode()
+        with self.lock:
+            s = self.stats
+            s["requests"] += 1
+            s["by_provider"][provider] = s["by_provider"].get(provider, 0) + 1
+            s["status"][str(status)] = s["status"].get(str(status), 0) + 1
+            s["bytes"] += len(data)
+        return status, kind, data
+
+    def _count(self, name):
+        with self.lock:
+            self.stats[name] += 1
+
+    def _delay(self, rng):
+        if self.latency or self.jitter:
+            self.sleep(self.latency + rng.uniform(0, self.jitter))
+
+    def _alpha_vantage(self, query):
+        symbol = query.get("symbol", "").upper()
+        outputsize = query.get("outputsize", "compact")
+        rng = self._rng(("alphavantage", symbol, outputsize))
+        self._delay(rng)
+        minute, day = self._over_limit(("alphavantage", query.get("apikey", "")))
+        if day:
+            self._count("notes")
+            return 200, {"Information": AV_DAILY}
+        if minute or rng.random() < self.note_rate:
+            self._count("notes")
+            return 200, {"Note": AV_NOTE}
+        if rng.random() < self.error_rate:
+            self._count("errors")
+            return 503, {"error": "Service Unavailable"}
+        if query.get("function") != "TIME_SERIES_DAILY" or not self.known(symbol):
+            self._count("not_found")
+            return 200, {"Error Message": AV_INVALID}
+        self._count("symbols")
+        return 200, alpha_vantage_response(symbol, self.bars(symbol), outputsize)
+
+    def _yahoo(self, symbol, query):
+        period1 = int(query.get("period1", 0))
+        period2 = int(query.get("period2", _epoch(np.datetime64(self.end, "D") + 1)))
+        rng = self._rng(("yahoo", symbol, period1, period2))
+        self._delay(rng)
+        minute, day = self._over_limit(("yahoo",))
+        if minute or day or rng.random() < self.note_rate:
+            self._count("notes")
+            return 429, "Too Many Requests"
+        if rng.random() < self.error_rate:
+            self._count("errors")
+            return 503, {"chart": {"result": None, "error": {"code": "Service Unavailable", "description": ""}}}
+        if not self.known(symbol):
+            self._count("not_found")
+            return 404, yahoo_not_found(symbol)
+        self._count("symbols")
+        return 200, yahoo_chart_response(symbol, self.bars(symbol), period1, period2)
+
+    def _wikipedia(self, query):
+        self._delay(self._rng(("wikipedia",)))
+        return 200, self.recordings.wikipedia() or wikipedia_html(self.universe)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        status, kind, body = self.server.standin.handle(url.path, query)
+        self.send_response(status)
+        self.send_header("Content-Type", kind)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StandInServer(ThreadingHTTPServer):
+    """ThreadingHTTPServer answering from a StandIn; `url` is its base URL."""
+
+    daemon_threads = True
+    # Thousands of concurrent clients queue up instead of being refused
+    request_queue_size = 1024
+
+    def __init__(self, standin, host="127.0.0.1", port=0):
+        super().__init__((host, port), _Handler)
+        self.standin = standin
+        self.url = f"http://{host}:{self.server_address[1]}"
+
+    def start(self):
+        """Serve on a daemon thread; returns self."""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        self.server_close()
+
+
+# -- replay clients ---------------------------------------------------------
+
+
+def get(url, timeout=30):
+    """(status, body bytes) of a GET; HTTP errors are returned, network errors raised."""
+    request = Request(url, headers={"User-Agent": USER_AGENT})
+    try:
+        with urlopen(request, timeout=timeout) as response:
+            return response.status, response.read()
+    except HTTPError as e:
+        return e.code, e.read()
+
+
+def _day_epoch(value):
+    return int(datetime.fromisoformat(str(value)[:10]).replace(tzinfo=timezone.utc).timestamp())
+
+
+def yahoo_download(base_url, workers=8, timeout=30):
+    """
+    yf.download(tickers, start=, end=, progress=False) against a chart endpoint.
+
+    Returns the same wide frame (Date index, (Price, Ticker) columns, auto-
+    adjusted Close) with one chart request per ticker on `workers` threads.
+    Like yfinance, tickers that fail are reported and left out, and the frame
+    is empty when every ticker failed.
+    """
+
+    def fetch_one(ticker, period1, period2):
+        status, body = get(f"{base_url}/v8/finance/chart/{quote(ticker)}"
+                           f"?period1={period1}&period2={period2}&interval=1d", timeout)
+        if status != 200:
+            return ticker, None
+        result = json.loads(body)["chart"]["result"][0]
+        return ticker, result
+
+    def download(tickers, start=None, end=None, progress=False, **kwargs):
+        import pandas as pd
+
+        tickers = [tickers] if isinstance(tickers, str) else list(tickers)
+        period1 = _day_epoch(start) if start else 0
+        period2 = _day_epoch(end) if end else int(time.time())
+        with ThreadPoolExecutor(max(1, min(workers, len(tickers)))) as pool:
+            results = list(pool.map(lambda t: fetch_one(t, period1, period2), tickers))
+
+        frames, failed = {}, []
+        for ticker, result in results:
+            if result is None or not result.get("timestamp"):
+                failed.append(ticker)
+                continue
+            q = result["indicators"]["quote"][0]
+            index = pd.DatetimeIndex(pd.to_datetime(result["timestamp"], unit="s").normalize(), name="Date")
+            frames[ticker] = pd.DataFrame(
+                {"Close": q["close"], "High": q["high"], "Low": q["low"], "Open": q["open"], "Volume": q["volume"]},
+                index=index, dtype="float64",
+            )
+        if failed:
+            print(f"{len(failed)} Failed download{'s' if len(failed) > 1 else ''}: {failed[:10]}")
+        if not frames:
+            return pd.DataFrame()
+        wide = pd.concat(frames, axis=1).swaplevel(axis=1)
+        wide.columns.names = ["Price", "Ticker"]
+        fields = ["Close", "High", "Low", "Open", "Volume"]
+        return wide[[(f, t) for f in fields for t in tickers if t in frames]]
+
+    return download
+
+
+# -- recording ----------------------------------------------------------------
+
+
+def record(out, tickers, api_key=None, wikipedia=True, years=25):
+    """Save real provider responses for `tickers` under `out` for later replay."""
+    recordings = {
+        "yahoo": lambda t: "https://query1.finance.yahoo.com/v8/finance/chart/"
+                           f"{quote(t)}?period1={int(time.time()) - years * 365 * 86400}"
+                           f"&period2={int(time.time())}&interval=1d",
+    }
+    if api_key:
+        recordings["alphavantage"] = lambda t: ("https://www.alphavantage.co/query?function=TIME_SERIES_DAILY"
+                                                f"&symbol={quote(t)}&outputsize=full&apikey={quote(api_key)}")
+    for provider, url in recordings.items():
+        os.makedirs(os.path.join(out, provider), exist_ok=True)
+        for ticker in tickers:
+            status, body = get(url(ticker))
+            if status != 200:
+                print(f"❌ {provider} {ticker}: HTTP {status}")
+                continue
+            with open(os.path.join(out, provider, f"{ticker}.json"), "wb") as f:
+                f.write(body)
+            print(f"💾 {provider} {ticker}: {len(body):,} bytes")
+            if provider == "alphavantage":
+                # The free tier allows 5 calls per minute
+                time.sleep(12)
+    if wikipedia:
+        status, body = get("https://en.wikipedia.org" + WIKI_PATH)
+        if status == 200:
+            with open(os.path.join(out, "wikipedia.html"), "wb") as f:
+                f.write(body)
+            print(f"💾 wikipedia: {len(body):,} bytes")
+
+
+def add_fault_arguments(parser):
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra random latency, up to this many seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of HTTP 503 responses")
+    parser.add_argument("--note-rate", type=float, default=0.0, help="fraction of rate-limit Note / 429 responses")
+    parser.add_argument("--per-minute", type=int, help="calls per minute before the rate limit applies")
+    parser.add_argument("--per-day", type=int, help="Alpha Vantage calls per day before the quota message")
+    parser.add_argument("--seed", type=int, default=0)
+
+
+def standin_from_args(args, universe):
+    return StandIn(universe, recordings=getattr(args, "recordings", None), latency=args.latency,
+                   jitter=args.jitter, error_rate=args.error_rate, note_rate=args.note_rate,
+                   per_minute=args.per_minute, per_day=args.per_day, seed=args.seed)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline stand-in for yfinance, Alpha Vantage and Wikipedia.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve = commands.add_parser("serve", help="serve recorded or synthetic responses")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8765)
+    serve.add_argument("--universe", default=DEFAULT_UNIVERSE, help="CSV with Symbol,Name,Sector columns")
+    serve.add_argument("--symbols", type=int, default=0, help="generated symbols added to the universe")
+    serve.add_argument("--recordings", help="directory written by `record`")
+    add_fault_arguments(serve)
+    rec = commands.add_parser("record", help="save real responses for replay")
+    rec.add_argument("--out", required=True)
+    rec.add_argument("--tickers", required=True, help="comma-separated symbols")
+    rec.add_argument("--api-key", default=os.environ.get("ALPHA_VANTAGE_API_KEY"),
+                     help="Alpha Vantage key (default: $ALPHA_VANTAGE_API_KEY; skipped without one)")
+    args = parser.parse_args(argv)
+
+    if args.command == "record":
+        record(args.out, [t.strip().upper() for t in args.tickers.split(",") if t.strip()], args.api_key)
+        return
+
+    universe = load_universe(args.universe, args.symbols)
+    server = StandInServer(standin_from_args(args, universe), args.host, args.port)
+    print(f"🧪 Stand-in for {len(universe)} symbols at {server.url}")
+    print(f"   Alpha Vantage: {server.url}/query   Yahoo: {server.url}/v8/finance/chart/<SYMBOL>")
+    print(f"   Wikipedia: {server.url}{WIKI_PATH}   Counters: {server.url}/stats")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
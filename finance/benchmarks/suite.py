@@ -0,0 +1,264 @@
+"""
+Benchmark suite: the dashboards' data functions and the collector's steps on
+synthetic data, with machine-readable baselines.
+
+Run from the finance/ directory (offline, nothing is downloaded):
+
+    python -m benchmarks.suite                          # writes benchmarks/baselines/<commit>.json
+    python -m benchmarks.suite --sizes 4x100,50x1000 --output /tmp/run.json
+    python -m benchmarks.suite --compare benchmarks/baselines/<commit>.json
+
+For every size (tickers x days) it generates seeded random-walk bars ending
+today (benchmarks/synthetic.py), publishes them to a temporary data
+directory with the collector, runs both notebooks against that data through
+marimo's App.run() (the desktop notebook reads the store through the "local"
+source instead of yfinance) and times:
+
+    collector.merge_bars, collector.export_json, collector.write_outputs,
+    store.encode, wire.encode,
+    desktop.fetch_stock_data, desktop.calculate_metrics, desktop.create_price_chart,
+    web.load_real_data, web.calculate_metrics, web.create_price_chart
+
+Each result is the best of --repeat runs; chart results also record the size
+of the generated Vega-Lite spec. --compare prints the ratio against a
+previous baseline and exits with status 1 when a case got slower than
+--threshold (ignoring differences under a millisecond).
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+import numpy as np
+
+import finance_dashboard
+import finance_dashboard_web
+import marketdata
+from marketdata.collector import build_market_overview, merge_bars, write_outputs
+from marketdata.store import encode_store, export_json, write_store
+from marketdata.wire import encode_wire
+
+from .synthetic import recent_table, ticker_names
+
+SIZES = [(4, 100), (50, 1000), (500, 2500)]
+SELECTED = 8
+BASELINE_DIR = os.path.join(os.path.dirname(__file__), "baselines")
+NOISE_SECONDS = 1e-3
+
+
+def best_time(fn, repeat, setup=None):
+    """(best seconds, last result) of `repeat` calls; setup() runs untimed before each."""
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def spec_bytes(output):
+    """Size of the HTML (embedded Vega-Lite spec included) a chart output renders to."""
+    return len(output.text)
+
+
+@contextmanager
+def working_directory(path):
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+def widgets(tickers, period):
+    """Replacements for a notebook's widget cell, preset to the benchmarked selection."""
+    import marimo as mo
+
+    return {
+        "stock_input": mo.ui.text(value=",".join(tickers)),
+        "period_selector": mo.ui.dropdown(options=[period], value=period),
+        "chart_type": mo.ui.dropdown(options=["line", "area", "candlestick"], value="line"),
+        "indicator_selector": mo.ui.multiselect(options=marketdata.INDICATOR_CHOICES, value=[]),
+    }
+
+
+def desktop_notebook(data_dir, tickers):
+    """Definitions of finance_dashboard.py run on the local store instead of yfinance."""
+    import warnings
+    from datetime import timedelta
+
+    import altair as alt
+    import marimo as mo
+    import pandas as pd
+
+    # As in the notebook's import cell
+    warnings.filterwarnings("ignore")
+    alt.data_transformers.enable("json")
+    _, defs = finance_dashboard.app.run(defs={
+        "alt": alt, "datetime": datetime, "marketdata": marketdata, "mo": mo, "np": np, "pd": pd,
+        "timedelta": timedelta, "warnings": warnings,
+        "price_source": marketdata.open_source("local", path=os.path.join(data_dir, "stock_data.col")),
+        **widgets(tickers, "1y"),
+    })
+    return defs
+
+
+def web_notebook(tickers):
+    """Definitions of finance_dashboard_web.py (reads ./data, so run inside the fixture)."""
+    _, defs = finance_dashboard_web.app.run(defs=widgets(tickers, "1Y"))
+    return defs
+
+
+def run_size(n_tickers, n_days, repeat, workdir):
+    size = f"{n_tickers}x{n_days}"
+    results = []
+
+    def record(case, seconds, **extra):
+        results.append({"case": case, "size": size, "tickers": n_tickers, "days": n_days,
+                        "seconds": seconds, **extra})
+        print(f"{size:>10} {case:<28} {seconds * 1000:>10.1f} ms"
+              + "".join(f"  {k}={v:,}" for k, v in extra.items()))
+
+    table = recent_table(n_tickers, n_days)
+    tickers = ticker_names(min(n_tickers, SELECTED))
+    root = os.path.join(workdir, size)
+    data_dir = os.path.join(root, "data")
+
+    # Collector: merge a run that overlaps the store by 5 days, then serialize
+    dates = np.unique(table["Date"])
+    existing = table.take(np.flatnonzero(table["Date"] < dates[-5]))
+    new = table.take(np.flatnonzero(table["Date"] >= dates[-10]))
+    record("collector.merge_bars", best_time(lambda: merge_bars(existing, new), repeat)[0])
+    record("store.encode", best_time(lambda: encode_store(table), repeat)[0], bytes=len(encode_store(table)))
+    record("wire.encode", best_time(lambda: encode_wire(table), repeat)[0], bytes=len(encode_wire(table)))
+    json_path = os.path.join(root, "stock_data.json")
+    os.makedirs(root, exist_ok=True)
+    record("collector.export_json", best_time(lambda: export_json(table, json_path), repeat)[0],
+           bytes=os.path.getsize(json_path))
+
+    overview = build_market_overview(table, ticker=table.tickers[0])
+    record("collector.write_outputs", best_time(
+        lambda: write_outputs(table, data_dir, export=False, market_overview=overview),
+        repeat, setup=lambda: shutil.rmtree(data_dir, ignore_errors=True),
+    )[0])
+    # The desktop notebook below reads the monolithic store, which write_outputs leaves off
+    write_store(table, os.path.join(data_dir, "stock_data.col"))
+    with open(os.path.join(data_dir, "last_updated.json"), "w") as f:
+        json.dump({"last_updated": "synthetic", "market_date": str(table["Date"].max()),
+                   "real_data_ratio": f"{n_tickers}/{n_tickers}"}, f)
+
+    # Desktop notebook, on the store written above
+    marketdata.cache.clear()
+    desktop = desktop_notebook(data_dir, tickers)
+    selection = ",".join(tickers)
+    seconds, (wide, selected) = best_time(lambda: desktop["fetch_stock_data"](selection, "1y"), repeat)
+    record("desktop.fetch_stock_data", seconds)
+    record("desktop.calculate_metrics", best_time(lambda: desktop["calculate_metrics"](wide, selected), repeat)[0])
+    seconds, chart = best_time(lambda: desktop["create_price_chart"](wide, selected, "line"), repeat)
+    record("desktop.create_price_chart", seconds, spec_bytes=spec_bytes(chart))
+
+    # Web notebook, on the published files (cold: parsed-file cache cleared before each load)
+    with working_directory(root):
+        web = web_notebook(tickers)
+        seconds, loaded = best_time(
+            lambda: asyncio.run(web["load_real_data"](selection, "1Y")), repeat, setup=marketdata.cache.clear
+        )
+        record("web.load_real_data", seconds)
+        long, selected = loaded[0], loaded[1]
+        record("web.calculate_metrics", best_time(lambda: web["calculate_metrics"](long, selected), repeat)[0])
+        seconds, chart = best_time(lambda: asyncio.run(web["create_price_chart"](long, selected, "line")), repeat)
+        record("web.create_price_chart", seconds, spec_bytes=spec_bytes(chart))
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def metadata():
+    import pandas as pd
+
+    return {
+        "commit": git_commit(),
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+    }
+
+
+def compare(results, baseline, threshold):
+    """Print new/old ratios per (case, size); return the regressed entries."""
+    old = {(r["case"], r["size"]): r["seconds"] for r in baseline["results"]}
+    regressions = []
+    print(f"\n{'size':>10} {'case':<28} {'baseline ms':>12} {'now ms':>10} {'ratio':>7}")
+    for r in results:
+        before = old.get((r["case"], r["size"]))
+        if before is None:
+            continue
+        ratio = r["seconds"] / before if before else float("inf")
+        slower = ratio > threshold and r["seconds"] - before > NOISE_SECONDS
+        if slower:
+            regressions.append(r)
+        print(f"{r['size']:>10} {r['case']:<28} {before * 1000:>12.1f} {r['seconds'] * 1000:>10.1f} "
+              f"{ratio:>6.2f}x{'  ⚠️' if slower else ''}")
+    return regressions
+
+
+def parse_sizes(text):
+    return [tuple(int(x) for x in size.lower().split("x")) for size in text.split(",") if size]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the dashboards and collector on synthetic data.")
+    parser.add_argument("--sizes", default=",".join(f"{n}x{m}" for n, m in SIZES),
+                        help="comma-separated TICKERSxDAYS")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="results file (default: benchmarks/baselines/<commit>.json)")
+    parser.add_argument("--compare", help="baseline file to compare against")
+    parser.add_argument("--threshold", type=float, default=1.25, help="slowdown ratio reported as a regression")
+    args = parser.parse_args(argv)
+
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for n_tickers, n_days in parse_sizes(args.sizes):
+            results.extend(run_size(n_tickers, n_days, args.repeat, workdir))
+
+    report = {"version": 1, "meta": metadata(), "results": results}
+    output = args.output or os.path.join(BASELINE_DIR, f"{report['meta']['commit'] or 'latest'}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n💾 Saved {len(results)} results to {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        if regressions:
+            print(f"❌ {len(regressions)} case(s) slower than {args.threshold}x the baseline")
+            return 1
+        print("✅ No regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,65 @@
+"""
+Seeded synthetic market data for the benchmarks (no network access).
+
+The same random-walk bars are available in every layout the code reads:
+
+    synthetic_table(n, m)     PriceTable (the columnar store)
+    synthetic_records(n, m)   row dicts in the stock_data.json schema the collector writes
+    synthetic_wide(n, m)      yfinance's wide frame with (Price, Ticker) MultiIndex columns
+
+A given (n_tickers, n_days, seed, end) always produces identical data.
+"""
+
+from datetime import date
+
+import numpy as np
+
+from marketdata.reshape import table_to_wide
+from marketdata.store import PriceTable
+
+START = np.datetime64("2015-01-02")
+
+
+def ticker_names(n_tickers):
+    return [f"T{i:03d}" for i in range(n_tickers)]
+
+
+def business_days(n_days, end=None):
+    """n_days business days from 2015-01-02, or ending on `end` (a date) if given."""
+    if end is None:
+        return np.busday_offset(START, np.arange(n_days), roll="forward")
+    last = np.busday_offset(np.datetime64(end, "D"), 0, roll="backward")
+    return np.busday_offset(last, np.arange(-n_days + 1, 1))
+
+
+def synthetic_table(n_tickers, n_days, seed=0, end=None):
+    """Random-walk OHLCV bars for n_tickers x n_days business days."""
+    rng = np.random.default_rng(seed)
+    dates = business_days(n_days, end)
+    tickers = ticker_names(n_tickers)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, (n_tickers, n_days)), axis=1))
+    spread = np.abs(rng.normal(0, 0.005, (n_tickers, n_days))) * close
+    return PriceTable.from_arrays(
+        np.tile(dates, n_tickers),
+        np.repeat(tickers, n_days),
+        (close - spread / 2).round(2).ravel(),
+        (close + spread).round(2).ravel(),
+        (close - spread).round(2).ravel(),
+        close.round(2).ravel(),
+        rng.integers(1_000_000, 50_000_000, n_tickers * n_days),
+    )
+
+
+def synthetic_records(n_tickers, n_days, seed=0, end=None):
+    """The same bars as stock_data.json rows."""
+    return synthetic_table(n_tickers, n_days, seed, end).to_records()
+
+
+def synthetic_wide(n_tickers, n_days, seed=0, end=None):
+    """The same bars in yfinance.download()'s multi-ticker layout."""
+    return table_to_wide(synthetic_table(n_tickers, n_days, seed, end))
+
+
+def recent_table(n_tickers, n_days, seed=0):
+    """synthetic_table() ending today, so "last N months" filters select data."""
+    return synthetic_table(n_tickers, n_days, seed, end=date.today())
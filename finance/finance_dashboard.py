@@ -25,16 +25,20 @@ def __():
     import marimo as mo
     import pandas as pd
     import numpy as np
-    import yfinance as yf
     import altair as alt
     import warnings
     from datetime import datetime, timedelta
     
+    # Shared data helpers (finance/marketdata); yfinance is reached through
+    # the data layer's on-disk delta cache
+    import marketdata
+    price_source = marketdata.open_source("yfinance")
+    
     warnings.filterwarnings("ignore")
     
     # Enable Altair to render in marimo
     alt.data_transformers.enable('json')
-    return alt, datetime, mo, np, pd, timedelta, warnings, yf
+    return alt, datetime, marketdata, mo, np, pd, price_source, timedelta, warnings
 
 
 @app.cell(hide_code=True)
@@ -44,7 +48,7 @@ def __(mo):
 
 
 @app.cell
-def __(mo):
+def __(marketdata, mo):
     # Create interactive widgets for stock selection and time period
     stock_input = mo.ui.text(
         value="AAPL,GOOGL,MSFT,AMZN,TSLA",
@@ -64,12 +68,21 @@ def __(mo):
         label="Chart Type:"
     )
     
-    mo.hstack([stock_input, period_selector, chart_type], justify="space-around")
-    return chart_type, period_selector, stock_input
+    indicator_selector = mo.ui.multiselect(
+        options=marketdata.INDICATOR_CHOICES,
+        value=[],
+        label="Indicators:"
+    )
+    
+    mo.vstack([
+        mo.hstack([stock_input, period_selector, chart_type], justify="space-around"),
+        mo.hstack([indicator_selector], justify="center"),
+    ])
+    return chart_type, indicator_selector, period_selector, stock_input
 
 
 @app.cell
-def __(stock_input, period_selector, yf, pd, mo):
+def __(marketdata, mo, pd, period_selector, price_source, stock_input):
     # Fetch stock data based on user inputs
     def fetch_stock_data(tickers_str, period):
         try:
@@ -77,23 +90,23 @@ def __(stock_input, period_selector, yf, pd, mo):
             if not tickers or tickers == ['']:
                 return pd.DataFrame(), []
             
-            # Download data for selected tickers
-            data = yf.download(tickers, period=period, progress=False)
+            # Served from the on-disk cache; only missing tickers/dates are downloaded
+            table = price_source.load(tickers, start=marketdata.period_start(period))
+            with marketdata.timeline.span("reshape", rows=len(table)):
+                data = marketdata.table_to_wide(table, [t for t in tickers if t in table.tickers])
             
             if data.empty:
                 return pd.DataFrame(), tickers
             
-            # Handle single vs multiple ticker data structure
-            if len(tickers) == 1:
-                # Single ticker - restructure data
-                data.columns = pd.MultiIndex.from_product([data.columns, tickers])
-            
+            # Single and multi ticker layouts are both handled by marketdata.reshape
             return data, tickers
             
         except Exception as e:
             mo.status.toast(f"Error fetching data: {str(e)}", kind="danger")
             return pd.DataFrame(), []
     
+    # Spans recorded from here on make up this load's performance report
+    marketdata.timeline.begin_run(f"{stock_input.value} ({period_selector.value})")
     stock_data, selected_tickers = fetch_stock_data(stock_input.value, period_selector.value)
     return fetch_stock_data, selected_tickers, stock_data
 
@@ -107,6 +120,18 @@ def __(mo, selected_tickers, stock_data):
     return
 
 
+@app.cell
+def __(marketdata, selected_tickers, stock_data):
+    # Daily bars as one PriceTable, built once per data load and shared by the
+    # candlestick, indicator and correlation views
+    with marketdata.timeline.span("frame", rows=len(stock_data)):
+        price_table = (
+            marketdata.PriceTable.empty() if stock_data.empty
+            else marketdata.wide_to_table(stock_data, selected_tickers)
+        )
+    return (price_table,)
+
+
 @app.cell(hide_code=True)
 def __(mo):
     mo.md(r"""## Interactive Price Charts""")
@@ -114,37 +139,34 @@ def __(mo):
 
 
 @app.cell
-def __(alt, chart_type, mo, pd, selected_tickers, stock_data):
+def __(alt, chart_type, indicator_selector, marketdata, mo, pd, price_source, price_table, selected_tickers, stock_data):
     # Create interactive price chart
-    def create_price_chart(data, tickers, chart_style="line"):
+    def create_price_chart(data, tickers, chart_style="line", indicators=(), width=700):
         if data.empty:
             return mo.md("No data to display")
         
         try:
-            # Prepare data for visualization
-            chart_data = []
+            # Prepare data for visualization: long (Date, Price, Ticker) table
+            df = marketdata.wide_to_long(data, 'Close', tickers)
             
-            for ticker in tickers:
-                try:
-                    if 'Close' in data.columns.levels[0]:
-                        close_prices = data['Close'][ticker].dropna()
-                    else:
-                        # Single ticker case
-                        close_prices = data['Close'].dropna()
-                    
-                    for date, price in close_prices.items():
-                        chart_data.append({
-                            'Date': date,
-                            'Price': price,
-                            'Ticker': ticker
-                        })
-                except (KeyError, IndexError):
-                    continue
-            
-            if not chart_data:
+            if df.empty:
                 return mo.md("No valid price data available")
             
-            df = pd.DataFrame(chart_data)
+            if chart_style == "candlestick":
+                # OHLC bars at the finest resolution that fits the chart width, from the
+                # source's precomputed aggregates where it has them
+                daily = price_table
+                resolution = marketdata.resolution_for(daily, width)
+                bars = daily if resolution == "daily" else price_source.aggregate(
+                    tickers, resolution, start=daily["Date"].min()
+                )
+                return mo.ui.altair_chart(marketdata.candlestick_chart(
+                    bars.to_frame(), width=width, height=400,
+                    title=f"Stock Price Comparison - {', '.join(tickers)} ({resolution} candles)"
+                ))
+            
+            # At most ~one point per pixel per ticker, keeping local highs and lows
+            df, show_points = marketdata.downsample_long(df, width=width)
             
             # Create the chart based on selected style
             base_chart = alt.Chart(df).add_selection(
@@ -152,39 +174,41 @@ def __(alt, chart_type, mo, pd, selected_tickers, stock_data):
             )
             
             if chart_style == "line":
-                chart = base_chart.mark_line(point=True).encode(
+                chart = base_chart.mark_line(point=show_points).encode(
                     x=alt.X('Date:T', title='Date'),
                     y=alt.Y('Price:Q', title='Price ($)'),
                     color=alt.Color('Ticker:N', title='Stock'),
                     tooltip=['Date:T', 'Ticker:N', 'Price:Q']
                 )
-            elif chart_style == "area":
+            else:  # area
                 chart = base_chart.mark_area(opacity=0.7).encode(
                     x=alt.X('Date:T', title='Date'),
                     y=alt.Y('Price:Q', title='Price ($)'),
                     color=alt.Color('Ticker:N', title='Stock'),
                     tooltip=['Date:T', 'Ticker:N', 'Price:Q']
                 )
-            else:  # candlestick - simplified as line for now
-                chart = base_chart.mark_line().encode(
-                    x=alt.X('Date:T', title='Date'),
-                    y=alt.Y('Price:Q', title='Price ($)'),
-                    color=alt.Color('Ticker:N', title='Stock'),
-                    tooltip=['Date:T', 'Ticker:N', 'Price:Q']
-                )
+            
+            # Indicator series come from the cached engine: toggling them only re-renders
+            overlay, panels = marketdata.indicator_charts(price_table, indicators, width=width)
+            if overlay is not None:
+                chart = alt.layer(chart, overlay)
             
             chart = chart.properties(
-                width=700,
+                width=width,
                 height=400,
                 title=f"Stock Price Comparison - {', '.join(tickers)}"
             ).interactive()
             
+            if panels:
+                return mo.vstack([mo.ui.altair_chart(chart), *[mo.ui.altair_chart(p) for p in panels]])
             return mo.ui.altair_chart(chart)
             
         except Exception as e:
             return mo.md(f"Error creating chart: {str(e)}")
     
-    price_chart = create_price_chart(stock_data, selected_tickers, chart_type.value)
+    with marketdata.timeline.span("chart", detail=chart_type.value) as _span:
+        price_chart = create_price_chart(stock_data, selected_tickers, chart_type.value, indicator_selector.value)
+        _span["bytes"] = len(price_chart.text)
     price_chart
     return create_price_chart, price_chart
 
@@ -196,57 +220,368 @@ def __(mo):
 
 
 @app.cell
-def __(mo, pd, selected_tickers, stock_data):
+def __(mo, pd, selected_tickers, stock_data, marketdata):
     # Calculate and display performance metrics
     def calculate_metrics(data, tickers):
         if data.empty:
             return mo.md("No data available for metrics calculation")
         
         try:
-            metrics = []
-            
-            for ticker in tickers:
-                try:
-                    if 'Close' in data.columns.levels[0]:
-                        prices = data['Close'][ticker].dropna()
-                        volumes = data['Volume'][ticker].dropna() if 'Volume' in data.columns.levels[0] else None
-                    else:
-                        prices = data['Close'].dropna()
-                        volumes = data['Volume'].dropna() if 'Volume' in data.columns else None
-                    
-                    if len(prices) < 2:
-                        continue
-                    
-                    current_price = prices.iloc[-1]
-                    first_price = prices.iloc[0]
-                    returns = ((current_price - first_price) / first_price) * 100
-                    volatility = prices.pct_change().std() * np.sqrt(252) * 100  # Annualized volatility
-                    avg_volume = volumes.mean() if volumes is not None else 0
-                    
-                    metrics.append({
-                        'Ticker': ticker,
-                        'Current Price': f"${current_price:.2f}",
-                        'Total Return': f"{returns:.2f}%",
-                        'Volatility': f"{volatility:.2f}%",
-                        'Avg Daily Volume': f"{avg_volume:,.0f}" if avg_volume > 0 else "N/A"
-                    })
-                    
-                except (KeyError, IndexError, TypeError):
-                    continue
+            # One vectorized pass over all tickers; numbers are formatted below
+            close = marketdata.field_frame(data, 'Close', tickers)
+            volume = marketdata.field_frame(data, 'Volume', tickers) if 'Volume' in data.columns.get_level_values(0) else None
+            metrics = marketdata.metrics_from_wide(close, volume)
             
-            if not metrics:
+            if metrics.empty:
                 return mo.md("Unable to calculate metrics for the selected stocks")
             
-            metrics_df = pd.DataFrame(metrics)
+            metrics_df = pd.DataFrame({
+                'Ticker': metrics['Ticker'],
+                'Current Price': metrics['Current Price'].map("${:.2f}".format),
+                'Total Return': metrics['Total Return'].map("{:.2f}%".format),
+                'Volatility': metrics['Volatility'].map("{:.2f}%".format),
+                'Avg Daily Volume': metrics['Avg Daily Volume'].map(
+                    lambda v: f"{v:,.0f}" if v > 0 else "N/A"
+                ),
+            })
             return mo.ui.table(metrics_df, selection=None)
             
         except Exception as e:
             return mo.md(f"Error calculating metrics: {str(e)}")
     
-    import numpy as np
-    metrics_table = calculate_metrics(stock_data, selected_tickers)
+    with marketdata.timeline.span("metrics", rows=len(selected_tickers)):
+        metrics_table = calculate_metrics(stock_data, selected_tickers)
     metrics_table
-    return calculate_metrics, metrics_table, np
+    return calculate_metrics, metrics_table
+
+
+@app.cell(hide_code=True)
+def __(mo):
+    mo.md(r"""## Sector Analysis""")
+    return
+
+
+@app.cell
+def __(marketdata, mo):
+    # Symbol -> name/sector map for the S&P 500 universe, parsed once
+    sector_map = marketdata.load_sectors("baba-finance/sp500data.csv")
+    
+    sector_selector = mo.ui.dropdown(
+        options=sector_map.sectors,
+        value=sector_map.sectors[0],
+        label="Sector:"
+    )
+    
+    load_sectors_switch = mo.ui.switch(
+        value=False,
+        label="Load all constituents (the first run downloads the whole universe)"
+    )
+    
+    mo.hstack([sector_selector, load_sectors_switch], justify="space-around")
+    return load_sectors_switch, sector_map, sector_selector
+
+
+@app.cell
+def __(load_sectors_switch, marketdata, mo, period_selector, price_source, sector_map):
+    # Index levels for every sector in one vectorized pass; cached on the price data version,
+    # and this cell does not depend on the sector dropdown, so switching sectors is instant
+    def load_sector_index(period):
+        try:
+            universe = price_source.load(sector_map.symbols, start=marketdata.period_start(period))
+            return universe, marketdata.cached_sector_index(universe, sector_map, version=price_source.version())
+        except Exception as e:
+            mo.status.toast(f"Error loading sector data: {str(e)}", kind="danger")
+            return None, None
+    
+    universe_table, sector_table = (
+        load_sector_index(period_selector.value) if load_sectors_switch.value else (None, None)
+    )
+    return load_sector_index, sector_table, universe_table
+
+
+@app.cell
+def __(alt, marketdata, mo, pd, sector_map, sector_selector, sector_table):
+    # Sector index chart (selected sector highlighted) and per-sector metrics
+    def sector_overview(index, sector):
+        if index is None:
+            return mo.md("Switch on *Load all constituents* to compute the sector indices.")
+        if not len(index):
+            return mo.md("No sector data available")
+    
+        levels = index.to_frame()[['Date', 'Ticker', 'Close']].rename(
+            columns={'Ticker': 'Sector', 'Close': 'Index'}
+        )
+        levels['Sector'] = levels['Sector'].astype(str)
+        chart = alt.Chart(levels).mark_line().encode(
+            x=alt.X('Date:T', title='Date'),
+            y=alt.Y('Index:Q', title='Equal-weighted index (start = 100)', scale=alt.Scale(zero=False)),
+            color=alt.Color('Sector:N'),
+            opacity=alt.condition(alt.datum.Sector == sector, alt.value(1.0), alt.value(0.2)),
+            tooltip=['Date:T', 'Sector:N', 'Index:Q']
+        ).properties(width=700, height=350, title=f"Sector Indices - {sector} highlighted")
+    
+        metrics = marketdata.sector_metrics(index)
+        metrics_df = pd.DataFrame({
+            'Sector': metrics['Sector'],
+            'Return': metrics['Total Return'].map("{:.2f}%".format),
+            'Volatility': metrics['Volatility'].map("{:.2f}%".format),
+            'Members': [len(sector_map.members(s)) for s in metrics['Sector']],
+        })
+        members = ", ".join(sector_map.members(sector))
+        return mo.vstack([
+            mo.ui.altair_chart(chart),
+            mo.ui.table(metrics_df, selection=None),
+            mo.md(f"**{sector} constituents:** {members}"),
+        ])
+    
+    sector_view = sector_overview(sector_table, sector_selector.value)
+    sector_view
+    return sector_overview, sector_view
+
+
+@app.cell(hide_code=True)
+def __(mo):
+    mo.md(r"""## Correlation Analysis""")
+    return
+
+
+@app.cell
+def __(mo, selected_tickers):
+    # Correlation widgets: window length for the rolling view and the ranking target
+    corr_window = mo.ui.slider(
+        start=20, stop=250, step=10, value=60,
+        label="Rolling window (trading days):"
+    )
+    
+    corr_target = mo.ui.dropdown(
+        options=selected_tickers or ["-"],
+        value=(selected_tickers or ["-"])[0],
+        label="Most correlated with:"
+    )
+    
+    mo.hstack([corr_window, corr_target], justify="space-around")
+    return corr_target, corr_window
+
+
+@app.cell
+def __(marketdata, price_table, selected_tickers):
+    # Aligned daily returns of the selected tickers, shared by the views below
+    def selected_returns(table, tickers):
+        if not len(table):
+            return None
+        return marketdata.aligned_returns(table, [t for t in tickers if t in table.tickers])
+    
+    selected_aligned = selected_returns(price_table, selected_tickers)
+    return selected_aligned, selected_returns
+
+
+@app.cell
+def __(alt, corr_window, marketdata, mo, pd, selected_aligned):
+    # Full-period and last-window correlation heatmaps plus rolling pair correlations
+    def correlation_views(aligned, window):
+        if aligned is None or len(aligned[1]) < 2:
+            return mo.md("Select at least two tickers to compare correlations.")
+    
+        dates, tickers, returns = aligned
+        window = min(window, len(returns))
+        full = marketdata.correlation_matrix(returns)
+        recent = marketdata.PairMoments.from_returns(returns[-window:]).corr()
+        heatmaps = mo.hstack([
+            mo.ui.altair_chart(marketdata.correlation_heatmap(full, tickers, title="Full period", size=320)),
+            mo.ui.altair_chart(marketdata.correlation_heatmap(recent, tickers, title=f"Last {window} days", size=320)),
+        ])
+    
+        # Every window step is an O(tickers^2) update of the running sums
+        if len(tickers) > 8:
+            return heatmaps
+        days, pairs, values = marketdata.rolling_pair_correlations(returns, window)
+        if not len(days):
+            return heatmaps
+        lines = pd.DataFrame({
+            'Date': pd.to_datetime(dates[days]).repeat(len(pairs)),
+            'Pair': [f"{tickers[i]}/{tickers[j]}" for i, j in pairs] * len(days),
+            'Correlation': values.ravel(),
+        })
+        rolling_chart = alt.Chart(lines).mark_line().encode(
+            x=alt.X('Date:T', title='Date'),
+            y=alt.Y('Correlation:Q', scale=alt.Scale(domain=[-1, 1])),
+            color='Pair:N',
+            tooltip=['Date:T', 'Pair:N', alt.Tooltip('Correlation:Q', format='.2f')]
+        ).properties(width=700, height=250, title=f"{window}-day rolling correlation")
+        return mo.vstack([heatmaps, mo.ui.altair_chart(rolling_chart)])
+    
+    with marketdata.timeline.span("correlation", rows=len(selected_aligned[0]) if selected_aligned else 0):
+        correlation_view = correlation_views(selected_aligned, corr_window.value)
+    correlation_view
+    return correlation_view, correlation_views
+
+
+@app.cell
+def __(corr_target, marketdata, mo, pd, price_table, universe_table):
+    # Rank tickers by correlation with the target: across the whole S&P 500 universe
+    # once the sector data is loaded, otherwise across the selected tickers
+    def correlation_ranking(table, universe, target, top=10):
+        if not len(table) or target not in table.tickers:
+            return mo.md("")
+        pool = table if universe is None else universe
+        if target not in pool.tickers:
+            pool = marketdata.concat_tables([pool, marketdata.TickerIndex(table).select([target])])
+        dates, tickers, returns = marketdata.aligned_returns(pool)
+        ranking = marketdata.most_correlated(returns, tickers, target, top=top)
+        if not ranking:
+            return mo.md(f"Not enough overlapping data to rank correlations with {target}.")
+        scope = "S&P 500 universe" if universe is not None else "selected tickers"
+        return mo.vstack([
+            mo.md(f"**Most correlated with {target}** ({scope})"),
+            mo.ui.table(pd.DataFrame({
+                'Ticker': [t for t, _ in ranking],
+                'Correlation': [f"{c:.2f}" for _, c in ranking],
+            }), selection=None),
+        ])
+    
+    correlation_rank = correlation_ranking(price_table, universe_table, corr_target.value)
+    correlation_rank
+    return correlation_rank, correlation_ranking
+
+
+@app.cell(hide_code=True)
+def __(mo):
+    mo.md(r"""## Monte Carlo Simulation""")
+    return
+
+
+@app.cell
+def __(mo):
+    # Monte Carlo widgets: return model, horizon and number of simulated paths
+    mc_model = mo.ui.dropdown(
+        options={"Historical bootstrap": "bootstrap", "Correlated normal": "normal"},
+        value="Historical bootstrap",
+        label="Model:"
+    )
+    
+    mc_horizon = mo.ui.slider(
+        start=21, stop=504, step=21, value=252,
+        label="Horizon (trading days):"
+    )
+    
+    mc_paths = mo.ui.dropdown(
+        options={"10,000": 10_000, "100,000": 100_000, "1,000,000": 1_000_000},
+        value="100,000",
+        label="Paths:"
+    )
+    
+    mc_run = mo.ui.run_button(label="Simulate")
+    
+    mo.hstack([mc_model, mc_horizon, mc_paths, mc_run], justify="space-around")
+    return mc_horizon, mc_model, mc_paths, mc_run
+
+
+@app.cell
+def __(marketdata, mc_horizon, mc_model, mc_paths, mc_run, mo, pd, selected_aligned, stock_data):
+    # Forward paths of an equal-weight portfolio of the selected tickers, simulated
+    # in chunks on a process pool; the fan chart is redrawn as chunks finish
+    def simulate_portfolio(aligned, data, model, paths, horizon, refreshes=20):
+        if aligned is None or not len(aligned[1]):
+            return mo.md("Select tickers to simulate portfolio paths.")
+        tickers = aligned[1]
+        # The normal model uses the annualized volatility of the metrics table
+        metrics = marketdata.metrics_from_wide(marketdata.field_frame(data, 'Close', tickers))
+        volatility = metrics.set_index('Ticker')['Volatility'].reindex(tickers).to_numpy()
+        try:
+            simulator = marketdata.PortfolioSimulator.from_aligned(aligned, model=model, volatility=volatility)
+        except ValueError as e:
+            return mo.md(f"Cannot simulate: {e}")
+        
+        title = f"Equal-weight {', '.join(tickers)}"
+        chunks = -(-paths // marketdata.montecarlo.CHUNK_PATHS)
+        workers = marketdata.montecarlo.default_workers()
+        summary = None
+        for i, summary in enumerate(simulator.iter_run(paths, horizon, workers=workers)):
+            if i < chunks - 1 and i % max(1, chunks // refreshes) == 0:
+                mo.output.replace(mo.ui.altair_chart(marketdata.fan_chart(
+                    summary, title=f"{title}: {summary.paths:,} of {paths:,} paths"
+                )))
+        
+        risk = pd.DataFrame({
+            'Measure': ['Median outcome', 'VaR 95%', 'CVaR 95%', 'VaR 99%', 'CVaR 99%'],
+            'Value': [
+                f"{summary.quantiles([50])[0, -1] - 1:+.2%}",
+                f"{summary.var(0.95):.2%}", f"{summary.cvar(0.95):.2%}",
+                f"{summary.var(0.99):.2%}", f"{summary.cvar(0.99):.2%}",
+            ],
+        })
+        return mo.vstack([
+            mo.ui.altair_chart(marketdata.fan_chart(summary, title=f"{title}: {summary.paths:,} paths")),
+            mo.md(f"**Losses over {horizon} trading days** (fraction of today's value)"),
+            mo.ui.table(risk, selection=None),
+        ])
+    
+    if mc_run.value:
+        with marketdata.timeline.span("monte carlo", rows=mc_paths.value):
+            monte_carlo = simulate_portfolio(selected_aligned, stock_data, mc_model.value, mc_paths.value, mc_horizon.value)
+    else:
+        monte_carlo = mo.md("Press **Simulate** to run the Monte Carlo simulation.")
+    monte_carlo
+    return monte_carlo, simulate_portfolio
+
+
+@app.cell(hide_code=True)
+def __(mo):
+    mo.md(r"""## Efficient Frontier""")
+    return
+
+
+@app.cell
+def __(mo):
+    # Frontier widgets: short positions and the risk-free rate used for the Sharpe ratio
+    frontier_shorts = mo.ui.switch(label="Allow short positions")
+    
+    frontier_risk_free = mo.ui.slider(
+        start=0.0, stop=6.0, step=0.25, value=0.0,
+        label="Risk-free rate (%):"
+    )
+    
+    mo.hstack([frontier_shorts, frontier_risk_free], justify="space-around")
+    return frontier_risk_free, frontier_shorts
+
+
+@app.cell
+def __(frontier_risk_free, frontier_shorts, marketdata, mo, pd, selected_aligned):
+    # Minimum-variance frontier of the selected tickers, solved for every target return at once;
+    # the moments are cached per ticker set and updated by difference when the period changes
+    def frontier_view(aligned, long_only, risk_free):
+        if aligned is None or len(aligned[1]) < 2:
+            return mo.md("Select at least two tickers to compute the efficient frontier.")
+        tickers = aligned[1]
+        mean, cov = marketdata.moment_cache.moments(aligned)
+        if not (pd.notna(mean).all() and pd.notna(cov).all()):
+            return mo.md("Not enough overlapping history to estimate expected returns and covariances.")
+        frontier = marketdata.efficient_frontier(mean, cov, risk_free=risk_free, long_only=long_only)
+        
+        optimal = pd.DataFrame({
+            'Ticker': tickers,
+            'Minimum variance': frontier['min_variance']['weights'] * 100,
+            'Maximum Sharpe': frontier['max_sharpe']['weights'] * 100,
+        })
+        # Tickers without weight in either portfolio are left out
+        optimal = optimal[optimal[['Minimum variance', 'Maximum Sharpe']].abs().max(axis=1) >= 0.05]
+        optimal = optimal.sort_values('Maximum Sharpe', ascending=False).round(2)
+        summary = pd.DataFrame([
+            {'Portfolio': name, 'Return (%)': round(p['return'] * 100, 2),
+             'Volatility (%)': round(p['volatility'] * 100, 2), 'Sharpe': round(p['sharpe'], 2)}
+            for name, p in (('Minimum variance', frontier['min_variance']), ('Maximum Sharpe', frontier['max_sharpe']))
+        ])
+        return mo.vstack([
+            mo.ui.altair_chart(marketdata.frontier_chart(frontier, tickers, mean, cov)),
+            mo.ui.table(summary, selection=None),
+            mo.md("**Optimal weights (%)**"),
+            mo.ui.table(optimal, selection=None),
+        ])
+    
+    with marketdata.timeline.span("frontier", rows=len(selected_aligned[1]) if selected_aligned else 0):
+        frontier = frontier_view(selected_aligned, not frontier_shorts.value, frontier_risk_free.value / 100)
+    frontier
+    return frontier, frontier_view
 
 
 @app.cell(hide_code=True)
@@ -256,27 +591,25 @@ def __(mo):
 
 
 @app.cell
-def __(alt, mo, pd, yf):
+def __(alt, marketdata, mo, pd, price_source):
     # S&P 500 overview
     def get_sp500_overview():
         try:
-            # Get S&P 500 index data
-            sp500 = yf.download("^GSPC", period="1mo", progress=False)
+            # Get S&P 500 index data through the same source and cache
+            sp500 = marketdata.table_to_wide(
+                price_source.load(["^GSPC"], start=marketdata.period_start("1mo"))
+            )
             
             if sp500.empty:
                 return mo.md("Unable to fetch S&P 500 data")
             
-            current_price = sp500['Close'].iloc[-1]
-            prev_close = sp500['Close'].iloc[0]
-            change = current_price - prev_close
-            change_pct = (change / prev_close) * 100
-            
             # Create a simple trend chart
-            chart_data = []
-            for date, price in sp500['Close'].items():
-                chart_data.append({'Date': date, 'Price': price})
+            df = marketdata.wide_to_long(sp500, 'Close', ['^GSPC'])
             
-            df = pd.DataFrame(chart_data)
+            current_price = df['Price'].iloc[-1]
+            prev_close = df['Price'].iloc[0]
+            change = current_price - prev_close
+            change_pct = (change / prev_close) * 100
             
             trend_chart = alt.Chart(df).mark_line(color='blue', strokeWidth=2).encode(
                 x=alt.X('Date:T', title='Date'),
@@ -312,6 +645,39 @@ def __(alt, mo, pd, yf):
     return get_sp500_overview, sp500_overview
 
 
+@app.cell(hide_code=True)
+def __(correlation_view, frontier, marketdata, metrics_table, mo, monte_carlo, price_chart, sp500_overview):
+    # Timing spans of the latest data load and the views built from it
+    # (fetch, parse, load, frame, metrics, chart...), see marketdata/timing.py
+    def performance_panel(timeline):
+        spans = timeline.latest()
+        if not spans:
+            return mo.md("")
+        total_ms = sum(s["seconds"] for s in spans) * 1000
+        export = mo.download(
+            data=timeline.to_json(spans).encode("utf-8"),
+            filename="performance.json",
+            mimetype="application/json",
+            label="Export JSON",
+        )
+        summary = [
+            {"Stage": t["stage"], "Count": t["count"], "ms": round(t["seconds"] * 1000, 1),
+             "Rows": t["rows"], "Bytes": t["bytes"]}
+            for t in timeline.summary(spans)
+        ]
+        return mo.accordion({
+            f"⏱️ Performance: {len(spans)} spans, {total_ms:.0f} ms": mo.vstack([
+                mo.ui.table(summary, selection=None, label="By stage"),
+                mo.ui.table(timeline.rows(spans), selection=None, label="Spans"),
+                export,
+            ])
+        })
+
+    performance = performance_panel(marketdata.timeline)
+    performance
+    return performance, performance_panel
+
+
 @app.cell(hide_code=True)
 def __(mo):
     mo.md(
@@ -326,6 +692,8 @@ def __(mo):
         - Real-time stock price data
         - Interactive charts with zoom and pan
         - Performance metrics calculation
+        - Monte Carlo simulation of the selected portfolio
+        - Efficient frontier with minimum-variance and maximum-Sharpe weights
         - S&P 500 market overview
         - Responsive design for web deployment
         
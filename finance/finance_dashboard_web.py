@@ -25,6 +25,95 @@ def __(mo):
 @app.cell
 def __():
     import marimo as mo
+    import time
+
+    # Startup timeline reported at the bottom of the page. In the browser the
+    # clock is seconds since navigation start (Pyodide boot included), elsewhere
+    # seconds since this cell ran.
+    startup = {"origin": time.perf_counter()}
+
+    def page_clock():
+        try:
+            import js
+        except ImportError:
+            return time.perf_counter() - startup["origin"]
+        return js.performance.now() / 1000
+    return mo, page_clock, startup
+
+
+@app.cell
+async def __(mo, page_clock, startup):
+    # First paint: the headline view precomputed by the collector, read with
+    # the standard library only. This cell runs before the pandas/NumPy/Altair
+    # imports below, so the numbers show while those are still loading.
+    import json as _json
+
+    async def load_headline(url='./data/views/headline.json'):
+        try:
+            from pyodide.http import pyfetch
+        except ImportError:
+            with open(url) as f:
+                return _json.load(f)
+        response = await pyfetch(url)
+        if not response.ok:
+            raise OSError(f"HTTP {response.status}: {response.status_text} ({url})")
+        return _json.loads(await response.string())
+
+    def sparkline(values, width=140, height=32):
+        values = [v for v in values if v is not None]
+        if not values:
+            return ""
+        low, high = min(values), max(values)
+        span = (high - low) or 1
+        step = width / max(len(values) - 1, 1)
+        points = " ".join(
+            f"{i * step:.1f},{height - (v - low) / span * height:.1f}" for i, v in enumerate(values)
+        )
+        color = '#2E8B57' if values[-1] >= values[0] else '#DC143C'
+        return (f'<svg width="{width}" height="{height}" viewBox="0 0 {width} {height}">'
+                f'<polyline fill="none" stroke="{color}" stroke-width="2" points="{points}"/></svg>')
+
+    def render_headline(headline):
+        # Metrics are null for tickers without enough bars: shown as n/a, like format_metrics
+        money = lambda v: "n/a" if v is None else f"${v:.2f}"
+        percent = lambda v, sign="": "n/a" if v is None else f"{v:{sign}.2f}%"
+        parts = []
+        market = headline.get('market')
+        if market and None not in market.values():
+            direction = "📈" if market['change'] >= 0 else "📉"
+            parts.append(
+                f"**S&P 500:** {market['current_price']:.2f} {direction} "
+                f"{market['change']:+.2f} ({market['change_pct']:+.2f}%) over 30 days"
+            )
+        rows = "".join(
+            f"<tr><td><b>{row['Ticker']}</b></td><td>{money(row['Current Price'])}</td>"
+            f"<td>{percent(row['Total Return'], '+')}</td><td>{percent(row['Volatility'])}</td>"
+            f"<td>{sparkline(row['closes'])}</td></tr>"
+            for row in headline['rows'] if row['closes']
+        )
+        if rows:
+            parts.append(
+                f"<table><tr><th>Ticker</th><th>Price</th><th>{headline['period']} Return</th>"
+                f"<th>Volatility</th><th>{headline['start']} – {headline['end']}</th></tr>{rows}</table>"
+            )
+        parts.append("*Interactive charts and analysis load below.*")
+        return mo.md("\n\n".join(parts))
+
+    try:
+        headline = await load_headline()
+        headline_view = render_headline(headline)
+    except Exception as e:
+        print(f"Headline view unavailable: {e}")
+        headline = None
+        headline_view = mo.md("")
+    startup["first_content"] = page_clock()
+    headline_view
+    return headline, headline_view, load_headline, render_headline, sparkline
+
+
+@app.cell
+def __():
+    # Heavy libraries, imported after the headline has been painted
     import pandas as pd
     import numpy as np
     import altair as alt
@@ -33,7 +122,42 @@ def __():
 
     # Enable Altair to render in marimo
     alt.data_transformers.enable('json')
-    return alt, datetime, json, mo, np, pd, timedelta
+    return alt, datetime, json, np, pd, timedelta
+
+
+@app.cell
+async def __():
+    # Shared data helpers live in ./marketdata. The WebAssembly build serves them
+    # as marketdata.zip next to the notebook and unpacks it into Pyodide.
+    try:
+        import marketdata
+    except ImportError:
+        import sys
+        from pyodide.http import pyfetch
+
+        response = await pyfetch('./marketdata.zip')
+        await response.unpack_archive(extract_dir='/home/pyodide/lib')
+        sys.path.insert(0, '/home/pyodide/lib')
+        import marketdata
+    return (marketdata,)
+
+
+@app.cell
+async def __(marketdata):
+    # Request the small data files at once so the round trips overlap; this cell
+    # does not depend on any widget, so it runs once per page load
+    data_files = await marketdata.fetch_all({
+        'manifest': ('./data/manifest.json', marketdata.parse_json),
+        'timestamp': ('./data/last_updated.json', marketdata.parse_json),
+        'market': ('./data/market_overview.json', marketdata.parse_json),
+    })
+
+    # Price shards are read through the data layer's static-files backend
+    _manifest = data_files['manifest']
+    price_source = marketdata.open_source(
+        "static", base="./data", manifest=None if isinstance(_manifest, Exception) else _manifest
+    )
+    return data_files, price_source
 
 
 @app.cell(hide_code=True)
@@ -43,7 +167,7 @@ def __(mo):
 
 
 @app.cell
-def __(mo):
+def __(marketdata, mo):
     # Create interactive widgets for stock selection
     stock_input = mo.ui.text(
         value="AAPL,GOOGL,MSFT,AMZN",
@@ -58,92 +182,104 @@ def __(mo):
     )
 
     chart_type = mo.ui.dropdown(
-        options=["line", "area"],
+        options=["line", "area", "candlestick"],
         value="line",
         label="Chart Type:"
     )
 
-    mo.hstack([stock_input, period_selector, chart_type], justify="space-around")
-    return chart_type, period_selector, stock_input
+    indicator_selector = mo.ui.multiselect(
+        options=marketdata.INDICATOR_CHOICES,
+        value=[],
+        label="Indicators:"
+    )
+
+    mo.vstack([
+        mo.hstack([stock_input, period_selector, chart_type], justify="space-around"),
+        mo.hstack([indicator_selector], justify="center"),
+    ])
+    return chart_type, indicator_selector, period_selector, stock_input
 
 
 @app.cell
-def __(stock_input, period_selector, pd, np, datetime, timedelta, json):
-    # Load real financial data from JSON files
-    def load_real_data(tickers_str, period):
+async def __(stock_input, period_selector, pd, np, datetime, timedelta, data_files, marketdata, price_source):
+    # Load real financial data: the collector's precomputed views of the period.
+    # Daily shards are only downloaded here when no views are published; otherwise
+    # the cell below loads them for the views that need daily bars
+    async def load_real_data(tickers_str, period):
         tickers = [ticker.strip().upper() for ticker in tickers_str.split(',')]
         if not tickers or tickers == ['']:
-            return pd.DataFrame(), [], None
+            return pd.DataFrame(), [], None, marketdata.PriceTable.empty(), None
 
         try:
-            # Try to load real data from JSON files
-            try:
-                # For WebAssembly, use JavaScript fetch via js module
-                import js
-                from pyodide.ffi import to_js
-                
-                # Create a synchronous fetch using XMLHttpRequest
-                def fetch_json_sync(url):
-                    print(f"DEBUG: Attempting to fetch {url}")
-                    xhr = js.XMLHttpRequest.new()
-                    xhr.open('GET', url, False)  # False = synchronous
-                    xhr.send(None)
-                    print(f"DEBUG: XMLHttpRequest status: {xhr.status}")
-                    print(f"DEBUG: XMLHttpRequest statusText: {xhr.statusText}")
-                    if xhr.status == 200:
-                        print(f"DEBUG: Response received, length: {len(xhr.responseText)}")
-                        data = json.loads(xhr.responseText)
-                        print(f"DEBUG: JSON parsed successfully, type: {type(data)}")
-                        return data
-                    else:
-                        print(f"DEBUG: HTTP error {xhr.status}: {xhr.statusText}")
-                        raise Exception(f"HTTP {xhr.status}: {xhr.statusText}")
-                
-                print("DEBUG: Fetching stock data...")
-                stock_data = fetch_json_sync('./data/stock_data.json')
-                print("DEBUG: Fetching timestamp info...")
-                timestamp_info = fetch_json_sync('./data/last_updated.json')
-                print("DEBUG: Both files fetched successfully")
-                
-            except (ImportError, Exception) as e:
-                print(f"WebAssembly fetch failed: {e}")
-                # Fallback to direct file access for local testing
-                try:
-                    with open('data/stock_data.json', 'r') as f:
-                        stock_data = json.load(f)
-                    
-                    with open('data/last_updated.json', 'r') as f:
-                        timestamp_info = json.load(f)
-                except Exception as file_err:
-                    print(f"File access failed: {file_err}")
-                    raise Exception(f"Both WebAssembly fetch and local file access failed")
-
-            # Convert to DataFrame and filter
-            df = pd.DataFrame(stock_data)
-            df['Date'] = pd.to_datetime(df['Date'])
+            manifest = data_files['manifest']
+            timestamp_info = data_files['timestamp']
+            for loaded in (manifest, timestamp_info):
+                if isinstance(loaded, Exception):
+                    print(f"Data file unavailable: {loaded}")
+                    raise loaded
 
             # Filter for requested tickers
-            available_tickers = [t for t in tickers if t in df['Ticker'].unique()]
+            available = set(marketdata.manifest_tickers(manifest))
+            available_tickers = [t for t in tickers if t in available]
             if not available_tickers:
-                return pd.DataFrame(), [], {'error': 'No data available for requested tickers'}
-
-            df_filtered = df[df['Ticker'].isin(available_tickers)]
-
-            # Apply period filter
+                return pd.DataFrame(), [], {'error': 'No data available for requested tickers'}, marketdata.PriceTable.empty(), None
+
+            # Chart rows and metrics of the period, versioned by content hash in the manifest
+            published = manifest.get('views', {})
+            if f"chart_{period}" in published and f"metrics_{period}" in published:
+                views = await marketdata.fetch_all({
+                    'chart': marketdata.shard_request('./data', manifest, published[f"chart_{period}"]),
+                    'metrics': (marketdata.view_url('./data', manifest, f"metrics_{period}"), marketdata.parse_json),
+                })
+                for loaded in views.values():
+                    if isinstance(loaded, Exception):
+                        raise loaded
+                with marketdata.timeline.span("frame", detail="chart view") as span:
+                    df_chart = views['chart'].select(available_tickers).to_frame()
+                    span["rows"] = len(df_chart)
+                return df_chart, available_tickers, timestamp_info, None, views['metrics']
+
+            # Without published views, apply the period filter here; only shards overlapping it are downloaded
             period_days = {"1M": 30, "3M": 90, "6M": 180, "1Y": 365}
             days = period_days.get(period, 90)
-            cutoff_date = datetime.now() - timedelta(days=days)
-            df_filtered = df_filtered[df_filtered['Date'] >= cutoff_date]
+            cutoff_date = (datetime.now() - timedelta(days=days)).date()
 
-            return df_filtered, available_tickers, timestamp_info
+            table = await price_source.aload(available_tickers, start=cutoff_date)
+            with marketdata.timeline.span("frame", rows=len(table)):
+                df_filtered = table.to_frame()
+
+            return df_filtered, available_tickers, timestamp_info, table, None
 
         except Exception as e:
             print(f"Error loading real data: {e}")
-            return pd.DataFrame(), [], {'error': f'Failed to load data: {str(e)}'}
+            return pd.DataFrame(), [], {'error': f'Failed to load data: {str(e)}'}, marketdata.PriceTable.empty(), None
+
 
+    # Spans recorded from here on make up this load's performance report
+    marketdata.timeline.begin_run(f"{stock_input.value} ({period_selector.value})")
+    stock_data, selected_tickers, data_info, daily_table, period_view = await load_real_data(stock_input.value, period_selector.value)
+    return daily_table, data_info, load_real_data, period_view, selected_tickers, stock_data
 
-    stock_data, selected_tickers, data_info = load_real_data(stock_input.value, period_selector.value)
-    return load_real_data, selected_tickers, stock_data, data_info
+
+@app.cell
+async def __(chart_type, corr_switch, daily_table, indicator_selector, marketdata, period_view, price_source, selected_tickers):
+    # Daily bars of the selection, downloaded only for the views that need them:
+    # candlesticks, indicators and correlations. Line/area charts and metrics
+    # are drawn from the period's views alone
+    async def load_daily(tickers, needed):
+        if daily_table is not None:
+            return daily_table
+        if not needed or period_view is None or not tickers:
+            return marketdata.PriceTable.empty()
+        try:
+            return await price_source.aload(tickers, start=period_view['start'])
+        except Exception as e:
+            print(f"Error loading daily bars: {e}")
+            return marketdata.PriceTable.empty()
+
+    needs_daily = chart_type.value == "candlestick" or bool(indicator_selector.value) or corr_switch.value
+    price_table = await load_daily(selected_tickers, needs_daily)
+    return load_daily, needs_daily, price_table
 
 
 @app.cell(hide_code=True)
@@ -168,18 +304,36 @@ def __(mo):
 
 
 @app.cell
-def __(alt, chart_type, mo, selected_tickers, stock_data):
+async def __(alt, chart_type, indicator_selector, marketdata, mo, price_source, price_table, selected_tickers, stock_data):
     # Create interactive price chart
-    def create_price_chart(data, tickers, chart_style="line"):
+    async def create_price_chart(data, tickers, chart_style="line", indicators=(), width=700):
         if data.empty:
             return mo.md("No data to display")
 
         try:
+            if chart_style == "candlestick":
+                # OHLC bars at the finest resolution that fits the chart width; weekly and
+                # monthly bars are the collector's precomputed aggregates
+                daily = price_table
+                resolution = marketdata.resolution_for(daily, width)
+                bars = daily if resolution == "daily" else await price_source.aaggregate(
+                    tickers, resolution, start=daily["Date"].min()
+                )
+                return mo.ui.altair_chart(marketdata.candlestick_chart(
+                    bars.to_frame(), width=width, height=400,
+                    title=f"Stock Price Analysis - {', '.join(tickers)} ({resolution} candles)"
+                ))
+
+            # At most ~one point per pixel per ticker, keeping local highs and lows
+            chart_data, show_points = marketdata.downsample_long(
+                data[['Date', 'Ticker', 'Price']], width=width
+            )
+
             # Create the chart based on selected style
-            base_chart = alt.Chart(data)
+            base_chart = alt.Chart(chart_data)
 
             if chart_style == "line":
-                chart = base_chart.mark_line(point=True, strokeWidth=2).encode(
+                chart = base_chart.mark_line(point=show_points, strokeWidth=2).encode(
                     x=alt.X('Date:T', title='Date'),
                     y=alt.Y('Price:Q', title='Price ($)'),
                     color=alt.Color('Ticker:N', title='Stock', scale=alt.Scale(scheme='category10')),
@@ -193,20 +347,29 @@ def __(alt, chart_type, mo, selected_tickers, stock_data):
                     tooltip=['Date:T', 'Ticker:N', 'Price:Q']
                 )
 
+            # Indicator series come from the cached engine: toggling them only re-renders
+            overlay, panels = marketdata.indicator_charts(price_table, indicators, width=width)
+            if overlay is not None:
+                chart = alt.layer(chart, overlay)
+
             chart = chart.properties(
-                width=700,
+                width=width,
                 height=400,
                 title=f"Stock Price Analysis - {', '.join(tickers)}"
             ).resolve_scale(
                 color='independent'
             )
 
+            if panels:
+                return mo.vstack([mo.ui.altair_chart(chart), *[mo.ui.altair_chart(p) for p in panels]])
             return mo.ui.altair_chart(chart)
 
         except Exception as e:
             return mo.md(f"Error creating chart: {str(e)}")
 
-    price_chart = create_price_chart(stock_data, selected_tickers, chart_type.value)
+    with marketdata.timeline.span("chart", detail=chart_type.value) as _span:
+        price_chart = await create_price_chart(stock_data, selected_tickers, chart_type.value, indicator_selector.value)
+        _span["bytes"] = len(price_chart.text)
     price_chart
     return create_price_chart, price_chart
 
@@ -218,56 +381,91 @@ def __(mo):
 
 
 @app.cell
-def __(mo, pd, selected_tickers, stock_data, np):
+def __(mo, pd, selected_tickers, stock_data, np, marketdata, period_view):
     # Calculate and display performance metrics
+    def format_metrics(rows):
+        money = lambda v: "n/a" if v is None else f"${v:.2f}"
+        percent = lambda v, sign="": "n/a" if v is None else f"{v:{sign}.2f}%"
+        return [{
+            'Ticker': row['Ticker'],
+            'Current Price': money(row['Current Price']),
+            'Total Return': percent(row['Total Return'], "+"),
+            'Volatility': percent(row['Volatility']),
+            'Price Range': percent(row['Price Range']),
+            'High': money(row['High']),
+            'Low': money(row['Low']),
+        } for row in rows]
+
     def calculate_metrics(data, tickers):
         if data.empty:
             return mo.md("No data available for metrics calculation")
 
         try:
-            metrics = []
-
-            for ticker in tickers:
-                ticker_data = data[data['Ticker'] == ticker].sort_values('Date')
-
-                if len(ticker_data) < 2:
-                    continue
-
-                current_price = ticker_data['Price'].iloc[-1]
-                first_price = ticker_data['Price'].iloc[0]
-                returns = ((current_price - first_price) / first_price) * 100
-
-                # Calculate volatility (standard deviation of daily returns)
-                daily_returns = ticker_data['Price'].pct_change().dropna()
-                volatility = daily_returns.std() * np.sqrt(252) * 100  # Annualized
-
-                # Calculate some additional metrics
-                max_price = ticker_data['Price'].max()
-                min_price = ticker_data['Price'].min()
-                price_range = ((max_price - min_price) / min_price) * 100
-
-                metrics.append({
-                    'Ticker': ticker,
-                    'Current Price': f"${current_price:.2f}",
-                    'Total Return': f"{returns:+.2f}%",
-                    'Volatility': f"{volatility:.2f}%",
-                    'Price Range': f"{price_range:.2f}%",
-                    'High': f"${max_price:.2f}",
-                    'Low': f"${min_price:.2f}"
-                })
-
-            if not metrics:
+            if period_view is not None:
+                # Precomputed by the collector: only pick the selected rows
+                by_ticker = {row['Ticker']: row for row in period_view['rows']}
+                rows = [by_ticker[t] for t in tickers if t in by_ticker]
+            else:
+                # One vectorized pass over all tickers
+                rows = marketdata.metrics_from_long(data, tickers).to_dict("records")
+
+            if not rows:
                 return mo.md("Unable to calculate metrics for the selected stocks")
 
-            metrics_df = pd.DataFrame(metrics)
-            return mo.ui.table(metrics_df, selection=None)
+            return mo.ui.table(format_metrics(rows), selection=None)
 
         except Exception as e:
             return mo.md(f"Error calculating metrics: {str(e)}")
 
-    metrics_table = calculate_metrics(stock_data, selected_tickers)
+    with marketdata.timeline.span("metrics", rows=len(selected_tickers)):
+        metrics_table = calculate_metrics(stock_data, selected_tickers)
     metrics_table
-    return calculate_metrics, metrics_table
+    return calculate_metrics, format_metrics, metrics_table
+
+
+@app.cell(hide_code=True)
+def __(mo):
+    mo.md(r"""## Correlation Analysis""")
+    return
+
+
+@app.cell
+def __(mo):
+    corr_switch = mo.ui.switch(
+        value=False,
+        label="Compute correlations (downloads the daily bars)"
+    )
+
+    corr_window = mo.ui.slider(
+        start=20, stop=120, step=10, value=40,
+        label="Rolling window (trading days):"
+    )
+    mo.hstack([corr_switch, corr_window], justify="space-around")
+    return corr_switch, corr_window
+
+
+@app.cell
+def __(corr_switch, corr_window, marketdata, mo, price_table, selected_tickers):
+    # Full-period and last-window correlation of daily returns, from running sums
+    def correlation_views(table, tickers, window):
+        if not corr_switch.value:
+            return mo.md("Switch on *Compute correlations* to compare the selected tickers.")
+        if not len(table) or len(tickers) < 2:
+            return mo.md("Select at least two tickers to compare correlations.")
+
+        dates, names, returns = marketdata.aligned_returns(table, tickers)
+        window = min(window, len(returns))
+        full = marketdata.correlation_matrix(returns)
+        recent = marketdata.PairMoments.from_returns(returns[-window:]).corr()
+        return mo.hstack([
+            mo.ui.altair_chart(marketdata.correlation_heatmap(full, names, title="Full period", size=300)),
+            mo.ui.altair_chart(marketdata.correlation_heatmap(recent, names, title=f"Last {window} days", size=300)),
+        ])
+
+    with marketdata.timeline.span("correlation", rows=len(price_table)):
+        correlation_view = correlation_views(price_table, selected_tickers, corr_window.value)
+    correlation_view
+    return correlation_view, correlation_views
 
 
 @app.cell(hide_code=True)
@@ -277,48 +475,22 @@ def __(mo):
 
 
 @app.cell
-def __(alt, mo, pd, np, datetime, timedelta, json):
+def __(alt, mo, pd, np, datetime, timedelta, data_files):
     # Market overview with real S&P 500 data
     def get_market_overview():
         try:
-            # Try to load real market overview data
+            # Use the market overview fetched alongside the price store
             try:
-                try:
-                    # For WebAssembly, use JavaScript XMLHttpRequest
-                    import js
-                    
-                    def fetch_json_sync(url):
-                        print(f"DEBUG MARKET: Attempting to fetch {url}")
-                        xhr = js.XMLHttpRequest.new()
-                        xhr.open('GET', url, False)
-                        xhr.send(None)
-                        print(f"DEBUG MARKET: XMLHttpRequest status: {xhr.status}")
-                        if xhr.status == 200:
-                            print(f"DEBUG MARKET: Response received, length: {len(xhr.responseText)}")
-                            data = json.loads(xhr.responseText)
-                            print(f"DEBUG MARKET: JSON parsed successfully")
-                            return data
-                        else:
-                            print(f"DEBUG MARKET: HTTP error {xhr.status}: {xhr.statusText}")
-                            raise Exception(f"HTTP {xhr.status}: {xhr.statusText}")
-                    
-                    print("DEBUG MARKET: Starting market data fetch...")
-                    market_data = fetch_json_sync('./data/market_overview.json')
-                    print("DEBUG MARKET: Market data fetched successfully")
-                    
-                except (ImportError, Exception) as e:
-                    print(f"WebAssembly fetch failed: {e}")
-                    # Fallback to direct file access for local testing
-                    with open('data/market_overview.json', 'r') as f:
-                        market_data = json.load(f)
+                market_data = data_files['market']
+                if isinstance(market_data, Exception):
+                    raise market_data
 
                 current_price = market_data['current_price']
                 change = market_data['change']
                 change_pct = market_data['change_pct']
 
-                # Create chart data from real data
-                df = pd.DataFrame(market_data['data'])
-                df['Date'] = pd.to_datetime(df['Date'])
+                # The collector publishes chart-ready rows; hand them to Vega-Lite as is
+                df = alt.Data(values=market_data['data'])
 
                 data_source_note = "Real Market Data"
                 title_suffix = "(Real Data)"
@@ -380,6 +552,51 @@ def __(alt, mo, pd, np, datetime, timedelta, json):
     return get_market_overview, market_overview
 
 
+@app.cell(hide_code=True)
+def __(correlation_view, market_overview, marketdata, metrics_table, mo, price_chart):
+    # Timing spans of the latest data load and the views built from it
+    # (fetch, parse, load, frame, metrics, chart...), see marketdata/timing.py
+    def performance_panel(timeline):
+        spans = timeline.latest()
+        if not spans:
+            return mo.md("")
+        total_ms = sum(s["seconds"] for s in spans) * 1000
+        export = mo.download(
+            data=timeline.to_json(spans).encode("utf-8"),
+            filename="performance.json",
+            mimetype="application/json",
+            label="Export JSON",
+        )
+        summary = [
+            {"Stage": t["stage"], "Count": t["count"], "ms": round(t["seconds"] * 1000, 1),
+             "Rows": t["rows"], "Bytes": t["bytes"]}
+            for t in timeline.summary(spans)
+        ]
+        return mo.accordion({
+            f"⏱️ Performance: {len(spans)} spans, {total_ms:.0f} ms": mo.vstack([
+                mo.ui.table(summary, selection=None, label="By stage"),
+                mo.ui.table(timeline.rows(spans), selection=None, label="Spans"),
+                export,
+            ])
+        })
+
+    performance = performance_panel(marketdata.timeline)
+    performance
+    return performance, performance_panel
+
+
+@app.cell(hide_code=True)
+def __(correlation_view, market_overview, metrics_table, mo, page_clock, price_chart, startup):
+    # Runs once every interactive view above has rendered for the first time
+    startup.setdefault("interactive", page_clock())
+    _first = startup.get("first_content")
+    mo.md(
+        f"⏱️ *Startup: first content after {_first:.1f}s, interactive after {startup['interactive']:.1f}s.*"
+        if _first is not None else f"⏱️ *Startup: interactive after {startup['interactive']:.1f}s.*"
+    )
+    return
+
+
 @app.cell(hide_code=True)
 def __(mo):
     mo.md(
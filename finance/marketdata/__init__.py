@@ -0,0 +1,179 @@
+"""
+Shared market data helpers for the finance dashboards and the data collector.
+
+Everything here depends only on NumPy (pandas is imported lazily where a
+DataFrame is produced), so the package can be loaded inside Pyodide. Price
+data is read through the pluggable backends in sources.py.
+"""
+
+from .backtest import Backtest, random_weights
+from .cache import (
+    DataCache,
+    cache,
+    file_validator,
+    parse_index,
+    parse_json,
+    parse_store,
+    parse_wire,
+    parse_wire_index,
+)
+from .correlation import (
+    PairMoments,
+    aligned_returns,
+    correlation_heatmap,
+    correlation_matrix,
+    covariance_matrix,
+    most_correlated,
+    rolling_moments,
+    rolling_pair_correlations,
+)
+from .downsample import downsample_long, lttb_indices, minmax_indices
+from .fetch import fetch, fetch_all
+from .frontier import MomentCache, efficient_frontier, frontier_chart, frontier_weights, moment_cache
+from .index import TickerIndex
+from .indicators import (
+    INDICATOR_CHOICES,
+    INDICATORS,
+    IndicatorEngine,
+    indicator_charts,
+    parse_indicator,
+)
+from .metrics import compute_metrics, metrics_from_long, metrics_from_wide, segment_stats
+from .montecarlo import FanSummary, PortfolioSimulator, fan_chart
+from .ohlc import (
+    candlestick_chart,
+    choose_resolution,
+    extend_aggregate,
+    resample,
+    resolution_for,
+)
+from .reshape import field_frame, table_to_wide, wide_to_long, wide_to_table
+from .sectors import (
+    SectorMap,
+    cached_sector_index,
+    extend_sector_index,
+    load_sectors,
+    sector_index,
+    sector_metrics,
+)
+from .shards import (
+    aggregate_url,
+    manifest_tickers,
+    select_shards,
+    shard_request,
+    shard_url,
+    view_url,
+    write_shards,
+)
+from .sources import (
+    SOURCES,
+    AlphaVantageSource,
+    LocalSource,
+    Source,
+    StaticSource,
+    YFinanceSource,
+    open_source,
+)
+from .store import (
+    PriceTable,
+    concat_tables,
+    decode_store,
+    encode_store,
+    export_json,
+    read_store,
+    write_store,
+)
+from .timing import Timeline, timeline
+from .views import chart_view, metrics_view, write_views
+from .wire import decode_wire, encode_wire, write_wire
+from .yfcache import YFinanceCache, period_start
+
+__all__ = [
+    "AlphaVantageSource",
+    "Backtest",
+    "DataCache",
+    "FanSummary",
+    "INDICATORS",
+    "INDICATOR_CHOICES",
+    "IndicatorEngine",
+    "LocalSource",
+    "MomentCache",
+    "PairMoments",
+    "PortfolioSimulator",
+    "PriceTable",
+    "SOURCES",
+    "SectorMap",
+    "Source",
+    "StaticSource",
+    "TickerIndex",
+    "Timeline",
+    "YFinanceCache",
+    "YFinanceSource",
+    "aggregate_url",
+    "aligned_returns",
+    "cache",
+    "cached_sector_index",
+    "candlestick_chart",
+    "chart_view",
+    "choose_resolution",
+    "compute_metrics",
+    "concat_tables",
+    "correlation_heatmap",
+    "correlation_matrix",
+    "covariance_matrix",
+    "decode_store",
+    "decode_wire",
+    "downsample_long",
+    "efficient_frontier",
+    "encode_store",
+    "encode_wire",
+    "export_json",
+    "extend_aggregate",
+    "extend_sector_index",
+    "fan_chart",
+    "fetch",
+    "fetch_all",
+    "field_frame",
+    "file_validator",
+    "frontier_chart",
+    "frontier_weights",
+    "indicator_charts",
+    "load_sectors",
+    "lttb_indices",
+    "manifest_tickers",
+    "metrics_from_long",
+    "metrics_from_wide",
+    "metrics_view",
+    "minmax_indices",
+    "moment_cache",
+    "most_correlated",
+    "open_source",
+    "parse_index",
+    "parse_indicator",
+    "parse_json",
+    "parse_store",
+    "parse_wire",
+    "parse_wire_index",
+    "period_start",
+    "random_weights",
+    "read_store",
+    "resample",
+    "resolution_for",
+    "rolling_moments",
+    "rolling_pair_correlations",
+    "sector_index",
+    "sector_metrics",
+    "segment_stats",
+    "select_shards",
+    "shard_request",
+    "shard_url",
+    "table_to_wide",
+    "timeline",
+    "view_url",
+    "wide_to_long",
+    "wide_to_table",
+    "write_shards",
+    "write_store",
+    "write_views",
+    "write_wire",
+]
@@ -0,0 +1,120 @@
+"""
+Alpha Vantage TIME_SERIES_DAILY client.
+
+Responses are classified for the scheduler: per-minute rate-limit notes, 429s,
+5xx and network errors are RetryableError; the daily quota message stops
+scheduling; anything else that is not a time series is a permanent failure
+(None). `requests` is imported on first use so the package stays loadable in
+Pyodide.
+"""
+
+import math
+
+import numpy as np
+
+from .scheduler import RetryableError, StopScheduling
+
+API_URL = "https://www.alphavantage.co/query"
+
+
+class RateLimited(RetryableError):
+    """Per-minute rate limit "Note" from Alpha Vantage."""
+
+
+class DailyLimitReached(StopScheduling):
+    """Alpha Vantage reports the daily request quota as used up."""
+
+
+def fetch_alpha_vantage_data(symbol, api_key, outputsize="compact", api_url=API_URL):
+    """
+    Fetch daily bars for one symbol from Alpha Vantage - no fallbacks.
+
+    Returns rows, or None for permanent failures. Raises RetryableError for rate
+    limits and transient HTTP/network errors, DailyLimitReached for the quota.
+    """
+    import requests
+
+    params = {
+        "function": "TIME_SERIES_DAILY",
+        "symbol": symbol,
+        "outputsize": outputsize,
+        "apikey": api_key,
+    }
+
+    print(f"Fetching {symbol} from Alpha Vantage ({outputsize})...")
+    try:
+        response = requests.get(api_url, params=params, timeout=30)
+    except (requests.ConnectionError, requests.Timeout) as e:
+        raise RetryableError(f"{type(e).__name__} for {symbol}") from e
+
+    if response.status_code == 429 or response.status_code >= 500:
+        raise RetryableError(f"HTTP {response.status_code} for {symbol}")
+    if response.status_code != 200:
+        print(f"❌ HTTP {response.status_code} for {symbol}")
+        return None
+
+    try:
+        data = response.json()
+    except ValueError:
+        print(f"❌ Invalid JSON for {symbol}")
+        return None
+    return parse_time_series(symbol, data)
+
+
+def parse_time_series(symbol, data):
+    """Convert a TIME_SERIES_DAILY response into stock_data.json rows, or None on API errors."""
+    if "Error Message" in data:
+        print(f"❌ API Error for {symbol}: {data['Error Message']}")
+        return None
+
+    if "Note" in data:
+        raise RateLimited(f"Rate limit hit: {data['Note']}")
+
+    if "Information" in data:
+        message = data["Information"]
+        if "per day" in message or "daily" in message.lower():
+            raise DailyLimitReached(message)
+        print(f"❌ API Info for {symbol}: {message}")
+        return None
+
+    time_series = data.get("Time Series (Daily)", {})
+    if not time_series:
+        print(f"❌ No time series data for {symbol}")
+        print(f"🔍 Response keys: {list(data.keys())}")
+        return None
+
+    stock_data = []
+    for date_str, values in time_series.items():
+        close = round(float(values["4. close"]), 2)
+        stock_data.append({
+            "Date": date_str,
+            "Ticker": symbol,
+            "Open": round(float(values["1. open"]), 2),
+            "High": round(float(values["2. high"]), 2),
+            "Low": round(float(values["3. low"]), 2),
+            "Close": close,
+            "Volume": int(values["5. volume"]),
+            "Price": close,
+        })
+
+    print(f"✅ Successfully fetched {len(stock_data)} days for {symbol}")
+    return stock_data
+
+
+def validate_records(records):
+    """Drop malformed bars; returns (valid_records, rejected_count)."""
+    valid = []
+    for r in records:
+        try:
+            np.datetime64(r["Date"], "D")
+            prices = [float(r[k]) for k in ("Open", "High", "Low", "Close")]
+            volume = int(r["Volume"])
+        except (KeyError, TypeError, ValueError):
+            continue
+        if not all(math.isfinite(p) and p > 0 for p in prices) or volume < 0:
+            continue
+        open_, high, low, close = prices
+        if low > min(open_, close) or high < max(open_, close):
+            continue
+        valid.append(r)
+    return valid, len(records) - len(valid)
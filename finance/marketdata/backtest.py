@@ -0,0 +1,223 @@
+"""
+Vectorized batch backtests of many portfolios over the stored price panel.
+
+Portfolios are the rows of a (portfolios x tickers) weight matrix; every
+portfolio is rebalanced back to its weights on the same schedule ("daily",
+"weekly" or "monthly": the first trading day of each period). Weights may
+sum to less than one, the rest is held as cash earning nothing.
+
+Between two rebalances a holding simply compounds, so with
+
+    G[t, n] = growth of ticker n from the last rebalance up to day t
+              (one log-cumsum over the (days x tickers) return matrix)
+
+the value of every portfolio relative to its last rebalance is one matrix
+product, G @ W.T (days x portfolios). Costs are charged at each rebalance
+(including the initial purchase) on the turnover back to the target
+weights, and the segments are chained with a cumulative product over
+rebalance dates only. Nothing loops over portfolios or days; the turnover
+step runs once per rebalance date.
+
+Large sweeps are evaluated in chunks of portfolios sized so that a chunk's
+(days x portfolios) arrays stay under CHUNK_ELEMENTS values, optionally on
+a process pool; only the statistics are kept unless equity curves are asked
+for. A day without a bar counts as a zero return for that ticker (its price
+is carried forward).
+"""
+
+import numpy as np
+
+from .correlation import aligned_returns
+from .metrics import TRADING_DAYS
+
+REBALANCE = ("daily", "weekly", "monthly")
+# Values per (days x portfolios) array of one chunk (16 MB of float64)
+CHUNK_ELEMENTS = 2_000_000
+
+
+def rebalance_starts(dates, schedule="monthly"):
+    """Row indices where a rebalancing period starts (always including row 0)."""
+    dates = np.asarray(dates, dtype="datetime64[D]")
+    if schedule not in REBALANCE:
+        raise ValueError(f"Unknown rebalancing schedule: {schedule} (choose from {', '.join(REBALANCE)})")
+    if len(dates) == 0:
+        return np.empty(0, dtype=np.intp)
+    if schedule == "daily":
+        return np.arange(len(dates))
+    if schedule == "weekly":
+        # 1970-01-01 was a Thursday: shift so that weeks start on Monday
+        period = (dates.astype(np.int64) + 3) // 7
+    else:
+        period = dates.astype("datetime64[M]").astype(np.int64)
+    return np.flatnonzero(np.r_[True, period[1:] != period[:-1]])
+
+
+def random_weights(n_portfolios, n_tickers, seed=0, concentration=1.0):
+    """Long-only candidate weights (rows sum to 1) drawn from a Dirichlet distribution."""
+    rng = np.random.default_rng(seed)
+    return rng.dirichlet(np.full(n_tickers, concentration), size=n_portfolios)
+
+
+def _segment_growth(returns, starts):
+    """G[t, n]: growth of each ticker since the start of t's rebalancing period."""
+    log_growth = np.cumsum(np.log1p(np.nan_to_num(returns, nan=0.0)), axis=0)
+    base = np.zeros((len(starts), returns.shape[1]))
+    base[1:] = log_growth[starts[1:] - 1]
+    counts = np.diff(np.append(starts, len(returns)))
+    return np.exp(log_growth - np.repeat(base, counts, axis=0))
+
+
+def _turnover(weights, growth_ends, value_ends):
+    """
+    (segments x portfolios) turnover back to `weights` after each period.
+
+    A holding w drifts to w * G / A by the period's end (A: portfolio growth),
+    so trading back costs |w| * |A - G| / A per ticker. This is the one
+    O(segments x portfolios x tickers) step, so it runs a segment at a time
+    in float32 (plenty for a cost term).
+    """
+    magnitude = np.abs(weights).astype(np.float32)
+    growth_ends = growth_ends.astype(np.float32)
+    values = value_ends.astype(np.float32)
+    turnover = np.empty(value_ends.shape)
+    drift = np.empty(weights.shape, dtype=np.float32)
+    for k in range(len(values)):
+        np.subtract(values[k][:, None], growth_ends[k], out=drift)
+        np.abs(drift, out=drift)
+        turnover[k] = np.einsum("pn,pn->p", drift, magnitude) / value_ends[k]
+    return turnover
+
+
+def _run_chunk(growth, starts, weights, cost, risk_free, keep_curves):
+    """Equity curves (days x portfolios) and statistics of one chunk of weight rows."""
+    n_days = len(growth)
+    cash = 1 - weights.sum(axis=1)
+    relative = growth @ weights.T + cash
+
+    ends = np.append(starts[1:], n_days) - 1
+    turnover = np.empty((len(starts), len(weights)))
+    turnover[0] = np.abs(weights).sum(axis=1)
+    turnover[1:] = _turnover(weights, growth[ends[:-1]], relative[ends[:-1]])
+    charge = 1 - cost * turnover
+
+    # Value at the start of each period, after its rebalancing costs
+    chained = np.cumprod(np.vstack([charge[:1], relative[ends[:-1]] * charge[1:]]), axis=0)
+    counts = np.diff(np.append(starts, n_days))
+    curves = relative * np.repeat(chained, counts, axis=0)
+
+    daily = np.empty_like(curves)
+    daily[0] = curves[0] - 1
+    np.divide(curves[1:], curves[:-1], out=daily[1:])
+    daily[1:] -= 1
+    years = n_days / TRADING_DAYS
+    volatility = daily.std(axis=0, ddof=1) * np.sqrt(TRADING_DAYS) if n_days > 1 else np.full(len(weights), np.nan)
+    excess = daily.mean(axis=0) * TRADING_DAYS - risk_free
+    with np.errstate(divide="ignore", invalid="ignore"):
+        stats = {
+            "Total Return": (curves[-1] - 1) * 100,
+            "CAGR": (np.maximum(curves[-1], 0) ** (1 / years) - 1) * 100,
+            "Volatility": volatility * 100,
+            "Sharpe": excess / volatility,
+            "Max Drawdown": (curves / np.maximum.accumulate(curves, axis=0) - 1).min(axis=0) * 100,
+            "Turnover": turnover[1:].sum(axis=0) / years * 100 if len(starts) > 1 else np.zeros(len(weights)),
+        }
+    return (curves if keep_curves else None), stats
+
+
+# Set in each pool worker by _init_worker, so the panel is sent once per process
+_WORKER_PANEL = None
+
+
+def _init_worker(panel):
+    global _WORKER_PANEL
+    _WORKER_PANEL = panel
+
+
+def _run_in_worker(args):
+    weights, keep_curves = args
+    return _run_chunk(*_WORKER_PANEL[:2], weights, *_WORKER_PANEL[2:], keep_curves)
+
+
+class Backtest:
+    """
+    A (days x tickers) return panel prepared for one rebalancing schedule.
+
+        bt = Backtest.from_table(table, tickers, start="2020-01-01", rebalance="weekly", cost_bps=5)
+        result = bt.run(random_weights(5000, len(bt.tickers)), workers=4)
+        result["Sharpe"]   # one value per portfolio
+
+    The per-period growth matrix is built once; run() can then be called
+    with any number of weight matrices.
+    """
+
+    def __init__(self, dates, tickers, returns, rebalance="monthly", cost_bps=0.0, risk_free=0.0):
+        self.dates = np.asarray(dates, dtype="datetime64[D]")
+        self.tickers = list(tickers)
+        self.rebalance = rebalance
+        self.cost = cost_bps / 10_000
+        self.risk_free = risk_free
+        self.starts = rebalance_starts(self.dates, rebalance)
+        self.growth = _segment_growth(np.asarray(returns, dtype=np.float64), self.starts)
+
+    @classmethod
+    def from_table(cls, table, tickers=None, start=None, end=None, **options):
+        """Backtest over the Close prices of a daily PriceTable (default: every ticker)."""
+        dates, tickers, returns = aligned_returns(table, tickers, start, end)
+        # The first day has no return for anyone; the backtest starts from its close
+        return cls(dates[1:], tickers, returns[1:], **options)
+
+    def weights(self, weights):
+        """(portfolios x tickers) matrix from an array or a list of {ticker: weight} dicts."""
+        if len(weights) and isinstance(weights[0], dict):
+            column = {t: k for k, t in enumerate(self.tickers)}
+            matrix = np.zeros((len(weights), len(self.tickers)))
+            for row, portfolio in enumerate(weights):
+                for ticker, weight in portfolio.items():
+                    matrix[row, column[ticker]] = weight
+            return matrix
+        matrix = np.atleast_2d(np.asarray(weights, dtype=np.float64))
+        if matrix.shape[1] != len(self.tickers):
+            raise ValueError(f"Expected {len(self.tickers)} weights per portfolio, got {matrix.shape[1]}")
+        return matrix
+
+    def chunk_size(self):
+        return max(1, CHUNK_ELEMENTS // max(1, len(self.dates)))
+
+    def run(self, weights, curves=None, chunk_size=None, workers=None):
+        """
+        Backtest every row of `weights`; returns a dict of per-portfolio arrays
+        (Total Return, CAGR, Volatility, Max Drawdown and Turnover in percent
+        per year where annualized, Sharpe) plus "curves", the (days x
+        portfolios) equity curves starting from 1.0.
+
+        Curves are kept by default only when everything fits in one chunk.
+        With `workers` the chunks run on a process pool of that size.
+        """
+        weights = self.weights(weights)
+        chunk_size = chunk_size or self.chunk_size()
+        keep = curves if curves is not None else len(weights) <= chunk_size
+        chunks = [weights[i:i + chunk_size] for i in range(0, len(weights), chunk_size)]
+
+        if workers and len(chunks) > 1:
+            from concurrent.futures import ProcessPoolExecutor
+
+            panel = (self.growth, self.starts, self.cost, self.risk_free)
+            with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(panel,)) as pool:
+                results = list(pool.map(_run_in_worker, [(chunk, keep) for chunk in chunks]))
+        else:
+            results = [_run_chunk(self.growth, self.starts, chunk, self.cost, self.risk_free, keep)
+                       for chunk in chunks]
+
+        names = list(results[0][1]) if results else []
+        result = {name: np.concatenate([stats[name] for _, stats in results]) for name in names}
+        result["curves"] = np.hstack([c for c, _ in results]) if keep and results else None
+        return result
+
+    def frame(self, result, names=None):
+        """pandas DataFrame of a run() result, one row per portfolio."""
+        import pandas as pd
+
+        stats = {k: v for k, v in result.items() if k != "curves"}
+        frame = pd.DataFrame(stats)
+        frame.insert(0, "Portfolio", names if names is not None else np.arange(len(frame)))
+        return frame
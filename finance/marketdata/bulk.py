@@ -0,0 +1,179 @@
+"""
+Chunked, parallel, resumable bulk download of a ticker universe from yfinance.
+
+    cd finance && python -m marketdata.bulk --universe baba-finance/sp500data.csv --period 1y
+
+The universe is split into batches of `--batch-size` symbols, one
+`yf.download` call each, run on a bounded thread pool through the
+collector's Scheduler (token bucket + retries). Each finished batch is
+written straight into the on-disk yfinance cache (one store file per ticker
+plus coverage.json), so memory stays at a few batches regardless of the
+universe size and the dashboards read the result without downloading again.
+
+coverage.json doubles as the checkpoint: a rerun skips every symbol already
+covered for the requested range. Symbols that come back empty are retried
+in smaller batches; those still empty are recorded in bulk_state.json and
+skipped on later runs unless --retry-failed is given.
+"""
+
+import argparse
+import json
+import os
+import time
+from datetime import date
+
+from .collector import DEFAULT_UNIVERSE, load_universe
+from .scheduler import DailyBudget, RetryableError, RetryPolicy, Scheduler, TokenBucket
+from .yfcache import DEFAULT_CACHE_DIR, PERIOD_DAYS, YFinanceCache, period_start
+
+STATE_FILE = "bulk_state.json"
+BATCH_SIZE = 50
+WORKERS = 4
+# yf.download calls per minute across all workers
+CALLS_PER_MINUTE = 30
+
+
+def batches(symbols, size):
+    return [tuple(symbols[i:i + size]) for i in range(0, len(symbols), size)]
+
+
+def load_state(cache_dir):
+    try:
+        with open(os.path.join(cache_dir, STATE_FILE)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {"failed": {}}
+
+
+def save_state(cache_dir, state):
+    os.makedirs(cache_dir, exist_ok=True)
+    path = os.path.join(cache_dir, STATE_FILE)
+    with open(path + ".tmp", "w") as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+    os.replace(path + ".tmp", path)
+
+
+def make_scheduler(workers=WORKERS, per_minute=CALLS_PER_MINUTE):
+    """Bounded pool of `workers` downloads, `per_minute` calls per minute, no daily cap."""
+    return Scheduler(
+        TokenBucket(per_minute, per=60.0, capacity=workers),
+        DailyBudget(float("inf")),
+        RetryPolicy(attempts=3, base_delay=2.0),
+        workers=workers,
+    )
+
+
+def make_fetcher(store, start, end):
+    """func(batch) -> PriceTable for the Scheduler; any download error is retried."""
+
+    def fetch_batch(batch):
+        try:
+            return store.fetch(batch, start, end)
+        except Exception as e:
+            raise RetryableError(f"{type(e).__name__}: {e}") from e
+
+    return fetch_batch
+
+
+def bulk_download(symbols, store, start, end, batch_size=BATCH_SIZE, scheduler=None, passes=3):
+    """
+    Download `symbols` for [start, end] into `store` (a YFinanceCache).
+
+    Returns (downloaded, failed) where failed maps symbol -> reason. Each pass
+    retries the symbols still missing with half the batch size.
+    """
+    scheduler = scheduler or make_scheduler()
+    plan = store.missing_ranges(symbols, start, end)
+    todo = [s for s in symbols if s in plan]
+    downloaded, failed = [], {}
+    started = time.perf_counter()
+
+    for attempt in range(passes):
+        if not todo:
+            break
+        missing = []
+        for batch, result in scheduler.imap(make_fetcher(store, start, end), batches(todo, batch_size)):
+            if isinstance(result, Exception):
+                missing.extend(batch)
+                for symbol in batch:
+                    failed[symbol] = str(result)
+                continue
+            present = set(result.ticker_names()) if len(result) else set()
+            store.save(result, {s: (start, end) for s in batch if s in present})
+            for symbol in batch:
+                if symbol in present:
+                    downloaded.append(symbol)
+                    failed.pop(symbol, None)
+                else:
+                    missing.append(symbol)
+                    failed.setdefault(symbol, "no data returned")
+            elapsed = time.perf_counter() - started
+            print(f"📦 {len(downloaded)}/{len(symbols)} symbols "
+                  f"({len(downloaded) / max(elapsed, 1e-9):.1f} symbols/s)")
+        todo = missing
+        batch_size = max(1, batch_size // 2)
+        if todo and attempt < passes - 1:
+            print(f"🔁 Retrying {len(todo)} symbols in batches of {batch_size}")
+
+    return downloaded, {s: failed[s] for s in todo}
+
+
+def peak_rss_mb():
+    """Peak resident memory of this process in MB, or None where `resource` is missing (Windows)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk-download a ticker universe into the local yfinance cache")
+    parser.add_argument("--universe", default=DEFAULT_UNIVERSE, help="CSV with a Symbol column")
+    parser.add_argument("--period", default="1y", choices=sorted(PERIOD_DAYS))
+    parser.add_argument("--cache-dir", default=os.environ.get("MARKETDATA_CACHE_DIR", DEFAULT_CACHE_DIR))
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--workers", type=int, default=WORKERS)
+    parser.add_argument("--per-minute", type=int, default=CALLS_PER_MINUTE, help="yf.download calls per minute")
+    parser.add_argument("--retry-failed", action="store_true", help="Retry symbols that failed on earlier runs")
+    args = parser.parse_args()
+
+    # Resumed runs within the same day never refetch today's bars
+    store = YFinanceCache(args.cache_dir, ttl=float("inf"))
+    state = load_state(args.cache_dir)
+    symbols = list(dict.fromkeys(load_universe(args.universe)))
+    if not args.retry_failed:
+        symbols = [s for s in symbols if s not in state["failed"]]
+
+    today = date.today()
+    scheduler = make_scheduler(args.workers, args.per_minute)
+    print(f"🚀 {len(symbols)} symbols, period {args.period}, batches of {args.batch_size} on {args.workers} workers")
+    started = time.perf_counter()
+    downloaded, failed = bulk_download(
+        symbols, store, period_start(args.period, today), today, args.batch_size, scheduler
+    )
+    elapsed = time.perf_counter() - started
+
+    for symbol in downloaded:
+        state["failed"].pop(symbol, None)
+    state["failed"].update(failed)
+    state["last_run"] = {
+        "date": today.isoformat(),
+        "period": args.period,
+        "downloaded": len(downloaded),
+        "failed": len(failed),
+        "seconds": round(elapsed, 1),
+    }
+    save_state(args.cache_dir, state)
+
+    peak_mb = peak_rss_mb()
+    peak = "" if peak_mb is None else f", peak RSS {peak_mb:.0f} MB"
+    print(f"✅ {len(downloaded)} symbols in {elapsed:.1f}s "
+          f"({len(downloaded) / max(elapsed, 1e-9):.1f} symbols/s{peak})")
+    if failed:
+        print(f"⚠️ {len(failed)} symbols failed: {', '.join(sorted(failed)[:20])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Process-level cache for parsed data files.
+
+Entries are keyed by path or URL and tagged with a validator: (mtime, size)
+for local files, the ETag/Last-Modified header for HTTP. A cached value is
+reused until its validator changes, so dashboard widget changes do not
+re-read or re-parse the underlying files. Loading itself lives in fetch.py.
+"""
+
+import json
+import os
+
+from .index import TickerIndex
+from .store import decode_store
+from .wire import decode_wire, decompress
+
+
+class DataCache:
+    """Map of key -> (validator, value)."""
+
+    def __init__(self):
+        self._entries = {}
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def clear(self):
+        self._entries.clear()
+
+    def validator(self, key):
+        entry = self._entries.get(key)
+        return entry[0] if entry else None
+
+    def get(self, key, validator, load):
+        """Return the cached value for key, calling load() if the validator changed."""
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == validator:
+            return entry[1]
+        value = load()
+        self._entries[key] = (validator, value)
+        return value
+
+    def put(self, key, validator, value):
+        self._entries[key] = (validator, value)
+        return value
+
+    def peek(self, key):
+        entry = self._entries.get(key)
+        return entry[1] if entry else None
+
+
+# Shared by every notebook cell in the process
+cache = DataCache()
+
+
+def file_validator(path):
+    stat = os.stat(path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def parse_store(body):
+    return decode_store(body)
+
+
+def parse_index(body):
+    return TickerIndex(decode_store(body))
+
+
+def parse_wire(body):
+    return decode_wire(decompress(body))
+
+
+def parse_wire_index(body):
+    return TickerIndex(parse_wire(body))
+
+
+def parse_json(body):
+    return json.loads(bytes(body))
@@ -0,0 +1,329 @@
+"""
+Daily market data collector (run by .github/workflows/collect-finance-data.yml).
+
+New bars from Alpha Vantage are merged into the existing price table by
+(Ticker, Date): rows already stored are kept, only missing days are appended.
+The table is kept as the per-ticker/year shards of shards.py, and only the
+shards that changed are rewritten.
+Bars are requested through the shared data layer (sources.AlphaVantageSource).
+Tickers the store has never seen get a one-time `outputsize=full` backfill;
+everything else asks for the days since its last stored bar, which is the
+cheaper `compact` (last 100 days) response unless the gap is longer.
+
+Requests go through marketdata.scheduler: concurrent up to the per-minute
+limit, retried with backoff on rate-limit notes and transient errors, and
+capped by a daily call budget persisted in collector_state.json. The core
+tickers are fetched every day; the remaining budget rotates through the
+sp500data.csv universe, stalest tickers first.
+
+Run from the finance/ directory:
+
+    python -m marketdata.collector --data-dir data
+"""
+
+import argparse
+import csv
+import json
+import os
+from datetime import datetime
+
+import numpy as np
+
+from .alphavantage import API_URL
+from .index import TickerIndex
+from .ohlc import AGGREGATE_FILES, extend_aggregate, resample
+from .scheduler import DailyBudget, RetryPolicy, Scheduler, TokenBucket, plan_rotation
+from .sectors import SECTOR_FILE, extend_sector_index, load_sectors, sector_index
+from .shards import read_shards, write_shards
+from .sources import AlphaVantageSource
+from .views import write_views
+from .store import PriceTable, concat_tables, export_json, read_store, write_store
+
+# Core tickers fetched on every run
+DEFAULT_TICKERS = ["AAPL", "MSFT", "GOOGL", "SPY"]
+DEFAULT_UNIVERSE = "baba-finance/sp500data.csv"
+
+# Alpha Vantage free tier
+CALLS_PER_MINUTE = 5
+CALLS_PER_DAY = 25
+
+# Ticker used for the market overview panel
+MARKET_TICKER = "SPY"
+OVERVIEW_DAYS = 30
+
+STATE_FILE = "collector_state.json"
+
+
+def merge_bars(existing, new):
+    """
+    Append the rows of `new` whose (Ticker, Date) is not already in `existing`.
+
+    Duplicates inside `new` are dropped as well. Returns (merged_table, added_rows)
+    where added_rows is the table of rows that were actually appended.
+    """
+    if not len(new):
+        return existing, new
+
+    index = TickerIndex(existing)
+    new_dates = new["Date"]
+    keep = np.zeros(len(new), dtype=bool)
+    new_index = TickerIndex(new)
+    for ticker, (lo, hi) in new_index.slices.items():
+        dates = new_dates[lo:hi]
+        # Rows are sorted by date inside the slice, so duplicates are neighbours
+        unique = np.ones(hi - lo, dtype=bool)
+        unique[1:] = dates[1:] != dates[:-1]
+        if ticker in index:
+            start, stop = index.slices[ticker]
+            unique &= ~np.isin(dates, existing["Date"][start:stop])
+        keep[lo:hi] = unique
+
+    added = new.take(np.flatnonzero(keep))
+    if not len(added):
+        return existing, added
+    return concat_tables([existing, added]), added
+
+
+def build_market_overview(table, ticker=MARKET_TICKER, days=OVERVIEW_DAYS):
+    """market_overview.json payload from the last `days` bars of `ticker`, or None."""
+    index = TickerIndex(table)
+    if ticker not in index:
+        return None
+    start, stop = index.slices[ticker]
+    start = max(start, stop - days)
+    dates = np.datetime_as_string(table["Date"][start:stop], unit="D").tolist()
+    prices = table["Close"][start:stop].tolist()
+    volumes = table["Volume"][start:stop].tolist()
+
+    market_data = [
+        {"Date": d, "Price": p, "Volume": v}
+        for d, p, v in zip(dates, prices, volumes)
+    ]
+    current_price = market_data[-1]["Price"]
+    prev_price = market_data[0]["Price"]
+    change = current_price - prev_price
+    return {
+        "current_price": current_price,
+        "change": round(change, 2),
+        "change_pct": round((change / prev_price) * 100, 2),
+        "data": market_data,
+    }
+
+
+def load_existing(data_dir):
+    """
+    Current price table: the published shards, or (before the first sharded
+    run) stock_data.col, or stock_data.json.
+    """
+    table = read_shards(data_dir)
+    if table is not None:
+        return table
+    store_path = os.path.join(data_dir, "stock_data.col")
+    json_path = os.path.join(data_dir, "stock_data.json")
+    if os.path.exists(store_path):
+        # Copy out of the memory map: the file may be rewritten below
+        table = read_store(store_path, mmap=False)
+        return PriceTable({k: np.array(v) for k, v in table.columns.items()}, table.tickers)
+    if os.path.exists(json_path):
+        with open(json_path) as f:
+            return PriceTable.from_records(json.load(f))
+    return PriceTable.empty()
+
+
+def update_aggregates(table, added, data_dir):
+    """
+    Write the weekly/monthly OHLC tables, extending the existing files.
+
+    Only periods touched by `added` are recomputed; a missing file is built
+    from the full daily table.
+    """
+    for resolution, name in AGGREGATE_FILES.items():
+        path = os.path.join(data_dir, name)
+        if os.path.exists(path):
+            aggregate = extend_aggregate(read_store(path, mmap=False), table, added, resolution)
+        else:
+            aggregate = resample(table, resolution)
+        write_store(aggregate, path)
+
+
+def update_sector_index(table, added, data_dir, sectors):
+    """Write sector_index.col, extending the existing file from the first added day."""
+    path = os.path.join(data_dir, SECTOR_FILE)
+    if os.path.exists(path):
+        index = extend_sector_index(read_store(path, mmap=False), table, added, sectors)
+    else:
+        index = sector_index(table, sectors)
+    write_store(index, path)
+
+
+def write_outputs(table, data_dir, added=None, export=True, sectors=None, market_overview=None, store=False):
+    """
+    Write the OHLC and sector aggregates, the materialized views, shards +
+    manifest and optionally the monolithic stock_data.col (`store`) and the
+    JSON export (`export`).
+
+    The shards are the stored copy of the table: only those whose content
+    changed are rewritten, so a daily run touches the current year's shard
+    of each updated ticker. The full-table files are rewritten in full every
+    time and are left off unless asked for.
+    """
+    added = table if added is None else added
+    if store:
+        write_store(table, os.path.join(data_dir, "stock_data.col"))
+    update_aggregates(table, added, data_dir)
+    aggregates = dict(AGGREGATE_FILES)
+    if sectors is not None:
+        update_sector_index(table, added, data_dir, sectors)
+        aggregates["sectors"] = SECTOR_FILE
+    views = write_views(table, data_dir, encoding="wire", market_overview=market_overview)
+    if market_overview is not None:
+        with open(os.path.join(data_dir, "market_overview.json"), "w") as f:
+            json.dump(market_overview, f, indent=2)
+        views["market"] = "market_overview.json"
+    write_shards(table, data_dir, by_year=True, aggregates=aggregates, views=views, encoding="wire")
+    if export:
+        export_json(table, os.path.join(data_dir, "stock_data.json"))
+
+
+def load_state(data_dir):
+    path = os.path.join(data_dir, STATE_FILE)
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {"budget": {}, "last_fetched": {}}
+
+
+def save_state(state, data_dir):
+    with open(os.path.join(data_dir, STATE_FILE), "w") as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+
+
+def load_universe(path):
+    """Ticker symbols from sp500data.csv (Symbol,Name,Sector)."""
+    with open(path, newline="") as f:
+        return [row["Symbol"].strip().upper() for row in csv.DictReader(f) if row.get("Symbol")]
+
+
+def make_scheduler(state, today, per_minute=CALLS_PER_MINUTE, per_day=CALLS_PER_DAY):
+    """Scheduler whose daily budget continues from today's usage in `state`."""
+    budget_state = state.get("budget", {})
+    used = budget_state.get("used", 0) if budget_state.get("day") == today else 0
+    return Scheduler(
+        TokenBucket(per_minute, per=60.0),
+        DailyBudget(per_day, used=used, day=today),
+        RetryPolicy(attempts=4, base_delay=15.0),
+    )
+
+
+def collect(tickers, source, data_dir, scheduler=None):
+    """Fetch and merge bars for `tickers` from `source` (an AlphaVantageSource); returns a summary dict."""
+    existing = load_existing(data_dir)
+    index = TickerIndex(existing)
+    if scheduler is None:
+        scheduler = make_scheduler({}, datetime.now().strftime("%Y-%m-%d"))
+
+    def fetch_one(ticker):
+        # Full history for tickers the store has never seen, otherwise from the last stored day
+        start = existing["Date"][index.slices[ticker][1] - 1] if ticker in index else None
+        return source.load([ticker], start=start)
+
+    results = scheduler.run(fetch_one, tickers)
+
+    tables = []
+    successful = []
+    for ticker in tickers:
+        ticker_data = results.get(ticker)
+        if isinstance(ticker_data, Exception):
+            print(f"❌ Failed to fetch real data for {ticker}: {ticker_data}")
+        elif len(ticker_data):
+            tables.append(ticker_data)
+            successful.append(ticker)
+        else:
+            print(f"❌ Failed to fetch real data for {ticker}")
+
+    merged, added = merge_bars(existing, concat_tables(tables))
+    return {
+        "table": merged,
+        "added": added,
+        "successful": successful,
+        "rows_added": len(added),
+        "calls_used": scheduler.budget.used,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Collect daily market data from Alpha Vantage.")
+    parser.add_argument("--data-dir", default="data")
+    parser.add_argument("--tickers", default=",".join(DEFAULT_TICKERS), help="tickers fetched on every run")
+    parser.add_argument("--universe", default=DEFAULT_UNIVERSE,
+                        help="CSV with a Symbol column to rotate through ('' to disable)")
+    parser.add_argument("--per-minute", type=int, default=CALLS_PER_MINUTE)
+    parser.add_argument("--daily-budget", type=int, default=CALLS_PER_DAY)
+    parser.add_argument("--api-url", default=os.environ.get("ALPHA_VANTAGE_URL", API_URL))
+    parser.add_argument("--no-json-export", action="store_true", help="skip writing stock_data.json")
+    parser.add_argument("--store", action="store_true", help="also write the monolithic stock_data.col")
+    args = parser.parse_args(argv)
+
+    api_key = os.environ.get("ALPHA_VANTAGE_API_KEY")
+    if not api_key:
+        print("❌ ALPHA_VANTAGE_API_KEY not found. Cannot collect data without API key.")
+        return 1
+
+    os.makedirs(args.data_dir, exist_ok=True)
+    today = datetime.now().strftime("%Y-%m-%d")
+    state = load_state(args.data_dir)
+    scheduler = make_scheduler(state, today, args.per_minute, args.daily_budget)
+
+    pinned = [t.strip().upper() for t in args.tickers.split(",") if t.strip()]
+    universe = load_universe(args.universe) if args.universe else []
+    tickers = plan_rotation(universe, state.get("last_fetched", {}), scheduler.budget.remaining, pinned)
+    if not tickers:
+        print(f"❌ Daily budget of {args.daily_budget} calls already used today.")
+        return 1
+
+    source = AlphaVantageSource(api_key, api_url=args.api_url)
+    result = collect(tickers, source, args.data_dir, scheduler=scheduler)
+    print(f"⏱️ {source.stats['calls']} requests in {source.stats['seconds']:.1f}s "
+          f"({source.stats['errors']} failed)")
+
+    # The calls were spent whatever happens next
+    state["budget"] = {"day": today, "used": result["calls_used"]}
+    save_state(state, args.data_dir)
+
+    # Only proceed if we got some real data
+    if not result["successful"]:
+        print("❌ No real data collected. Exiting without creating files.")
+        return 1
+
+    table = result["table"]
+    print(f"Collected real data for {len(result['successful'])}/{len(tickers)} tickers, "
+          f"{result['rows_added']} new rows ({len(table)} stored)")
+
+    market_overview = build_market_overview(table)
+    if market_overview is None:
+        print(f"⚠️ No {MARKET_TICKER} data available; keeping the previous market overview")
+
+    sectors = load_sectors(args.universe) if args.universe else None
+    write_outputs(table, args.data_dir, added=result["added"], export=not args.no_json_export,
+                  sectors=sectors, market_overview=market_overview, store=args.store)
+
+    timestamp = {
+        "last_updated": datetime.now().strftime("%Y-%m-%d %H:%M:%S UTC"),
+        "market_date": datetime.now().strftime("%Y-%m-%d"),
+        "real_data_ratio": f"{len(result['successful'])}/{len(tickers)}",
+        "rows_added": result["rows_added"],
+    }
+    with open(os.path.join(args.data_dir, "last_updated.json"), "w") as f:
+        json.dump(timestamp, f, indent=2)
+
+    # Advance the rotation only once the bars are on disk, so a failed run refetches them
+    state.setdefault("last_fetched", {}).update({t: today for t in result["successful"]})
+    save_state(state, args.data_dir)
+
+    print("Data collection completed successfully")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,205 @@
+"""
+Correlation and covariance of daily returns from running sums.
+
+Returns are laid out as an aligned (days x tickers) matrix with NaN where a
+ticker has no bar. PairMoments keeps, for every pair (i, j), the running sums
+over the days where both have a return:
+
+    N = sum 1,  Sx = sum x_i,  Sy = sum y_j,  Sxy = sum x_i y_j,
+    Sxx = sum x_i^2,  Syy = sum y_j^2
+
+The full-period sums are a handful of matrix products; after that, adding or
+removing one day is a rank-one update costing O(tickers^2), so sliding a
+rolling window or appending a new bar never revisits the history.
+Correlation and covariance are read off the sums at any time.
+
+The sums are rectangular (X tickers by Y tickers), so ranking one ticker
+against a whole universe ("most correlated with AAPL") only keeps a
+1 x universe block instead of the full universe x universe matrix.
+"""
+
+import numpy as np
+
+
+def aligned_returns(table, tickers=None, start=None, end=None):
+    """
+    (dates, tickers, returns) from a daily PriceTable.
+
+    returns[d, k] is the close-to-close return of tickers[k] on dates[d] versus
+    that ticker's previous bar, NaN where it has none.
+    """
+    tickers = list(tickers) if tickers is not None else list(table.tickers)
+    position = {t: k for k, t in enumerate(tickers)}
+    column = np.array([position.get(t, -1) for t in table.tickers] + [-1], dtype=np.intp)
+
+    codes = table["Ticker"]
+    closes = table["Close"]
+    dates = table["Date"]
+    returns = np.full(len(table), np.nan)
+    same = codes[1:] == codes[:-1]
+    returns[1:][same] = closes[1:][same] / closes[:-1][same] - 1
+
+    keep = column[codes] >= 0 if len(codes) else np.zeros(0, dtype=bool)
+    if start is not None:
+        keep &= dates >= np.datetime64(start, "D")
+    if end is not None:
+        keep &= dates <= np.datetime64(end, "D")
+    unique_dates, row = np.unique(dates[keep], return_inverse=True)
+    matrix = np.full((len(unique_dates), len(tickers)), np.nan)
+    matrix[row, column[codes[keep]]] = returns[keep]
+    return unique_dates, tickers, matrix
+
+
+class PairMoments:
+    """Pairwise running sums of returns X (days x p) against Y (days x q)."""
+
+    def __init__(self, p, q):
+        self.n = np.zeros((p, q))
+        self.sx = np.zeros((p, q))
+        self.sy = np.zeros((p, q))
+        self.sxy = np.zeros((p, q))
+        self.sxx = np.zeros((p, q))
+        self.syy = np.zeros((p, q))
+
+    @classmethod
+    def from_returns(cls, x, y=None):
+        """Sums over every row of x (and y, default x) with matrix products."""
+        y = x if y is None else y
+        moments = cls(x.shape[1], y.shape[1])
+        moments.add_block(x, y)
+        return moments
+
+    @staticmethod
+    def _split(values):
+        valid = ~np.isnan(values)
+        return valid.astype(np.float64), np.where(valid, values, 0.0)
+
+    def add_block(self, x, y=None, sign=1.0):
+        """Add (sign=1) or remove (sign=-1) the rows of x / y."""
+        y = x if y is None else y
+        mx, x0 = self._split(x)
+        my, y0 = self._split(y)
+        self.n += sign * (mx.T @ my)
+        self.sx += sign * (x0.T @ my)
+        self.sy += sign * (mx.T @ y0)
+        self.sxy += sign * (x0.T @ y0)
+        self.sxx += sign * ((x0 * x0).T @ my)
+        self.syy += sign * (mx.T @ (y0 * y0))
+
+    def add(self, x_row, y_row=None, sign=1.0):
+        """Rank-one update for one day: O(p * q)."""
+        y_row = x_row if y_row is None else y_row
+        mx, x0 = self._split(x_row)
+        my, y0 = self._split(y_row)
+        self.n += sign * np.outer(mx, my)
+        self.sx += sign * np.outer(x0, my)
+        self.sy += sign * np.outer(mx, y0)
+        self.sxy += sign * np.outer(x0, y0)
+        self.sxx += sign * np.outer(x0 * x0, my)
+        self.syy += sign * np.outer(mx, y0 * y0)
+
+    def remove(self, x_row, y_row=None):
+        self.add(x_row, y_row, sign=-1.0)
+
+    def cov(self, min_periods=2):
+        """Sample covariance (ddof=1) over pairwise-complete days, NaN below min_periods."""
+        n = self.n
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cov = (self.sxy - self.sx * self.sy / n) / (n - 1)
+        return np.where(n >= min_periods, cov, np.nan)
+
+    def corr(self, min_periods=2):
+        """Pearson correlation over pairwise-complete days, NaN below min_periods."""
+        n = self.n
+        with np.errstate(divide="ignore", invalid="ignore"):
+            num = n * self.sxy - self.sx * self.sy
+            den = np.sqrt((n * self.sxx - self.sx ** 2) * (n * self.syy - self.sy ** 2))
+            corr = np.clip(num / den, -1.0, 1.0)
+        return np.where(n >= min_periods, corr, np.nan)
+
+
+def correlation_matrix(returns, min_periods=2):
+    """Full-period pairwise correlation of a (days x tickers) return matrix."""
+    return PairMoments.from_returns(returns).corr(min_periods)
+
+
+def covariance_matrix(returns, min_periods=2):
+    """Full-period pairwise sample covariance of a (days x tickers) return matrix."""
+    return PairMoments.from_returns(returns).cov(min_periods)
+
+
+def rolling_moments(returns, window):
+    """
+    Yield (day, PairMoments) for every window of `window` rows ending at `day`.
+
+    The first window is summed with matrix products; each later one adds the
+    new day and removes the day that left the window (O(tickers^2) per step).
+    The same object is yielded every time, so read what you need before the
+    next step.
+    """
+    if len(returns) < window:
+        return
+    moments = PairMoments.from_returns(returns[:window])
+    yield window - 1, moments
+    for day in range(window, len(returns)):
+        moments.add(returns[day])
+        moments.remove(returns[day - window])
+        yield day, moments
+
+
+def rolling_pair_correlations(returns, window, min_periods=2):
+    """
+    (days, pairs, values): correlation of every ticker pair i < j over a sliding window.
+
+    values[t, k] is the correlation of pairs[k] over the window ending at days[t].
+    """
+    upper = np.triu_indices(returns.shape[1], k=1)
+    days, values = [], []
+    for day, moments in rolling_moments(returns, window):
+        days.append(day)
+        values.append(moments.corr(min_periods)[upper])
+    values = np.array(values) if values else np.empty((0, len(upper[0])))
+    return np.array(days, dtype=np.intp), list(zip(*upper)), values
+
+
+def most_correlated(returns, tickers, target, top=10, min_periods=20):
+    """
+    [(ticker, correlation)] of the `top` tickers most correlated with `target`.
+
+    Only the 1 x universe row of sums is built (O(days * tickers)), so ranking
+    against all S&P 500 constituents stays cheap.
+    """
+    k = list(tickers).index(target)
+    row = PairMoments.from_returns(returns[:, [k]], returns).corr(min_periods)[0]
+    row[k] = np.nan
+    order = np.argsort(-np.nan_to_num(row, nan=-np.inf))
+    return [(tickers[i], float(row[i])) for i in order[:top] if not np.isnan(row[i])]
+
+
+def correlation_heatmap(matrix, tickers, title=None, size=None):
+    """Altair heatmap of a ticker x ticker correlation matrix, values annotated."""
+    import altair as alt
+    import pandas as pd
+
+    n = len(tickers)
+    df = pd.DataFrame({
+        "Ticker A": np.repeat(np.asarray(tickers, dtype=object), n),
+        "Ticker B": np.tile(np.asarray(tickers, dtype=object), n),
+        "Correlation": np.asarray(matrix, dtype=np.float64).ravel(),
+    })
+    size = size or min(500, 60 * max(n, 2))
+    base = alt.Chart(df).encode(
+        x=alt.X("Ticker A:N", sort=list(tickers), title=None),
+        y=alt.Y("Ticker B:N", sort=list(tickers), title=None),
+    )
+    cells = base.mark_rect().encode(
+        color=alt.Color("Correlation:Q", scale=alt.Scale(scheme="redblue", domain=[-1, 1], reverse=True)),
+        tooltip=["Ticker A:N", "Ticker B:N", alt.Tooltip("Correlation:Q", format=".2f")],
+    )
+    chart = cells
+    if n <= 12:
+        chart = cells + base.mark_text(fontSize=11).encode(text=alt.Text("Correlation:Q", format=".2f"))
+    chart = chart.properties(width=size, height=size)
+    if title:
+        chart = chart.properties(title=title)
+    return chart
@@ -0,0 +1,111 @@
+"""
+Width-aware downsampling for line charts.
+
+A 700px wide chart cannot show more than a few hundred distinct x positions,
+so sending every daily bar to Vega-Lite only grows the spec. Two reducers are
+provided, both keeping the first and last point of every series:
+
+- min/max per pixel bucket (default): vectorized over all tickers at once and
+  keeps every local extreme, so spikes survive.
+- Largest-Triangle-Three-Buckets: keeps the point of each bucket that forms
+  the largest triangle with its neighbours; smoother shape, one point per bucket.
+"""
+
+import numpy as np
+
+# Above this many points per series, per-point markers are turned off
+POINT_MARKER_LIMIT = 120
+
+
+def _segments(codes):
+    """Start offsets of the runs of equal codes (codes must be grouped)."""
+    if len(codes) == 0:
+        return np.empty(0, dtype=np.intp)
+    return np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+
+
+def minmax_indices(values, starts, buckets):
+    """
+    Row indices keeping the min and max of every bucket of every segment.
+
+    `values` is grouped into segments beginning at `starts`; each segment is
+    split into `buckets` equal-count buckets. At most 2 * buckets + 2 rows per
+    segment are kept.
+    """
+    n = len(values)
+    counts = np.diff(np.append(starts, n))
+    segment = np.repeat(np.arange(len(starts)), counts)
+    position = np.arange(n) - np.repeat(starts, counts)
+    per_segment = np.minimum(counts, buckets)
+    bucket = segment * buckets + position * per_segment[segment] // counts[segment]
+
+    # Sort by (bucket, value): the first row of a bucket is its min, the last its max
+    order = np.lexsort((values, bucket))
+    sorted_bucket = bucket[order]
+    first = np.r_[True, sorted_bucket[1:] != sorted_bucket[:-1]]
+    last = np.r_[sorted_bucket[1:] != sorted_bucket[:-1], True]
+
+    keep = np.zeros(n, dtype=bool)
+    keep[order[first | last]] = True
+    keep[starts] = True
+    keep[starts + counts - 1] = True
+    return np.flatnonzero(keep)
+
+
+def lttb_indices(x, y, threshold):
+    """Largest-Triangle-Three-Buckets on one series; returns kept row indices."""
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    # Bucket edges over the interior points; the first and last are always kept
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.intp)
+    sizes = np.diff(np.append(edges, n))
+    # Average of each "next" bucket; the final one is the last point itself
+    avg_x = np.append((np.add.reduceat(x, edges) / sizes)[1:-1], x[-1])
+    avg_y = np.append((np.add.reduceat(y, edges) / sizes)[1:-1], y[-1])
+
+    kept = [0]
+    for i in range(threshold - 2):
+        lo, hi = edges[i], edges[i + 1]
+        a = kept[-1]
+        area = np.abs((x[a] - avg_x[i]) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y[i] - y[a]))
+        kept.append(lo + int(np.argmax(area)))
+    kept.append(n - 1)
+    return np.asarray(kept, dtype=np.intp)
+
+
+def downsample_long(df, width=700, method="minmax", value="Price", ticker="Ticker", date="Date"):
+    """
+    Downsample a long (Date, Ticker, Price) frame for a chart `width` pixels wide.
+
+    Returns (frame, show_points). Each ticker keeps at most about `width` rows,
+    so the number of rendered marks is bounded regardless of the period, and
+    show_points is False once markers would overlap.
+    """
+    if df.empty:
+        return df, True
+
+    df = df.sort_values([ticker, date], kind="stable")
+    codes = df[ticker].astype("category").cat.codes.to_numpy()
+    starts = _segments(codes)
+    counts = np.diff(np.append(starts, len(df)))
+
+    if counts.max() > width:
+        values = df[value].to_numpy(dtype=np.float64)
+        if method == "lttb":
+            dates = df[date].to_numpy().astype("datetime64[D]").astype(np.float64)
+            keep = np.concatenate([
+                start + lttb_indices(dates[start:start + count], values[start:start + count], width)
+                for start, count in zip(starts, counts)
+            ])
+        else:
+            # Two points (min and max) per bucket
+            keep = minmax_indices(values, starts, max(1, width // 2))
+        df = df.iloc[keep]
+        counts = np.bincount(codes[keep])
+
+    show_points = int(counts.max()) <= POINT_MARKER_LIMIT
+    return df.reset_index(drop=True), show_points
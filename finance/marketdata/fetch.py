@@ -0,0 +1,139 @@
+"""
+Asynchronous data file loading.
+
+In the browser (Pyodide) files are requested with `pyfetch`, i.e. the JS
+`fetch` API, so the main thread is never blocked by a synchronous
+XMLHttpRequest. Outside the browser the same URLs are read from the local
+filesystem on worker threads.
+
+Concurrent requests for the same URL share one in-flight task, and parsed
+results go through the process-level cache, so a file is downloaded and
+parsed once per ETag (or mtime) no matter how many cells ask for it.
+Downloads and parses are recorded as "fetch" and "parse" spans on the
+timeline (timing.py).
+"""
+
+import asyncio
+import mmap
+import os
+
+from .cache import cache, file_validator
+from .timing import rows_of, timeline
+
+# url -> asyncio.Task currently downloading and parsing it
+_inflight = {}
+
+
+def in_browser():
+    try:
+        import pyodide.http  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+async def _read_stream(response):
+    """Read the response body chunk by chunk into one preallocated buffer."""
+    js_response = response.js_response
+    length = js_response.headers.get("Content-Length")
+    reader = js_response.body.getReader() if js_response.body else None
+    if reader is None:
+        return await response.bytes()
+
+    buffer = bytearray(int(length)) if length else bytearray()
+    pos = 0
+    while True:
+        chunk = await reader.read()
+        if chunk.done:
+            break
+        data = chunk.value.to_bytes()
+        if pos + len(data) <= len(buffer):
+            buffer[pos:pos + len(data)] = data
+        else:
+            # Content-Length missing or wrong (e.g. compressed transfer)
+            del buffer[pos:]
+            buffer.extend(data)
+        pos += len(data)
+    del buffer[pos:]
+    return bytes(buffer)
+
+
+async def _fetch_browser(url, parse):
+    from pyodide.http import pyfetch
+
+    key = ("http", url)
+    validator = cache.validator(key)
+    headers = {"If-None-Match": validator} if validator else {}
+    with timeline.span("fetch", url=url) as span:
+        response = await pyfetch(url, headers=headers)
+        span["status"] = response.status
+        if response.status == 304 and key in cache:
+            return cache.peek(key)
+        if not response.ok:
+            raise OSError(f"HTTP {response.status}: {response.status_text} ({url})")
+        body = await _read_stream(response)
+        span["bytes"] = len(body)
+
+    validator = response.headers.get("etag") or response.headers.get("last-modified")
+    if validator is None:
+        validator = (len(body), hash(body))
+
+    def load():
+        with timeline.span("parse", url=url, bytes=len(body)) as span:
+            value = parse(body)
+            span["rows"] = rows_of(value)
+        return value
+
+    return cache.get(key, validator, load)
+
+
+def local_path(url):
+    """Map a './data/x.json' style URL onto a path relative to the working directory."""
+    return os.path.normpath(url.split("?", 1)[0])
+
+
+def _load_local(url, parse):
+    path = local_path(url)
+
+    def load():
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            with timeline.span("parse", url=url, bytes=size) as span:
+                if size == 0:
+                    value = parse(b"")
+                else:
+                    # Memory-mapped, so store columns are paged in only when touched
+                    value = parse(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+                span["rows"] = rows_of(value)
+            return value
+
+    return cache.get(("file", path), file_validator(path), load)
+
+
+async def fetch(url, parse):
+    """Download (or read) `url` and return parse(bytes), sharing in-flight requests."""
+    task = _inflight.get(url)
+    if task is None:
+        if in_browser():
+            task = asyncio.ensure_future(_fetch_browser(url, parse))
+        else:
+            task = asyncio.ensure_future(asyncio.to_thread(_load_local, url, parse))
+        _inflight[url] = task
+        task.add_done_callback(lambda _: _inflight.pop(url, None))
+    return await task
+
+
+async def fetch_all(requests):
+    """
+    Fetch several files concurrently.
+
+    `requests` maps a name to (url, parse). The result maps the same names to the
+    parsed value, or to the exception raised for that file, so one missing file
+    does not hide the others.
+    """
+    names = list(requests)
+    results = await asyncio.gather(
+        *(fetch(url, parse) for url, parse in requests.values()),
+        return_exceptions=True,
+    )
+    return dict(zip(names, results))
@@ -0,0 +1,292 @@
+"""
+Efficient frontier and optimal portfolio weights.
+
+Expected returns and the covariance matrix come from the running sums of
+correlation.PairMoments over the aligned daily returns, kept per ticker set
+by `moment_cache`. When the dashboard period changes, only the days that
+enter or leave the window are added to or removed from the sums (a block
+update), so moving between 3 months and 1 year does not recompute anything
+over the overlap. Moments are annualized with TRADING_DAYS.
+
+The frontier is solved as one batch: every target return is a row of a
+(points x tickers) weight matrix, and all rows iterate together.
+
+    long_only=False   closed form (two linear solves shared by every point)
+    long_only=True    accelerated projected gradient on the simplex, with
+                      the target return as an augmented Lagrangian term;
+                      each step is a (points x tickers) @ (tickers x
+                      tickers) product plus a row-wise simplex projection
+
+Minimum variance is a row without a target; maximum Sharpe is the best
+point of the frontier, refined by a second batch around it.
+"""
+
+import numpy as np
+
+from .correlation import PairMoments
+from .metrics import TRADING_DAYS
+
+FRONTIER_POINTS = 40
+# Ticker sets whose moments are kept
+MAX_ENTRIES = 16
+
+
+class MomentCache:
+    """Per ticker set: returns panel, window and PairMoments of the last request, updated by difference."""
+
+    def __init__(self):
+        self._entries = {}
+        self.computed = 0
+        self.updated = 0
+
+    def clear(self):
+        self._entries.clear()
+
+    @staticmethod
+    def _merge(entry, dates, returns):
+        """Union of the cached and new rows by date; a known return wins over NaN."""
+        if entry is None:
+            return dates, returns
+        all_dates = np.union1d(entry["dates"], dates)
+        merged = np.full((len(all_dates), returns.shape[1]), np.nan)
+        merged[np.searchsorted(all_dates, entry["dates"])] = entry["returns"]
+        rows = np.searchsorted(all_dates, dates)
+        merged[rows] = np.where(np.isnan(returns), merged[rows], returns)
+        return all_dates, merged
+
+    def moments(self, aligned, start=None, end=None):
+        """
+        Annualized (mean, covariance) of the (dates, tickers, returns) triple
+        from aligned_returns() over start <= date <= end (default: all its days).
+        """
+        dates, tickers, returns = aligned
+        dates = np.asarray(dates, dtype="datetime64[D]")
+        lo = np.datetime64(start, "D") if start is not None else (dates[0] if len(dates) else None)
+        hi = np.datetime64(end, "D") if end is not None else (dates[-1] if len(dates) else None)
+        key = tuple(tickers)
+        entry = self._entries.get(key)
+        all_dates, merged = self._merge(entry, dates, np.asarray(returns, dtype=np.float64))
+        window = (all_dates >= lo) & (all_dates <= hi) if len(all_dates) else np.zeros(0, dtype=bool)
+
+        sums = None
+        if entry is not None:
+            # Rows whose window membership or value changed since the cached sums
+            old_rows = np.searchsorted(all_dates, entry["dates"])
+            was_in = np.zeros(len(all_dates), dtype=bool)
+            was_in[old_rows] = (entry["dates"] >= entry["lo"]) & (entry["dates"] <= entry["hi"])
+            previous = np.full_like(merged, np.nan)
+            previous[old_rows] = entry["returns"]
+            same = np.all((previous == merged) | (np.isnan(previous) & np.isnan(merged)), axis=1)
+            leave = was_in & ~(window & same)
+            enter = window & ~(was_in & same)
+            if leave.sum() + enter.sum() < window.sum():
+                sums = entry["sums"]
+                if leave.any():
+                    sums.add_block(previous[leave], sign=-1.0)
+                if enter.any():
+                    sums.add_block(merged[enter])
+                self.updated += 1
+        if sums is None:
+            sums = PairMoments.from_returns(merged[window])
+            self.computed += 1
+
+        self._entries.pop(key, None)
+        if len(self._entries) >= MAX_ENTRIES:
+            self._entries.pop(next(iter(self._entries)))
+        self._entries[key] = {"dates": all_dates, "returns": merged, "lo": lo, "hi": hi, "sums": sums}
+        n = np.diag(sums.n)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean = np.diag(sums.sx) / n * TRADING_DAYS
+        cov = np.nan_to_num(sums.cov(), nan=0.0) * TRADING_DAYS
+        return mean, cov
+
+
+# Shared by every notebook cell in the process
+moment_cache = MomentCache()
+
+
+def _regularize(cov):
+    """Nearest positive definite matrix by clipping eigenvalues (pairwise-complete sums need not be PSD)."""
+    cov = (cov + cov.T) / 2
+    values, vectors = np.linalg.eigh(cov)
+    floor = max(values.max(), 1e-12) * 1e-10
+    if values.min() >= floor:
+        return cov
+    return (vectors * np.maximum(values, floor)) @ vectors.T
+
+
+def _project_simplex(v):
+    """Row-wise Euclidean projection onto {w >= 0, sum(w) = 1}."""
+    n = v.shape[1]
+    u = -np.sort(-v, axis=1)
+    excess = np.cumsum(u, axis=1) - 1
+    count = (u - excess / np.arange(1, n + 1) > 0).sum(axis=1)
+    theta = excess[np.arange(len(v)), count - 1] / count
+    return np.maximum(v - theta[:, None], 0)
+
+
+def _solve_unconstrained(mean, cov, targets):
+    """Closed-form minimum-variance weights (shorts allowed) for every target; NaN = no target."""
+    solved = np.linalg.solve(cov, np.column_stack([np.ones(len(mean)), mean]))
+    a = solved[:, 0].sum()
+    b = mean @ solved[:, 0]
+    c = mean @ solved[:, 1]
+    d = a * c - b * b
+    has = ~np.isnan(targets)
+    t = np.where(has, targets, 0.0)
+    lam = np.where(has, (c - t * b) / d, 1 / a)
+    gamma = np.where(has, (t * a - b) / d, 0.0)
+    return np.outer(lam, solved[:, 0]) + np.outer(gamma, solved[:, 1])
+
+
+def _solve_long_only(mean, cov, targets, start=None, outer=40, inner=300, tol=1e-7):
+    """
+    Long-only minimum-variance weights for every target (NaN = no target),
+    all rows at once. Returns (weights, multipliers); `start` is a previous
+    (weights, multipliers) pair to continue from.
+    """
+    n = len(mean)
+    cov = cov / (np.trace(cov) / n or 1.0)
+    # Work with standardized returns: 1'w = 1 makes the shift free
+    center = mean.mean()
+    spread = mean.std() or 1.0
+    a = (mean - center) / spread
+    has = (~np.isnan(targets)).astype(np.float64)
+    t = np.where(has > 0, (targets - center) / spread, 0.0)
+
+    rho = 10.0
+    step = 1 / (2 * np.linalg.eigvalsh(cov).max() + rho * (a @ a))
+    if start is None:
+        weights, multiplier = np.full((len(targets), n), 1 / n), np.zeros(len(targets))
+    else:
+        weights, multiplier = start[0].copy(), start[1].copy()
+    for _ in range(outer):
+        ahead, momentum = weights, 1.0
+        for _ in range(inner):
+            residual = (ahead @ a - t) * has
+            gradient = 2 * ahead @ cov + ((multiplier + rho * residual) * has)[:, None] * a
+            new = _project_simplex(ahead - step * gradient)
+            # Restart the momentum when it points uphill (keeps FISTA monotone and fast)
+            if np.sum((ahead - new) * (new - weights)) > 0:
+                momentum = 1.0
+            following = (1 + np.sqrt(1 + 4 * momentum * momentum)) / 2
+            ahead = new + (momentum - 1) / following * (new - weights)
+            moved = np.abs(new - weights).max()
+            weights, momentum = new, following
+            if moved < tol:
+                break
+        residual = (weights @ a - t) * has
+        multiplier += rho * residual
+        if np.abs(residual).max() < 1e-8 and moved < 1e-7:
+            break
+    return weights, multiplier
+
+
+def frontier_weights(mean, cov, targets, long_only=True):
+    """(len(targets) x tickers) minimum-variance weights for each target annual return (NaN: none)."""
+    return _frontier_weights(mean, cov, targets, long_only)[0]
+
+
+def _frontier_weights(mean, cov, targets, long_only=True, start=None):
+    """frontier_weights() plus the long-only solver's multipliers, optionally continuing from `start`."""
+    mean = np.asarray(mean, dtype=np.float64)
+    cov = _regularize(np.asarray(cov, dtype=np.float64))
+    targets = np.asarray(targets, dtype=np.float64)
+    if long_only:
+        # Long-only portfolios cannot return more than the best ticker or less than the worst
+        targets = np.clip(targets, mean.min(), mean.max())
+        return _solve_long_only(mean, cov, targets, start)
+    return _solve_unconstrained(mean, cov, targets), None
+
+
+def _describe(weights, mean, cov, risk_free):
+    returns = weights @ mean
+    volatility = np.sqrt(np.maximum(np.einsum("kn,nm,km->k", weights, cov, weights), 0))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sharpe = (returns - risk_free) / volatility
+    return returns, volatility, sharpe
+
+
+def efficient_frontier(mean, cov, points=FRONTIER_POINTS, risk_free=0.0, long_only=True):
+    """
+    Frontier from the minimum-variance portfolio up to the highest target
+    return, plus the minimum-variance and maximum-Sharpe portfolios.
+
+    Returns a dict of arrays: "weights" (points x tickers), "returns",
+    "volatility" and "sharpe" per point, and "min_variance" / "max_sharpe",
+    each a dict with "weights", "return", "volatility" and "sharpe".
+    """
+    mean = np.asarray(mean, dtype=np.float64)
+    cov = _regularize(np.asarray(cov, dtype=np.float64))
+    minimum, _ = _frontier_weights(mean, cov, [np.nan], long_only)
+    low = float(minimum[0] @ mean)
+    high = mean.max() if long_only else low + 2 * (mean.max() - low)
+    targets = np.linspace(low, max(high, low), points)
+    weights, multipliers = _frontier_weights(mean, cov, targets, long_only)
+    weights[0] = minimum[0]
+    returns, volatility, sharpe = _describe(weights, mean, cov, risk_free)
+
+    # Refine the best Sharpe ratio between its neighbours on the frontier,
+    # starting each row from the nearest frontier point's solution
+    best = int(np.nanargmax(sharpe)) if np.isfinite(sharpe).any() else 0
+    bracket = np.linspace(targets[max(best - 1, 0)], targets[min(best + 1, points - 1)], points)
+    start = None
+    if multipliers is not None:
+        nearest = np.abs(bracket[:, None] - targets[None, :]).argmin(axis=1)
+        start = (weights[nearest], multipliers[nearest])
+    refined, _ = _frontier_weights(mean, cov, bracket, long_only, start)
+    r_returns, r_volatility, r_sharpe = _describe(refined, mean, cov, risk_free)
+    top = int(np.nanargmax(r_sharpe)) if np.isfinite(r_sharpe).any() else 0
+
+    def portfolio(w, r, v, s):
+        return {"weights": w, "return": float(r), "volatility": float(v), "sharpe": float(s)}
+
+    return {
+        "weights": weights,
+        "returns": returns,
+        "volatility": volatility,
+        "sharpe": sharpe,
+        "min_variance": portfolio(weights[0], returns[0], volatility[0], sharpe[0]),
+        "max_sharpe": portfolio(refined[top], r_returns[top], r_volatility[top], r_sharpe[top]),
+    }
+
+
+def frontier_chart(frontier, tickers, mean, cov, width=700, height=350):
+    """Altair chart: the frontier, each ticker, and the minimum-variance / maximum-Sharpe points."""
+    import altair as alt
+    import pandas as pd
+
+    curve = pd.DataFrame({
+        "Volatility": frontier["volatility"] * 100,
+        "Return": frontier["returns"] * 100,
+        "Sharpe": frontier["sharpe"],
+    })
+    assets = pd.DataFrame({
+        "Ticker": list(tickers),
+        "Volatility": np.sqrt(np.maximum(np.diag(cov), 0)) * 100,
+        "Return": np.asarray(mean) * 100,
+    })
+    optimal = pd.DataFrame([
+        {"Portfolio": name, "Volatility": frontier[key]["volatility"] * 100,
+         "Return": frontier[key]["return"] * 100, "Sharpe": frontier[key]["sharpe"]}
+        for key, name in (("min_variance", "Minimum variance"), ("max_sharpe", "Maximum Sharpe"))
+    ])
+    x = alt.X("Volatility:Q", title="Annualized volatility (%)")
+    y = alt.Y("Return:Q", title="Annualized return (%)")
+    line = alt.Chart(curve).mark_line(color="#1f77b4").encode(
+        x=x, y=y, tooltip=[alt.Tooltip("Volatility:Q", format=".2f"), alt.Tooltip("Return:Q", format=".2f"),
+                           alt.Tooltip("Sharpe:Q", format=".2f")],
+    )
+    points = alt.Chart(assets).mark_circle(size=40, color="gray").encode(
+        x=x, y=y, tooltip=["Ticker:N", alt.Tooltip("Volatility:Q", format=".2f"), alt.Tooltip("Return:Q", format=".2f")],
+    )
+    labels = points.mark_text(dx=6, align="left", fontSize=10, color="gray").encode(text="Ticker:N")
+    stars = alt.Chart(optimal).mark_point(shape="diamond", size=150, filled=True).encode(
+        x=x, y=y, color=alt.Color("Portfolio:N", legend=alt.Legend(orient="bottom")),
+        tooltip=["Portfolio:N", alt.Tooltip("Volatility:Q", format=".2f"), alt.Tooltip("Return:Q", format=".2f"),
+                 alt.Tooltip("Sharpe:Q", format=".2f")],
+    )
+    chart = line + points + stars
+    if len(tickers) <= 20:
+        chart = chart + labels
+    return chart.properties(width=width, height=height, title="Efficient frontier")
@@ -0,0 +1,60 @@
+"""
+Per-ticker date index over a PriceTable.
+
+Because store rows are sorted by (Ticker, Date), every ticker is a contiguous
+slice and its dates are already sorted. Selecting tickers is a dictionary
+lookup and selecting a date range is a binary search inside each slice.
+"""
+
+import numpy as np
+
+from .timing import timeline
+
+
+class TickerIndex:
+    """Ticker -> (start, stop) row slices with searchsorted date lookups."""
+
+    def __init__(self, table):
+        self.table = table
+        codes = table["Ticker"]
+        bounds = np.searchsorted(codes, np.arange(len(table.tickers) + 1))
+        self.slices = {
+            name: (int(bounds[i]), int(bounds[i + 1]))
+            for i, name in enumerate(table.tickers)
+        }
+
+    def __contains__(self, ticker):
+        return ticker in self.slices
+
+    @property
+    def tickers(self):
+        return self.table.tickers
+
+    def date_range(self, ticker):
+        """First and last date stored for a ticker."""
+        start, stop = self.slices[ticker]
+        dates = self.table["Date"]
+        return dates[start], dates[stop - 1]
+
+    def rows(self, tickers, start=None, end=None):
+        """Row positions for `tickers` with start <= Date <= end (datetime64[D] or None)."""
+        dates = self.table["Date"]
+        ranges = []
+        for ticker in tickers:
+            lo, hi = self.slices.get(ticker, (0, 0))
+            if start is not None:
+                lo += int(np.searchsorted(dates[lo:hi], np.datetime64(start, "D"), side="left"))
+            if end is not None:
+                hi = lo + int(np.searchsorted(dates[lo:hi], np.datetime64(end, "D"), side="right"))
+            if hi > lo:
+                ranges.append(np.arange(lo, hi))
+        if not ranges:
+            return np.empty(0, dtype=np.intp)
+        return np.concatenate(ranges)
+
+    def select(self, tickers, start=None, end=None):
+        """Sub-table for the given tickers and inclusive date range."""
+        with timeline.span("filter", tickers=len(tickers)) as span:
+            table = self.table.take(self.rows(tickers, start, end))
+            span["rows"] = len(table)
+        return table
@@ -0,0 +1,383 @@
+"""
+Technical indicators (SMA, EMA, Bollinger Bands, RSI, MACD) with incremental updates.
+
+Each indicator computes a full series from one ticker's Close array with
+array operations - cumulative sums for the moving windows, and a block-wise
+closed form of the exponential filter for EMA-based indicators - and can
+also advance by one bar in O(1) from a small state (running sums, last
+smoothed values).
+
+IndicatorEngine caches results per (ticker, indicator, parameters). When the
+same ticker comes back with more bars appended (a new day from the collector
+or a delta download), only the new bars are stepped through; the cached
+history is reused as-is. Toggling overlays in a dashboard therefore never
+recomputes anything that was computed before. Entries keep a copy of the bars
+they were computed from, so a revised close (the last day refetched after the
+cache TTL) forces a full recompute instead of serving stale values.
+"""
+
+from abc import ABC, abstractmethod
+from collections import deque
+
+import numpy as np
+
+from .index import TickerIndex
+
+# Block length for the closed-form exponential filter; keeps (1 - alpha)^-k finite
+_EMA_BLOCK = 128
+
+
+def ema_filter(values, alpha, prev=None):
+    """
+    y[t] = alpha * x[t] + (1 - alpha) * y[t-1], seeded with `prev` (default x[0]).
+
+    Equivalent to pandas' ewm(alpha=alpha, adjust=False).mean(), evaluated one
+    block at a time with cumulative sums instead of a Python loop per element.
+    """
+    x = np.asarray(values, dtype=np.float64)
+    out = np.empty_like(x)
+    if not len(x):
+        return out
+    decay = 1.0 - alpha
+    start = 0
+    if prev is None:
+        prev = x[0]
+        out[0] = prev
+        start = 1
+    powers = decay ** np.arange(_EMA_BLOCK + 1)
+    for lo in range(start, len(x), _EMA_BLOCK):
+        block = x[lo:lo + _EMA_BLOCK]
+        n = len(block)
+        # y[j] = decay^(j+1) * prev + alpha * sum_i decay^(j-i) x[i]
+        weighted = np.cumsum(block / powers[:n])
+        out[lo:lo + n] = powers[1:n + 1] * prev + alpha * powers[:n] * weighted
+        prev = out[lo + n - 1]
+    return out
+
+
+def _window_sum(values, n):
+    """Sum of the last `n` values at each position (NaN until the window is full)."""
+    c = np.cumsum(np.r_[0.0, values])
+    out = np.full(len(values), np.nan)
+    if len(values) >= n:
+        out[n - 1:] = c[n:] - c[:-n]
+    return out
+
+
+class Indicator(ABC):
+    """An indicator: compute() for a full series, step() for one more bar."""
+
+    name = ""
+    overlay = True
+
+    def __init__(self, **params):
+        self.params = params
+
+    @property
+    def key(self):
+        return (self.name, tuple(sorted(self.params.items())))
+
+    def label(self, output):
+        args = ",".join(str(v) for v in self.params.values())
+        return f"{self.name.upper()}({args})" if output == self.name else f"{self.name.upper()}({args}) {output}"
+
+    @abstractmethod
+    def compute(self, close):
+        """(outputs, state): dict of arrays aligned with `close`, plus the step state."""
+
+    @abstractmethod
+    def step(self, state, close):
+        """(outputs, state) after one more bar; outputs is a dict of floats."""
+
+
+class SMA(Indicator):
+    name = "sma"
+
+    def __init__(self, window=20):
+        super().__init__(window=window)
+        self.window = window
+
+    def compute(self, close):
+        sma = _window_sum(close, self.window) / self.window
+        return {"sma": sma}, deque(close[-self.window:].tolist(), maxlen=self.window)
+
+    def step(self, state, close):
+        state.append(close)
+        value = sum(state) / self.window if len(state) == self.window else np.nan
+        return {"sma": value}, state
+
+
+class EMA(Indicator):
+    name = "ema"
+
+    def __init__(self, span=20):
+        super().__init__(span=span)
+        self.alpha = 2.0 / (span + 1)
+
+    def compute(self, close):
+        ema = ema_filter(close, self.alpha)
+        return {"ema": ema}, ema[-1] if len(ema) else None
+
+    def step(self, state, close):
+        value = close if state is None else self.alpha * close + (1 - self.alpha) * state
+        return {"ema": value}, value
+
+
+class Bollinger(Indicator):
+    """Middle band = SMA(window); upper/lower = middle +/- k * rolling std (ddof=0)."""
+
+    name = "bollinger"
+
+    def __init__(self, window=20, k=2.0):
+        super().__init__(window=window, k=k)
+        self.window = window
+        self.k = k
+
+    def _bands(self, mean, mean_sq):
+        std = np.sqrt(np.maximum(mean_sq - mean * mean, 0.0))
+        return {"middle": mean, "upper": mean + self.k * std, "lower": mean - self.k * std}
+
+    def compute(self, close):
+        close = np.asarray(close, dtype=np.float64)
+        mean = _window_sum(close, self.window) / self.window
+        mean_sq = _window_sum(close * close, self.window) / self.window
+        return self._bands(mean, mean_sq), deque(close[-self.window:].tolist(), maxlen=self.window)
+
+    def step(self, state, close):
+        state.append(close)
+        if len(state) < self.window:
+            return {"middle": np.nan, "upper": np.nan, "lower": np.nan}, state
+        values = np.asarray(state)
+        bands = self._bands(values.mean(), (values * values).mean())
+        return {name: float(v) for name, v in bands.items()}, state
+
+
+class RSI(Indicator):
+    """Wilder's RSI: gains and losses smoothed with alpha = 1 / period."""
+
+    name = "rsi"
+    overlay = False
+
+    def __init__(self, period=14):
+        super().__init__(period=period)
+        self.period = period
+
+    @staticmethod
+    def _rsi(gain, loss):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(loss == 0, 100.0, 100.0 - 100.0 / (1.0 + gain / loss))
+
+    def compute(self, close):
+        close = np.asarray(close, dtype=np.float64)
+        change = np.diff(close)
+        alpha = 1.0 / self.period
+        gain = ema_filter(np.maximum(change, 0.0), alpha)
+        loss = ema_filter(np.maximum(-change, 0.0), alpha)
+        rsi = np.full(len(close), np.nan)
+        rsi[1:] = self._rsi(gain, loss)
+        rsi[:self.period] = np.nan
+        state = {
+            "last": close[-1] if len(close) else None,
+            "gain": gain[-1] if len(gain) else None,
+            "loss": loss[-1] if len(loss) else None,
+            "count": len(close),
+        }
+        return {"rsi": rsi}, state
+
+    def step(self, state, close):
+        state = dict(state)
+        if state["last"] is not None:
+            change = close - state["last"]
+            alpha = 1.0 / self.period
+            up, down = max(change, 0.0), max(-change, 0.0)
+            state["gain"] = up if state["gain"] is None else alpha * up + (1 - alpha) * state["gain"]
+            state["loss"] = down if state["loss"] is None else alpha * down + (1 - alpha) * state["loss"]
+        state["last"] = close
+        state["count"] += 1
+        if state["gain"] is None or state["count"] <= self.period:
+            return {"rsi": np.nan}, state
+        return {"rsi": float(self._rsi(state["gain"], state["loss"]))}, state
+
+
+class MACD(Indicator):
+    name = "macd"
+    overlay = False
+
+    def __init__(self, fast=12, slow=26, signal=9):
+        super().__init__(fast=fast, slow=slow, signal=signal)
+        self.alphas = (2.0 / (fast + 1), 2.0 / (slow + 1), 2.0 / (signal + 1))
+
+    def compute(self, close):
+        a_fast, a_slow, a_signal = self.alphas
+        fast = ema_filter(close, a_fast)
+        slow = ema_filter(close, a_slow)
+        macd = fast - slow
+        signal = ema_filter(macd, a_signal)
+        state = (fast[-1], slow[-1], signal[-1]) if len(close) else None
+        return {"macd": macd, "signal": signal, "histogram": macd - signal}, state
+
+    def step(self, state, close):
+        a_fast, a_slow, a_signal = self.alphas
+        if state is None:
+            fast = slow = close
+            signal = 0.0
+        else:
+            fast = a_fast * close + (1 - a_fast) * state[0]
+            slow = a_slow * close + (1 - a_slow) * state[1]
+            signal = a_signal * (fast - slow) + (1 - a_signal) * state[2]
+        macd = fast - slow
+        return {"macd": macd, "signal": signal, "histogram": macd - signal}, (fast, slow, signal)
+
+
+INDICATORS = {cls.name: cls for cls in (SMA, EMA, Bollinger, RSI, MACD)}
+
+# Overlay choices offered by the dashboards (see parse_indicator)
+INDICATOR_CHOICES = ["SMA 20", "SMA 50", "EMA 20", "Bollinger 20", "RSI 14", "MACD"]
+
+
+class IndicatorEngine:
+    """Per (ticker, indicator, parameters) cache of indicator series, extended incrementally."""
+
+    def __init__(self):
+        self._entries = {}
+        self.computed = 0
+        self.extended = 0
+
+    def clear(self):
+        self._entries.clear()
+
+    def series(self, ticker, dates, close, indicator):
+        """
+        Outputs of `indicator` for one ticker's (dates, close) arrays.
+
+        Reuses the cached series when the cached bars are unchanged and extends
+        it bar by bar when only new days were appended. A revised bar (e.g. a
+        corrected close in a delta download) invalidates the entry.
+        """
+        key = (ticker, indicator.key)
+        entry = self._entries.get(key)
+        close = np.array(close, dtype=np.float64)
+        dates = np.array(dates)
+        n = len(dates)
+        if entry is not None and n and self._same_bars(entry, dates, close):
+            m = len(entry["dates"])
+            if m == n:
+                return entry["outputs"]
+            state = entry["state"]
+            new = {name: np.empty(n - m) for name in entry["outputs"]}
+            for i in range(m, n):
+                values, state = indicator.step(state, float(close[i]))
+                for name, value in values.items():
+                    new[name][i - m] = value
+            outputs = {name: np.concatenate([entry["outputs"][name], new[name]]) for name in new}
+            self._entries[key] = {"dates": dates, "close": close, "outputs": outputs, "state": state}
+            self.extended += 1
+            return outputs
+
+        outputs, state = indicator.compute(close)
+        self._entries[key] = {"dates": dates, "close": close, "outputs": outputs, "state": state}
+        self.computed += 1
+        return outputs
+
+    @staticmethod
+    def _same_bars(entry, dates, close):
+        """True when (dates, close) start with exactly the cached bars."""
+        m = len(entry["dates"])
+        return (
+            0 < m <= len(dates)
+            and np.array_equal(entry["dates"], dates[:m])
+            and np.array_equal(entry["close"], close[:m], equal_nan=True)
+        )
+
+    def frame(self, table, indicators, tickers=None):
+        """
+        Long DataFrame (Date, Ticker, Indicator, Value) for every ticker in a
+        daily table and every indicator; Indicator holds labels like "SMA(20)".
+        """
+        import pandas as pd
+
+        index = TickerIndex(table)
+        tickers = [t for t in (tickers if tickers is not None else index.tickers) if t in index]
+        labels = []
+        dates, values, ticker_codes, label_codes = [], [], [], []
+        for t, ticker in enumerate(tickers):
+            lo, hi = index.slices[ticker]
+            ticker_dates = table["Date"][lo:hi]
+            for indicator in indicators:
+                outputs = self.series(ticker, ticker_dates, table["Close"][lo:hi], indicator)
+                for output, series in outputs.items():
+                    label = indicator.label(output)
+                    if label not in labels:
+                        labels.append(label)
+                    valid = ~np.isnan(series)
+                    dates.append(ticker_dates[valid])
+                    values.append(series[valid])
+                    ticker_codes.append(np.full(len(values[-1]), t, dtype=np.int32))
+                    label_codes.append(np.full(len(values[-1]), labels.index(label), dtype=np.int32))
+        if not dates:
+            return pd.DataFrame(columns=["Date", "Ticker", "Indicator", "Value"])
+        return pd.DataFrame({
+            "Date": np.concatenate(dates).astype("datetime64[ns]"),
+            "Ticker": pd.Categorical.from_codes(np.concatenate(ticker_codes), categories=tickers),
+            "Indicator": pd.Categorical.from_codes(np.concatenate(label_codes), categories=labels),
+            "Value": np.concatenate(values),
+        })
+
+
+# Shared by the dashboard cells in this process
+engine = IndicatorEngine()
+
+
+def parse_indicator(spec):
+    """Indicator from a label such as "SMA 20", "EMA 50", "Bollinger 20", "RSI 14" or "MACD"."""
+    name, *args = spec.split()
+    cls = INDICATORS[name.lower()]
+    return cls(*(int(a) for a in args))
+
+
+def indicator_charts(table, specs, width=700, tickers=None, indicator_engine=None):
+    """
+    (overlay, panels) Altair charts for indicator labels like ["SMA 20", "RSI 14"].
+
+    `overlay` holds the price-scale indicators (SMA, EMA, Bollinger) as dashed
+    lines to layer over a price chart, or None; `panels` holds one chart per
+    oscillator (RSI, MACD). Series come from the cached engine and are
+    downsampled to the chart width like the price lines.
+    """
+    import altair as alt
+
+    from .downsample import downsample_long
+
+    indicator_engine = indicator_engine or engine
+    indicators = [parse_indicator(spec) for spec in specs]
+    overlay, panels = None, []
+    if not indicators or not len(table):
+        return overlay, panels
+
+    def prepared(selected):
+        df = indicator_engine.frame(table, selected, tickers)
+        df["Series"] = df["Ticker"].astype(str) + " " + df["Indicator"].astype(str)
+        df, _ = downsample_long(df, width=width, value="Value", ticker="Series")
+        return df
+
+    on_price = [i for i in indicators if i.overlay]
+    if on_price:
+        overlay = alt.Chart(prepared(on_price)).mark_line(strokeDash=[4, 3], strokeWidth=1.5).encode(
+            x="Date:T",
+            y="Value:Q",
+            color=alt.Color("Ticker:N", title="Stock"),
+            detail="Series:N",
+            tooltip=["Date:T", "Ticker:N", "Indicator:N", alt.Tooltip("Value:Q", format=".2f")],
+        )
+    for indicator in indicators:
+        if indicator.overlay:
+            continue
+        panel = alt.Chart(prepared([indicator])).mark_line(strokeWidth=1.2).encode(
+            x=alt.X("Date:T", title=None),
+            y=alt.Y("Value:Q", title=indicator.label(indicator.name)),
+            color=alt.Color("Ticker:N", title="Stock"),
+            strokeDash=alt.StrokeDash("Indicator:N", title=None),
+            tooltip=["Date:T", "Ticker:N", "Indicator:N", alt.Tooltip("Value:Q", format=".2f")],
+        ).properties(width=width, height=120)
+        panels.append(panel)
+    return overlay, panels
@@ -0,0 +1,158 @@
+"""
+Vectorized per-ticker performance metrics.
+
+All tickers are computed together: prices are laid out as one array grouped
+into contiguous per-ticker segments, a single set of `np.*.reduceat`
+reductions in segment_stats() produces the per-segment statistics, and every
+metric in METRICS is derived from those statistics. Adding a metric means
+adding an entry to METRICS, not another pass over the data.
+
+Results are numeric; formatting ("$", "%") is left to the dashboards.
+"""
+
+import numpy as np
+
+TRADING_DAYS = 252
+
+
+def segment_stats(prices, starts, volumes=None):
+    """
+    Per-segment statistics for prices grouped into segments beginning at `starts`.
+
+    Within a segment prices must be in date order. Returns a dict of arrays with
+    one entry per segment.
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    starts = np.asarray(starts, dtype=np.intp)
+    counts = np.diff(np.append(starts, len(prices)))
+    last = starts + counts - 1
+
+    # Daily returns, with the first row of every segment masked out
+    returns = np.empty_like(prices)
+    returns[0] = np.nan
+    np.divide(prices[1:], prices[:-1], out=returns[1:])
+    returns[1:] -= 1
+    returns[starts] = np.nan
+    valid = ~np.isnan(returns)
+    filled = np.where(valid, returns, 0.0)
+
+    n_returns = np.add.reduceat(valid, starts)
+    mean_return = np.add.reduceat(filled, starts) / np.maximum(n_returns, 1)
+    deviation = np.where(valid, filled - np.repeat(mean_return, counts), 0.0)
+    sum_sq = np.add.reduceat(deviation * deviation, starts)
+
+    stats = {
+        "count": counts,
+        "first": prices[starts],
+        "last": prices[last],
+        "high": np.maximum.reduceat(prices, starts),
+        "low": np.minimum.reduceat(prices, starts),
+        "n_returns": n_returns,
+        "mean_return": mean_return,
+        # Sample variance (ddof=1), matching pandas' Series.std()
+        "var_return": np.where(n_returns > 1, sum_sq / np.maximum(n_returns - 1, 1), np.nan),
+    }
+    if volumes is not None:
+        volumes = np.asarray(volumes, dtype=np.float64)
+        # Average over the days that report a volume (NaN if none does)
+        known = ~np.isnan(volumes)
+        n_volumes = np.add.reduceat(known, starts)
+        total = np.add.reduceat(np.where(known, volumes, 0.0), starts)
+        stats["avg_volume"] = np.where(n_volumes > 0, total / np.maximum(n_volumes, 1), np.nan)
+    return stats
+
+
+# Derived metrics: name -> function of the segment statistics
+METRICS = {
+    "Current Price": lambda s: s["last"],
+    "Total Return": lambda s: (s["last"] - s["first"]) / s["first"] * 100,
+    "Volatility": lambda s: np.sqrt(s["var_return"]) * np.sqrt(TRADING_DAYS) * 100,
+    "High": lambda s: s["high"],
+    "Low": lambda s: s["low"],
+    "Price Range": lambda s: (s["high"] - s["low"]) / s["low"] * 100,
+    "Avg Daily Volume": lambda s: s.get("avg_volume", np.full(len(s["count"]), np.nan)),
+}
+
+
+def compute_metrics(tickers, prices, starts, volumes=None, min_days=2):
+    """
+    Metrics table (pandas DataFrame) for grouped price segments.
+
+    `tickers[i]` names the segment starting at `starts[i]`. Segments with fewer
+    than `min_days` prices are dropped.
+    """
+    import pandas as pd
+
+    if len(starts) == 0:
+        return pd.DataFrame(columns=["Ticker", *METRICS])
+    stats = segment_stats(prices, starts, volumes)
+    table = {"Ticker": np.asarray(tickers, dtype=object)}
+    for name, metric in METRICS.items():
+        table[name] = metric(stats)
+    df = pd.DataFrame(table)
+    return df[stats["count"] >= min_days].reset_index(drop=True)
+
+
+def metrics_from_long(df, tickers=None, price="Price", volume="Volume"):
+    """
+    Metrics from a long (Date, Ticker, Price[, Volume]) frame.
+
+    Rows are ordered by (Ticker, Date) with one sort unless they already are
+    (as returned by TickerIndex.select); results follow the order of `tickers`
+    (default: order of first appearance).
+    """
+    import pandas as pd
+
+    column = df["Ticker"]
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        raw = column.cat.codes.to_numpy()
+        categories = column.cat.categories.astype(str)
+    else:
+        raw, categories = pd.factorize(column.astype(str))
+    if tickers is None:
+        present = pd.unique(raw[raw >= 0])
+        tickers = [categories[c] for c in present]
+
+    # Category code -> position in `tickers` (-1 for tickers not requested)
+    position = {t: i for i, t in enumerate(tickers)}
+    lookup = np.array([position.get(c, -1) for c in categories] + [-1], dtype=np.intp)
+    codes = lookup[raw]
+    keep = codes >= 0
+    codes = codes[keep]
+    dates = df["Date"].to_numpy()[keep]
+    code_step = np.diff(codes)
+    if np.all(code_step >= 0) and np.all((code_step > 0) | (np.diff(dates) > np.timedelta64(0))):
+        order = slice(None)
+    else:
+        order = np.lexsort((dates, codes))
+        codes = codes[order]
+
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]]) if len(codes) else np.empty(0, np.intp)
+    names = [tickers[c] for c in codes[starts]]
+    prices = df[price].to_numpy(dtype=np.float64)[keep][order]
+    volumes = df[volume].to_numpy(dtype=np.float64)[keep][order] if volume in df else None
+    return compute_metrics(names, prices, starts, volumes)
+
+
+def metrics_from_wide(close, volume=None):
+    """
+    Metrics from wide Date x Ticker frames (yfinance's data['Close'] layout).
+
+    Missing prices are skipped per ticker, like Series.dropna().
+    """
+    tickers = [str(c) for c in close.columns]
+    values = close.to_numpy(dtype=np.float64).T
+    mask = ~np.isnan(values)
+    counts = mask.sum(axis=1)
+    present = counts > 0
+    if not present.any():
+        # No prices at all (new or delisted tickers, an empty period)
+        return compute_metrics([], values[mask], np.empty(0, np.intp))
+    starts = np.concatenate([[0], np.cumsum(counts[present])[:-1]]).astype(np.intp)
+
+    volumes = None
+    if volume is not None:
+        vol = volume.reindex(columns=close.columns).to_numpy(dtype=np.float64).T
+        # Volumes of the days that have a price; missing ones are left out of the average
+        volumes = vol[mask]
+    return compute_metrics([t for t, p in zip(tickers, present) if p], values[mask], starts, volumes)
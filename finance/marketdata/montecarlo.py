@@ -0,0 +1,236 @@
+"""
+Chunked Monte Carlo simulation of forward portfolio paths.
+
+A PortfolioSimulator is built from the aligned daily returns of the selected
+tickers (correlation.aligned_returns) and portfolio weights, held constant
+(rebalanced daily). Two models:
+
+    bootstrap   each simulated day is a whole historical day drawn with
+                replacement, so fat tails and cross-ticker correlation are
+                kept as observed
+    normal      correlated normal daily returns with the tickers' annualized
+                volatility (the metrics table's "Volatility") and pairwise
+                correlation; with constant weights the portfolio return is
+                then normal with variance w' S w, so one draw per path and
+                day is enough regardless of the number of tickers
+
+Paths are generated in chunks of CHUNK_PATHS and never kept: each chunk is
+folded into a FanSummary, a fixed-size histogram of log portfolio value per
+horizon day (bins scaled to the model's spread at that day). Summaries add,
+so memory is the same for ten thousand or ten million paths, chunks can run
+on a process pool and return only their histogram, and percentile bands,
+VaR and CVaR can be read after every chunk while the run refines. Chunk k
+always uses the k-th child of SeedSequence(seed), so results do not depend
+on the number of workers.
+"""
+
+import os
+import sys
+from collections import deque
+
+import numpy as np
+
+from .correlation import correlation_matrix
+from .metrics import TRADING_DAYS
+
+MODELS = ("bootstrap", "normal")
+CHUNK_PATHS = 10_000
+BINS = 1024
+# Histogram range per horizon day, in standard deviations of the log value;
+# paths beyond it land in the edge bins (their values still count in CVaR)
+Z_RANGE = 8.0
+PERCENTILES = (5, 25, 50, 75, 95)
+
+
+def default_workers(limit=4):
+    """Process pool size for interactive runs: up to `limit`, None on one CPU or in Pyodide."""
+    if sys.platform == "emscripten":
+        return None
+    cpus = os.cpu_count() or 1
+    return min(limit, cpus) if cpus > 1 else None
+
+
+class FanSummary:
+    """Mergeable per-day histogram of simulated log portfolio values."""
+
+    def __init__(self, horizon, drift, scale, bins=BINS, z_range=Z_RANGE):
+        self.horizon = horizon
+        self.bins = bins
+        steps = np.arange(1, horizon + 1)
+        spread = z_range * max(scale, 1e-6) * np.sqrt(steps)
+        self.low = drift * steps - spread
+        self.width = 2 * spread / bins
+        self.counts = np.zeros((horizon, bins), dtype=np.int64)
+        # Sum of terminal simple returns per terminal bin, for CVaR
+        self.terminal_sums = np.zeros(bins)
+        self.paths = 0
+
+    def add(self, log_values):
+        """Fold a (paths x horizon) block of cumulative log returns into the histogram."""
+        index = np.floor((log_values - self.low) / self.width).astype(np.int64)
+        np.clip(index, 0, self.bins - 1, out=index)
+        flat = index + np.arange(self.horizon) * self.bins
+        self.counts += np.bincount(flat.ravel(), minlength=self.counts.size).reshape(self.counts.shape)
+        self.terminal_sums += np.bincount(index[:, -1], weights=np.expm1(log_values[:, -1]), minlength=self.bins)
+        self.paths += len(log_values)
+        return self
+
+    def merge(self, other):
+        self.counts += other.counts
+        self.terminal_sums += other.terminal_sums
+        self.paths += other.paths
+        return self
+
+    def quantiles(self, percentiles=PERCENTILES):
+        """(len(percentiles) x horizon) portfolio value multiples (1.0 = today)."""
+        cumulative = np.cumsum(self.counts, axis=1)
+        result = np.empty((len(percentiles), self.horizon))
+        for row, q in enumerate(percentiles):
+            target = q / 100 * self.paths
+            j = np.minimum((cumulative < target).sum(axis=1), self.bins - 1)
+            steps = np.arange(self.horizon)
+            before = np.where(j > 0, cumulative[steps, np.maximum(j - 1, 0)], 0)
+            inside = self.counts[steps, j]
+            fraction = np.divide(target - before, inside, out=np.full(self.horizon, 0.5), where=inside > 0)
+            result[row] = np.exp(self.low + (j + fraction) * self.width)
+        return result
+
+    def var(self, level=0.95):
+        """Value at risk over the horizon: loss (fraction of value) not exceeded with `level` confidence."""
+        return float(1 - self.quantiles([(1 - level) * 100])[0, -1])
+
+    def cvar(self, level=0.95):
+        """Expected shortfall: mean loss over the worst (1 - level) of paths."""
+        tail = (1 - level) * self.paths
+        counts = self.counts[-1]
+        cumulative = np.cumsum(counts)
+        j = min(int((cumulative < tail).sum()), self.bins - 1)
+        before = cumulative[j - 1] if j > 0 else 0
+        total = self.terminal_sums[:j].sum()
+        if counts[j]:
+            total += (tail - before) / counts[j] * self.terminal_sums[j]
+        return float(-total / tail) if tail > 0 else float("nan")
+
+    def frame(self, percentiles=PERCENTILES, start_value=100.0):
+        """Long pandas frame (Day, Percentile, Value) of the bands, for charts."""
+        import pandas as pd
+
+        values = self.quantiles(percentiles) * start_value
+        return pd.DataFrame({
+            "Day": np.tile(np.arange(1, self.horizon + 1), len(percentiles)),
+            "Percentile": np.repeat([f"p{q}" for q in percentiles], self.horizon),
+            "Value": values.ravel(),
+        })
+
+
+def _simulate_chunk(model, horizon, paths, seed):
+    """FanSummary of `paths` simulated paths drawn with SeedSequence `seed`."""
+    rng = np.random.default_rng(seed)
+    if model["model"] == "bootstrap":
+        history = model["log_returns"]
+        steps = history[rng.integers(0, len(history), (paths, horizon))]
+    else:
+        steps = rng.normal(model["drift"], model["scale"], (paths, horizon))
+    np.cumsum(steps, axis=1, out=steps)
+    return FanSummary(horizon, model["drift"], model["scale"]).add(steps)
+
+
+class PortfolioSimulator:
+    """
+    Forward paths of a constant-weight portfolio of the selected tickers.
+
+        sim = PortfolioSimulator.from_aligned(marketdata.aligned_returns(table, tickers), model="normal")
+        for summary in sim.iter_run(1_000_000, horizon=252, workers=4):
+            bands = summary.quantiles()          # refines as chunks finish
+        summary.var(0.95), summary.cvar(0.95)
+    """
+
+    def __init__(self, tickers, returns, weights=None, model="bootstrap", volatility=None):
+        if model not in MODELS:
+            raise ValueError(f"Unknown model: {model} (choose from {', '.join(MODELS)})")
+        self.tickers = list(tickers)
+        returns = np.asarray(returns, dtype=np.float64)
+        weights = np.full(len(self.tickers), 1.0) if weights is None else np.asarray(weights, dtype=np.float64)
+        self.weights = weights / weights.sum()
+        # Days where every selected ticker has a return
+        complete = returns[~np.isnan(returns).any(axis=1)]
+        if len(complete) < 2:
+            raise ValueError("Not enough overlapping history to simulate")
+
+        portfolio = np.log1p(complete @ self.weights)
+        self.model = {"model": model, "drift": portfolio.mean(), "scale": portfolio.std(ddof=1)}
+        if model == "bootstrap":
+            self.model["log_returns"] = portfolio
+        else:
+            # Daily volatility from the annualized percentages of the metrics table
+            daily = (np.asarray(volatility, dtype=np.float64) / 100 / np.sqrt(TRADING_DAYS)
+                     if volatility is not None else complete.std(axis=0, ddof=1))
+            corr = np.nan_to_num(correlation_matrix(complete), nan=0.0)
+            np.fill_diagonal(corr, 1.0)
+            covariance = corr * np.outer(daily, daily)
+            mean = complete.mean(axis=0) @ self.weights
+            variance = float(self.weights @ covariance @ self.weights)
+            # Log-normal daily growth with the portfolio's mean and variance
+            self.model["scale"] = np.sqrt(np.log1p(variance / (1 + mean) ** 2))
+            self.model["drift"] = np.log1p(mean) - self.model["scale"] ** 2 / 2
+
+    @classmethod
+    def from_aligned(cls, aligned, **options):
+        """Simulator from the (dates, tickers, returns) triple of aligned_returns()."""
+        _, tickers, returns = aligned
+        return cls(tickers, returns, **options)
+
+    def iter_run(self, paths, horizon=TRADING_DAYS, chunk_paths=CHUNK_PATHS, workers=None, seed=0):
+        """
+        Yield the running FanSummary after each chunk of at most `chunk_paths`
+        paths; the last one covers all `paths`. With `workers`, chunks run on
+        a process pool of that size (results still arrive in chunk order).
+        """
+        sizes = [min(chunk_paths, paths - i) for i in range(0, paths, chunk_paths)]
+        seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+        tasks = [(self.model, horizon, n, s) for n, s in zip(sizes, seeds)]
+        total = FanSummary(horizon, self.model["drift"], self.model["scale"])
+
+        if workers and len(tasks) > 1:
+            from concurrent.futures import ProcessPoolExecutor
+
+            # At most two chunks per worker in flight, so finished histograms never pile up
+            with ProcessPoolExecutor(workers) as pool:
+                pending = deque()
+                for task in tasks:
+                    pending.append(pool.submit(_simulate_chunk, *task))
+                    if len(pending) >= 2 * workers:
+                        yield total.merge(pending.popleft().result())
+                while pending:
+                    yield total.merge(pending.popleft().result())
+        else:
+            for task in tasks:
+                yield total.merge(_simulate_chunk(*task))
+
+    def run(self, paths, horizon=TRADING_DAYS, chunk_paths=CHUNK_PATHS, workers=None, seed=0):
+        """FanSummary of all `paths` (see iter_run)."""
+        summary = None
+        for summary in self.iter_run(paths, horizon, chunk_paths, workers, seed):
+            pass
+        return summary
+
+
+def fan_chart(summary, start_value=100.0, title=None, width=700, height=300):
+    """Altair fan chart: 5-95% and 25-75% bands and the median of a FanSummary."""
+    import altair as alt
+
+    bands = summary.frame(PERCENTILES, start_value).pivot(index="Day", columns="Percentile", values="Value")
+    bands = bands.reset_index()
+    base = alt.Chart(bands).encode(x=alt.X("Day:Q", title="Trading days ahead"))
+    outer = base.mark_area(opacity=0.2, color="#1f77b4").encode(
+        y=alt.Y("p5:Q", title=f"Portfolio value (start = {start_value:g})", scale=alt.Scale(zero=False)),
+        y2="p95:Q",
+    )
+    inner = base.mark_area(opacity=0.35, color="#1f77b4").encode(y="p25:Q", y2="p75:Q")
+    median = base.mark_line(color="#1f77b4").encode(
+        y="p50:Q",
+        tooltip=["Day:Q", alt.Tooltip("p5:Q", format=".1f"), alt.Tooltip("p50:Q", format=".1f"),
+                 alt.Tooltip("p95:Q", format=".1f")],
+    )
+    title = title or f"{summary.paths:,} simulated paths"
+    return (outer + inner + median).properties(width=width, height=height, title=title)
@@ -0,0 +1,142 @@
+"""
+Multi-resolution OHLC aggregates (daily / weekly / monthly) and candlestick charts.
+
+Aggregates are PriceTables like the daily store: one bar per (Ticker, period)
+with Open = first open, High = max, Low = min, Close = last close and
+Volume = sum, dated by the period's first trading day. Because store rows are
+sorted by (Ticker, Date), every (Ticker, period) group is contiguous and all
+bars are computed with one set of reduceat calls.
+
+The collector keeps the weekly and monthly tables next to the store and
+extends them incrementally: only periods touched by newly appended days are
+recomputed. The dashboards read them through Source.aggregate() (sources.py).
+"""
+
+import numpy as np
+
+from .index import TickerIndex
+from .store import PriceTable, concat_tables
+
+RESOLUTIONS = ("daily", "weekly", "monthly")
+AGGREGATE_FILES = {"weekly": "ohlc_weekly.col", "monthly": "ohlc_monthly.col"}
+
+# Approximate trading days per bar at each resolution
+DAYS_PER_BAR = {"daily": 1, "weekly": 5, "monthly": 21}
+
+# Narrowest candle that still shows a body next to its wick
+MIN_CANDLE_PX = 2.5
+
+
+def period_keys(dates, resolution):
+    """Integer period id for each date (Monday-based weeks, calendar months)."""
+    days = dates.astype("datetime64[D]").astype(np.int64)
+    if resolution == "daily":
+        return days
+    if resolution == "weekly":
+        # 1970-01-01 was a Thursday; shift so weeks start on Monday
+        return (days + 3) // 7
+    if resolution == "monthly":
+        return dates.astype("datetime64[M]").astype(np.int64)
+    raise ValueError(f"Unknown resolution: {resolution}")
+
+
+def resample(table, resolution):
+    """Aggregate a (Ticker, Date)-sorted table to `resolution` bars."""
+    if resolution == "daily" or not len(table):
+        return table
+
+    codes = table["Ticker"]
+    keys = period_keys(table["Date"], resolution)
+    boundary = np.r_[True, (codes[1:] != codes[:-1]) | (keys[1:] != keys[:-1])]
+    starts = np.flatnonzero(boundary)
+    ends = np.append(starts[1:], len(table)) - 1
+
+    columns = {
+        "Date": table["Date"][starts],
+        "Ticker": codes[starts],
+        "Open": table["Open"][starts],
+        "High": np.maximum.reduceat(table["High"], starts),
+        "Low": np.minimum.reduceat(table["Low"], starts),
+        "Close": table["Close"][ends],
+        "Volume": np.add.reduceat(table["Volume"], starts),
+    }
+    return PriceTable(columns, table.tickers)
+
+
+def extend_aggregate(aggregate, daily, added, resolution):
+    """
+    Bring `aggregate` up to date after `added` rows were merged into `daily`.
+
+    For every ticker in `added`, bars from the first affected period onwards are
+    dropped and recomputed from `daily`; earlier bars are reused untouched.
+    """
+    if not len(added):
+        return aggregate
+
+    daily_index = TickerIndex(daily)
+    agg_index = TickerIndex(aggregate)
+    added_index = TickerIndex(added)
+
+    keep = np.ones(len(aggregate), dtype=bool)
+    recompute = []
+    for ticker, (lo, hi) in added_index.slices.items():
+        if hi == lo:
+            continue
+        first_key = period_keys(added["Date"][lo:lo + 1], resolution)[0]
+        if ticker in agg_index:
+            a_lo, a_hi = agg_index.slices[ticker]
+            stale = period_keys(aggregate["Date"][a_lo:a_hi], resolution) >= first_key
+            keep[a_lo:a_hi] &= ~stale
+        d_lo, d_hi = daily_index.slices[ticker]
+        affected = period_keys(daily["Date"][d_lo:d_hi], resolution) >= first_key
+        recompute.append(d_lo + np.flatnonzero(affected))
+
+    rows = np.concatenate(recompute) if recompute else np.empty(0, dtype=np.intp)
+    fresh = resample(daily.take(rows), resolution)
+    return concat_tables([aggregate.take(np.flatnonzero(keep)), fresh])
+
+
+def choose_resolution(trading_days, width=700):
+    """Finest resolution whose bar count fits the chart width."""
+    max_bars = width / MIN_CANDLE_PX
+    for resolution in RESOLUTIONS:
+        if trading_days / DAYS_PER_BAR[resolution] <= max_bars:
+            return resolution
+    return RESOLUTIONS[-1]
+
+
+def resolution_for(table, width=700):
+    """choose_resolution() for the longest ticker history in a daily table."""
+    if not len(table):
+        return "daily"
+    return choose_resolution(int(np.bincount(table["Ticker"]).max()), width)
+
+
+def candlestick_chart(df, width=700, height=400, title=None):
+    """
+    Altair candlestick chart from a long OHLC frame (Date, Ticker, Open, High, Low, Close).
+
+    One row of candles per ticker, each with its own price scale.
+    """
+    import altair as alt
+
+    n_tickers = max(1, df["Ticker"].nunique())
+    color = alt.condition("datum.Open <= datum.Close", alt.value("#2E8B57"), alt.value("#DC143C"))
+    base = alt.Chart().encode(
+        x=alt.X("Date:T", title="Date"),
+        color=color,
+        tooltip=["Date:T", "Ticker:N", "Open:Q", "High:Q", "Low:Q", "Close:Q"],
+    )
+    wick = base.mark_rule().encode(
+        y=alt.Y("Low:Q", title="Price ($)", scale=alt.Scale(zero=False)),
+        y2="High:Q",
+    )
+    body = base.mark_bar().encode(y="Open:Q", y2="Close:Q")
+    chart = alt.layer(wick, body, data=df).properties(
+        width=width, height=max(120, height // n_tickers)
+    ).facet(
+        row=alt.Row("Ticker:N", title=None)
+    ).resolve_scale(y="independent")
+    if title:
+        chart = chart.properties(title=title)
+    return chart
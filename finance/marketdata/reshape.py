@@ -0,0 +1,98 @@
+"""
+Reshaping between yfinance's wide layout and the long chart layout.
+
+`yf.download` returns a frame indexed by Date whose columns are either a
+(Field, Ticker) MultiIndex or, for a single ticker on older versions, plain
+field names. These helpers accept both, so callers never rebuild columns.
+"""
+
+import numpy as np
+
+
+def field_frame(data, field, tickers=None):
+    """Date x Ticker frame for one field ("Close", "Volume", ...)."""
+    import pandas as pd
+
+    if isinstance(data.columns, pd.MultiIndex):
+        frame = data[field]
+        if isinstance(frame, pd.Series):
+            frame = frame.to_frame(tickers[0] if tickers else field)
+    else:
+        frame = data[[field]]
+        frame.columns = [tickers[0] if tickers else field]
+    if tickers is not None:
+        frame = frame[[t for t in tickers if t in frame.columns]]
+    return frame
+
+
+def wide_to_long(data, field="Close", tickers=None, value_name="Price"):
+    """
+    Long (Date, <value_name>, Ticker) frame from a wide yfinance frame.
+
+    Rows are grouped by ticker in column order, dates ascending within each
+    ticker, and missing values are dropped - built with array operations
+    rather than a Python loop over rows.
+    """
+    import pandas as pd
+
+    frame = field_frame(data, field, tickers)
+    values = frame.to_numpy(dtype=np.float64).T
+    mask = ~np.isnan(values)
+    n_tickers, n_dates = values.shape
+
+    dates = np.tile(frame.index.to_numpy(), n_tickers).reshape(n_tickers, n_dates)
+    names = np.repeat(np.asarray([str(c) for c in frame.columns], dtype=object), n_dates).reshape(n_tickers, n_dates)
+    return pd.DataFrame({
+        "Date": dates[mask],
+        value_name: values[mask],
+        "Ticker": names[mask],
+    })
+
+
+def wide_to_table(data, tickers=None):
+    """
+    PriceTable of daily OHLCV bars from a wide yfinance frame.
+
+    Days without a Close are dropped per ticker; a missing Volume becomes 0.
+    """
+    from .store import PriceTable
+
+    close = field_frame(data, "Close", tickers)
+    names = [str(c) for c in close.columns]
+    mask = ~np.isnan(close.to_numpy(dtype=np.float64).T)
+    n_tickers, n_dates = mask.shape
+
+    def field(name):
+        frame = field_frame(data, name, names).reindex(columns=close.columns)
+        return frame.to_numpy(dtype=np.float64).T[mask]
+
+    dates = np.tile(close.index.to_numpy().astype("datetime64[D]"), n_tickers).reshape(n_tickers, n_dates)
+    tickers_col = np.repeat(np.asarray(names, dtype=str), n_dates).reshape(n_tickers, n_dates)
+    return PriceTable.from_arrays(
+        dates[mask],
+        tickers_col[mask],
+        field("Open"),
+        field("High"),
+        field("Low"),
+        field("Close"),
+        np.nan_to_num(field("Volume")).astype(np.int64),
+    )
+
+
+def table_to_wide(table, tickers=None):
+    """
+    Wide yfinance-style frame ((Field, Ticker) MultiIndex columns, Date index)
+    from a PriceTable - the inverse of wide_to_table().
+    """
+    import pandas as pd
+
+    fields = ["Close", "High", "Low", "Open", "Volume"]
+    names = list(tickers) if tickers is not None else list(table.tickers)
+    columns = pd.MultiIndex.from_product([fields, names], names=["Price", "Ticker"])
+    if not len(table):
+        return pd.DataFrame(columns=columns)
+
+    frame = table.to_frame()
+    frame["Ticker"] = frame["Ticker"].astype(str)
+    wide = frame.pivot(index="Date", columns="Ticker", values=fields)
+    return wide.reindex(columns=columns)
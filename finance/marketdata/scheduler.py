@@ -0,0 +1,171 @@
+"""
+Rate-limit-aware request scheduling for the collector and the bulk downloader.
+
+A token bucket caps requests per minute while a thread pool keeps up to that
+many requests in flight. Every attempt (including retries) takes a token and
+one unit of the daily call budget; retryable failures back off exponentially.
+"""
+
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+
+_DONE = object()
+
+
+class RetryableError(Exception):
+    """Failure worth retrying after a backoff (rate limit, 5xx, timeout)."""
+
+
+class StopScheduling(Exception):
+    """Failure that makes further requests pointless (e.g. daily quota used up)."""
+
+
+class BudgetExhausted(StopScheduling):
+    """The daily call budget has no calls left."""
+
+
+class TokenBucket:
+    """Allow `rate` acquisitions per `per` seconds with bursts up to `capacity`."""
+
+    def __init__(self, rate, per=60.0, capacity=None, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate / per
+        self.capacity = capacity if capacity is not None else rate
+        self.tokens = float(self.capacity)
+        self.clock = clock
+        self.sleep = sleep
+        self.updated = clock()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self):
+        """Block until a token is available, then take it."""
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            self.sleep(wait)
+
+
+class DailyBudget:
+    """Calls allowed per calendar day; `used` is persisted in the collector state."""
+
+    def __init__(self, limit, used=0, day=None):
+        self.limit = limit
+        self.used = used
+        self.day = day
+        self.lock = threading.Lock()
+
+    @property
+    def remaining(self):
+        return max(0, self.limit - self.used)
+
+    def take(self):
+        with self.lock:
+            if self.used >= self.limit:
+                raise BudgetExhausted(f"Daily budget of {self.limit} calls used up")
+            self.used += 1
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter."""
+
+    def __init__(self, attempts=4, base_delay=5.0, max_delay=120.0, rng=None):
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.rng = rng or random.Random()
+
+    def delay(self, attempt):
+        return self.rng.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+
+class Scheduler:
+    """Run func(item) for many items under a rate limit, a daily budget and retries."""
+
+    def __init__(self, bucket, budget, retry=None, workers=None, sleep=time.sleep):
+        self.bucket = bucket
+        self.budget = budget
+        self.retry = retry or RetryPolicy()
+        self.workers = workers or max(1, int(bucket.capacity))
+        self.sleep = sleep
+        self.stopped = threading.Event()
+
+    def _call(self, func, item):
+        for attempt in range(self.retry.attempts):
+            if self.stopped.is_set():
+                raise StopScheduling("Scheduling stopped")
+            self.budget.take()
+            self.bucket.acquire()
+            try:
+                return func(item)
+            except RetryableError as e:
+                if attempt == self.retry.attempts - 1:
+                    raise
+                delay = self.retry.delay(attempt)
+                print(f"⏳ {item}: {e} - retrying in {delay:.1f}s")
+                self.sleep(delay)
+
+    def _guarded(self, func, item):
+        try:
+            return self._call(func, item)
+        except StopScheduling:
+            self.stopped.set()
+            raise
+
+    def imap(self, func, items, window=None):
+        """
+        Yield (item, result or exception) as items finish.
+
+        At most `window` items (default: twice the worker count) are in flight
+        or waiting to be consumed, so results can be streamed to disk without
+        holding all of them in memory.
+        """
+        window = window or 2 * self.workers
+        items = iter(items)
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            pending = {}
+            while True:
+                # Submitted in priority order, so the first items get the first tokens
+                while len(pending) < window:
+                    item = next(items, _DONE)
+                    if item is _DONE:
+                        break
+                    pending[pool.submit(self._guarded, func, item)] = item
+                if not pending:
+                    return
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    item = pending.pop(future)
+                    try:
+                        yield item, future.result()
+                    except Exception as e:
+                        yield item, e
+
+    def run(self, func, items):
+        """Map item -> result, or item -> exception for items that failed or were skipped."""
+        items = list(items)
+        results = dict(self.imap(func, items, window=len(items)))
+        return {item: results[item] for item in items}
+
+def plan_rotation(universe, last_fetched, slots, pinned=()):
+    """
+    Pick up to `slots` tickers for today's run.
+
+    Pinned tickers always come first. The rest of the universe follows by
+    staleness: never-fetched tickers, then the oldest `last_fetched` date.
+    """
+    plan = [t for t in pinned][:slots]
+    chosen = set(plan)
+    rest = [t for t in dict.fromkeys(universe) if t not in chosen]
+    rest.sort(key=lambda t: (last_fetched.get(t) is not None, last_fetched.get(t) or "", t))
+    return plan + rest[:max(0, slots - len(plan))]
@@ -0,0 +1,192 @@
+"""
+Sector membership and sector-level indices.
+
+SectorMap reads the Symbol/Name/Sector columns of sp500data.csv once (per
+file version, through the process-level cache). sector_index() turns a daily
+PriceTable into one index series per sector in a single vectorized pass:
+every row gets its daily return and its sector, and one set of bincounts
+over (sector, date) keys produces the mean return of every sector on every
+day. Returns are equal-weighted, or weighted by `weights` (e.g. market caps)
+when given; members without a price on a day are left out of that day.
+
+The result is itself a PriceTable with one "ticker" per sector:
+Close = index level (starting at 100), Volume = number of members priced
+that day, Open/High/Low = Close. It can therefore be stored, sharded and
+indexed like any other table, summarized with sector_metrics(), and extended
+incrementally with extend_sector_index() when new bars arrive.
+"""
+
+import csv
+
+import numpy as np
+
+from .cache import cache, file_validator
+from .index import TickerIndex
+from .metrics import compute_metrics
+from .store import PriceTable, concat_tables
+
+SECTOR_FILE = "sector_index.col"
+BASE_LEVEL = 100.0
+
+
+class SectorMap:
+    """symbol -> (name, sector) for an index universe."""
+
+    def __init__(self, symbols, names, sectors):
+        self.symbols = list(symbols)
+        self.names = dict(zip(self.symbols, names))
+        self.sector = dict(zip(self.symbols, sectors))
+        self.sectors = sorted(set(sectors))
+
+    @classmethod
+    def from_csv(cls, path):
+        with open(path, newline="") as f:
+            rows = [r for r in csv.DictReader(f) if r.get("Symbol")]
+        return cls(
+            [r["Symbol"].strip().upper() for r in rows],
+            [r.get("Name", "").strip() for r in rows],
+            [r.get("Sector", "").strip() for r in rows],
+        )
+
+    def __contains__(self, symbol):
+        return symbol in self.sector
+
+    def members(self, sector):
+        return [s for s in self.symbols if self.sector[s] == sector]
+
+    def codes(self, tickers):
+        """Sector position (in self.sectors) for each ticker, -1 for unknown tickers."""
+        position = {s: i for i, s in enumerate(self.sectors)}
+        return np.array([position.get(self.sector.get(t), -1) for t in tickers], dtype=np.intp)
+
+
+def load_sectors(path):
+    """SectorMap for a Symbol,Name,Sector CSV, parsed once per file version."""
+    return cache.get(("sectors", path), file_validator(path), lambda: SectorMap.from_csv(path))
+
+
+def _sector_returns(daily, sectors, weights=None, since=None):
+    """
+    (sector codes, dates, mean returns, member counts) for every (sector, date)
+    with at least one priced member, from `since` onwards.
+    """
+    codes = daily["Ticker"]
+    closes = daily["Close"]
+    dates = daily["Date"]
+
+    # Daily return of every row; the first row of each ticker has none
+    returns = np.full(len(daily), np.nan)
+    same = codes[1:] == codes[:-1]
+    returns[1:][same] = closes[1:][same] / closes[:-1][same] - 1
+
+    ticker_sector = sectors.codes(daily.tickers)
+    row_sector = ticker_sector[codes] if len(codes) else np.empty(0, dtype=np.intp)
+    keep = row_sector >= 0
+    if since is not None:
+        keep &= dates >= np.datetime64(since, "D")
+    row_sector = row_sector[keep]
+    returns = returns[keep]
+    codes = codes[keep]
+
+    # Calendar-day offsets index the (sector, date) grid directly, without a sort
+    days = dates[keep].astype(np.int64)
+    first_day = days.min() if len(days) else 0
+    date_pos = days - first_day
+    n_sectors = len(sectors.sectors)
+    n_dates = int(date_pos.max()) + 1 if len(days) else 0
+    key = row_sector * n_dates + date_pos
+    size = n_sectors * n_dates
+
+    if weights is None:
+        row_weight = np.ones(len(key))
+    else:
+        ticker_weight = np.array([weights.get(t, 0.0) for t in daily.tickers], dtype=np.float64)
+        row_weight = ticker_weight[codes]
+    valid = ~np.isnan(returns)
+    num = np.bincount(key[valid], weights=(row_weight * returns)[valid], minlength=size)
+    den = np.bincount(key[valid], weights=row_weight[valid], minlength=size)
+    members = np.bincount(key, minlength=size)
+
+    mean = np.divide(num, den, out=np.zeros(size), where=den > 0)
+    present = np.flatnonzero(members > 0)
+    present_dates = (first_day + present % n_dates).astype("datetime64[D]")
+    return present // n_dates, present_dates, mean[present], members[present]
+
+
+def _levels(sector_codes, returns, start_levels):
+    """Index levels from grouped (sector, date-ordered) returns, continuing from start_levels."""
+    starts = np.flatnonzero(np.r_[True, sector_codes[1:] != sector_codes[:-1]]) if len(sector_codes) else []
+    growth = 1 + returns
+    levels = np.empty_like(growth)
+    bounds = np.append(starts, len(growth))
+    for lo, hi in zip(bounds[:-1], bounds[1:]):
+        levels[lo:hi] = start_levels[sector_codes[lo]] * np.cumprod(growth[lo:hi])
+    return levels
+
+
+def _to_table(sectors, sector_codes, dates, levels, members):
+    return PriceTable.from_arrays(
+        dates,
+        np.asarray(sectors.sectors, dtype=object)[sector_codes].astype(str),
+        levels, levels, levels, levels, members,
+    )
+
+
+def sector_index(daily, sectors, weights=None, base=BASE_LEVEL):
+    """PriceTable of sector index levels (see module docstring) from a daily table."""
+    sector_codes, dates, returns, members = _sector_returns(daily, sectors, weights)
+    if not len(dates):
+        return PriceTable.empty()
+    # Returns on each sector's first day are 0 (no previous close), so levels start at `base`
+    levels = _levels(sector_codes, returns, np.full(len(sectors.sectors), base))
+    return _to_table(sectors, sector_codes, dates, levels, members)
+
+
+def extend_sector_index(index, daily, added, sectors, weights=None, base=BASE_LEVEL):
+    """
+    Bring a sector index up to date after `added` rows were merged into `daily`.
+
+    Days before the first added date are kept; later days are recomputed from
+    `daily` and chained onto each sector's last kept level.
+    """
+    if not len(added):
+        return index
+    since = added["Date"].min()
+    keep = np.flatnonzero(index["Date"] < since)
+    kept = index.take(keep)
+
+    start_levels = np.full(len(sectors.sectors), base)
+    for sector, (lo, hi) in TickerIndex(kept).slices.items():
+        if hi > lo and sector in sectors.sectors:
+            start_levels[sectors.sectors.index(sector)] = kept["Close"][hi - 1]
+
+    # Returns on `since` need the previous close, so compute from the full table
+    sector_codes, dates, returns, members = _sector_returns(daily, sectors, weights, since=since)
+    if not len(dates):
+        return kept
+    levels = _levels(sector_codes, returns, start_levels)
+    return concat_tables([kept, _to_table(sectors, sector_codes, dates, levels, members)])
+
+
+def sector_metrics(index, min_days=2):
+    """compute_metrics() table (return, volatility, range...) with one row per sector."""
+    codes = index["Ticker"]
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]]) if len(codes) else np.empty(0, np.intp)
+    names = [index.tickers[c] for c in codes[starts]]
+    metrics = compute_metrics(names, index["Close"], starts, min_days=min_days)
+    return metrics.drop(columns="Avg Daily Volume").rename(columns={"Ticker": "Sector", "Current Price": "Index Level"})
+
+
+def cached_sector_index(daily, sectors, weights=None, version=None):
+    """
+    sector_index() memoized on the version of the data `daily` came from.
+
+    `version` is the source's validator (Source.version(): store mtime/size,
+    yfinance cache coverage); with the row count and last date it identifies
+    `daily` without hashing its columns. Without a version nothing is cached.
+    """
+    if version is None:
+        return sector_index(daily, sectors, weights)
+    key = ("sector_index", tuple(daily.tickers), None if weights is None else tuple(sorted(weights.items())))
+    last = daily["Date"].max() if len(daily) else None
+    return cache.get(key, (version, len(daily), last), lambda: sector_index(daily, sectors, weights))
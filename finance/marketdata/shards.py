@@ -0,0 +1,202 @@
+"""
+Per-ticker shards of the price store plus a manifest.
+
+The collector splits the store into one file per ticker (optionally one per
+ticker and year) and describes them in manifest.json:
+
+    {
+      "version": 1,
+      "by_year": true,
+      "encoding": "wire",
+      "shards": [
+        {"ticker": "AAPL", "path": "shards/AAPL/2025.col", "start": "2025-04-01",
+         "end": "2025-08-22", "rows": 100, "sha256": "..."},
+        ...
+      ],
+      "aggregates": {"weekly": {"path": "ohlc_weekly.col", "sha256": "..."}, ...},
+      "views": {"metrics_3M": {"path": "views/metrics_3M.json", "sha256": "..."}, ...}
+    }
+
+Paths are relative to the manifest. A dashboard reads the manifest first and
+then downloads only the shards that overlap the tickers and period it shows.
+With encoding "wire" the shards (and chart views) use the compact layout in
+wire.py and are published with .gz/.br variants; shard_request() picks the
+URL and parser for either encoding.
+"""
+
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from .cache import parse_index, parse_wire_index
+from .store import concat_tables, decode_store, encode_store
+from .wire import EXTENSION, VARIANTS, decode_wire, encode_wire, write_variants
+
+MANIFEST = "manifest.json"
+
+
+def _years(dates):
+    return dates.astype("datetime64[Y]").astype(int) + 1970
+
+
+def iter_shards(table, by_year=False):
+    """Yield (ticker, year or None, sub-table) for every shard of the table."""
+    codes = table["Ticker"]
+    bounds = np.searchsorted(codes, np.arange(len(table.tickers) + 1))
+    for i, ticker in enumerate(table.tickers):
+        lo, hi = int(bounds[i]), int(bounds[i + 1])
+        if hi == lo:
+            continue
+        if not by_year:
+            yield ticker, None, table.take(np.arange(lo, hi))
+            continue
+        years = _years(table["Date"][lo:hi])
+        cuts = np.flatnonzero(np.diff(years)) + 1
+        for start, stop in zip([0, *cuts.tolist()], [*cuts.tolist(), hi - lo]):
+            yield ticker, int(years[start]), table.take(np.arange(lo + start, lo + stop))
+
+
+def shard_path(ticker, year=None, extension=".col"):
+    if year is None:
+        return f"shards/{ticker}{extension}"
+    return f"shards/{ticker}/{year}{extension}"
+
+
+def write_shards(table, directory, by_year=False, aggregates=None, views=None, encoding="store"):
+    """
+    Write the table as shards under `directory` and return the manifest.
+
+    Shards whose content hash is unchanged are not rewritten, and shards that no
+    longer appear in the table are removed. `aggregates` maps a name (e.g.
+    "weekly") to an already written file in `directory` to list in the manifest;
+    `views` does the same for the materialized views (see views.py).
+    `encoding` is "store" (.col files) or "wire" (.mdw plus compressed variants).
+    """
+    entries = []
+    keep = set()
+    for ticker, year, shard in iter_shards(table, by_year):
+        if encoding == "wire":
+            relative = shard_path(ticker, year, EXTENSION)
+            data = encode_wire(shard)
+            digest = write_variants(data, os.path.join(directory, relative))
+            keep.update(relative + suffix for suffix in VARIANTS)
+        else:
+            relative = shard_path(ticker, year)
+            data = encode_store(shard)
+            digest = hashlib.sha256(data).hexdigest()
+            path = os.path.join(directory, relative)
+            if not _same_content(path, digest):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, "wb") as f:
+                    f.write(data)
+        keep.add(relative)
+        dates = shard["Date"]
+        entries.append({
+            "ticker": ticker,
+            "path": relative,
+            "start": str(dates[0]),
+            "end": str(dates[-1]),
+            "rows": len(shard),
+            "sha256": digest,
+        })
+
+    _remove_stale(directory, keep)
+    manifest = {"version": 1, "by_year": by_year, "encoding": encoding, "shards": entries}
+    if aggregates:
+        manifest["aggregates"] = _describe_files(directory, aggregates)
+    if views:
+        manifest["views"] = _describe_files(directory, views)
+    with open(os.path.join(directory, MANIFEST), "w") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def read_shards(directory):
+    """
+    The full table from the shards listed in `directory`'s manifest (local
+    files), or None without a manifest. The collector's base table: shards
+    are only rewritten when their content changes, so nothing else has to be.
+    """
+    try:
+        with open(os.path.join(directory, MANIFEST)) as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return None
+    decode = decode_wire if manifest.get("encoding") == "wire" else decode_store
+    tables = []
+    for entry in manifest["shards"]:
+        with open(os.path.join(directory, entry["path"]), "rb") as f:
+            tables.append(decode(f.read()))
+    return concat_tables(tables)
+
+
+def _describe_files(directory, files):
+    return {
+        name: {"path": relative, "sha256": _file_digest(os.path.join(directory, relative))}
+        for name, relative in files.items()
+    }
+
+
+def _file_digest(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _same_content(path, digest):
+    try:
+        return _file_digest(path) == digest
+    except FileNotFoundError:
+        return False
+
+
+def _remove_stale(directory, keep):
+    root = os.path.join(directory, "shards")
+    for dirpath, _, filenames in os.walk(root, topdown=False):
+        for name in filenames:
+            path = os.path.join(dirpath, name)
+            if os.path.relpath(path, directory).replace(os.sep, "/") not in keep:
+                os.remove(path)
+        if dirpath != root and not os.listdir(dirpath):
+            os.rmdir(dirpath)
+
+
+def manifest_tickers(manifest):
+    return sorted({e["ticker"] for e in manifest["shards"]})
+
+
+def select_shards(manifest, tickers, start=None, end=None):
+    """Manifest entries for `tickers` whose date range overlaps [start, end]."""
+    wanted = set(tickers)
+    start = str(np.datetime64(start, "D")) if start is not None else None
+    end = str(np.datetime64(end, "D")) if end is not None else None
+    return [
+        e for e in manifest["shards"]
+        if e["ticker"] in wanted
+        and (start is None or e["end"] >= start)
+        and (end is None or e["start"] <= end)
+    ]
+
+
+def aggregate_url(base, manifest, resolution):
+    """URL of a precomputed OHLC aggregate listed in the manifest."""
+    return shard_url(base, manifest["aggregates"][resolution])
+
+
+def shard_request(base, manifest, entry):
+    """(url, parse) for fetching a shard or chart view in the manifest's encoding."""
+    if manifest.get("encoding") == "wire":
+        return shard_url(base, entry, suffix=".gz"), parse_wire_index
+    return shard_url(base, entry), parse_index
+
+
+def view_url(base, manifest, name):
+    """URL of a materialized view listed in the manifest, or None if it is not published."""
+    entry = manifest.get("views", {}).get(name)
+    return shard_url(base, entry) if entry else None
+
+
+def shard_url(base, entry, suffix=""):
+    """URL for a shard (or its `suffix` variant); the content hash makes every version a distinct cache key."""
+    return f"{base.rstrip('/')}/{entry['path']}{suffix}?v={entry['sha256'][:16]}"
@@ -0,0 +1,324 @@
+"""
+Pluggable price data backends behind one query interface.
+
+Every backend answers the same batch range query:
+
+    table = source.load(["AAPL", "MSFT"], start="2025-01-01", end=None)
+    table = await source.aload(["AAPL", "MSFT"], start="2025-01-01")
+
+and returns a PriceTable with start <= Date <= end (either bound may be None).
+Backends only implement `_load` (and `_aload` where the native API is
+asynchronous); the base class does what every entry point shares:
+
+- identical queries that are already in flight are coalesced into one
+  backend call,
+- every backend call is timed and counted in `source.stats` and recorded
+  as a "load" span on the timeline,
+- parsed files go through the process-level cache (`marketdata.cache`) and
+  yfinance downloads through the on-disk delta cache, so a performance
+  change in either applies to the dashboards and the collector alike.
+
+Weekly and monthly OHLC bars are queried the same way:
+
+    bars = source.aggregate(["AAPL"], "weekly", start="2025-01-01")
+    bars = await source.aaggregate(["AAPL"], "weekly", start="2025-01-01")
+
+Backends with the collector's precomputed aggregates (ohlc.AGGREGATE_FILES)
+read them ("static" through the manifest, "local" next to the store file);
+the others resample their daily bars.
+
+Backends are registered in SOURCES and created with open_source(name, ...).
+"""
+
+import asyncio
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import Future
+from datetime import date, timedelta
+
+from .alphavantage import API_URL, fetch_alpha_vantage_data, validate_records
+from .cache import cache, file_validator, parse_index, parse_json
+from .fetch import fetch, fetch_all
+from .index import TickerIndex
+from .ohlc import AGGREGATE_FILES, resample
+from .shards import aggregate_url, select_shards, shard_request
+from .store import PriceTable, concat_tables, read_store
+from .timing import timeline
+from .yfcache import YFinanceCache
+
+# Alpha Vantage "compact" responses hold the last 100 trading days
+COMPACT_DAYS = 140
+
+
+def as_date(value):
+    """date from a date, datetime, numpy datetime64 or ISO string (None passes through)."""
+    if value is None or type(value) is date:
+        return value
+    if hasattr(value, "date"):
+        return value.date()
+    return date.fromisoformat(str(value)[:10])
+
+
+class Source(ABC):
+    """Base class: coalescing, timing and the sync/async entry points."""
+
+    name = "source"
+
+    def __init__(self):
+        self.stats = {"calls": 0, "coalesced": 0, "errors": 0, "rows": 0, "seconds": 0.0}
+        self._lock = threading.Lock()
+        self._inflight = {}
+        self._tasks = {}
+
+    def _key(self, tickers, start, end):
+        return (tuple(tickers), as_date(start), as_date(end))
+
+    def _record(self, started, key, table=None):
+        seconds = time.perf_counter() - started
+        self.stats["seconds"] += seconds
+        if table is None:
+            self.stats["errors"] += 1
+        else:
+            self.stats["rows"] += len(table)
+        timeline.add("load", seconds, started=started, source=self.name, tickers=len(key[0]),
+                     rows=None if table is None else len(table), error=table is None or None)
+
+    def load(self, tickers, start=None, end=None):
+        """PriceTable for `tickers` with start <= Date <= end."""
+        key = self._key(tickers, start, end)
+        with self._lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+                self.stats["calls"] += 1
+            else:
+                self.stats["coalesced"] += 1
+        if not owner:
+            return future.result()
+
+        started = time.perf_counter()
+        try:
+            table = self._load(*key)
+        except BaseException as e:
+            self._record(started, key)
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+        self._record(started, key, table)
+        future.set_result(table)
+        return table
+
+    async def aload(self, tickers, start=None, end=None):
+        """Awaitable load(); concurrent identical queries share one task."""
+        key = self._key(tickers, start, end)
+        task = self._tasks.get(key)
+        if task is not None:
+            self.stats["coalesced"] += 1
+            return await task
+
+        async def run():
+            started = time.perf_counter()
+            try:
+                table = await self._aload(*key)
+            except BaseException:
+                self._record(started, key)
+                raise
+            self._record(started, key, table)
+            return table
+
+        self.stats["calls"] += 1
+        task = self._tasks[key] = asyncio.ensure_future(run())
+        try:
+            return await task
+        finally:
+            self._tasks.pop(key, None)
+
+    def aggregate(self, tickers, resolution, start=None, end=None):
+        """OHLC bars at `resolution` ("daily", "weekly" or "monthly") with start <= Date <= end."""
+        if resolution == "daily":
+            return self.load(tickers, start, end)
+        return self._aggregate(tuple(tickers), resolution, as_date(start), as_date(end))
+
+    async def aaggregate(self, tickers, resolution, start=None, end=None):
+        """Awaitable aggregate()."""
+        if resolution == "daily":
+            return await self.aload(tickers, start, end)
+        return await self._aaggregate(tuple(tickers), resolution, as_date(start), as_date(end))
+
+    def version(self):
+        """Validator of the data behind the source (file mtime/size), or None if unknown."""
+        return None
+
+    @abstractmethod
+    def _load(self, tickers, start, end):
+        """PriceTable for `tickers` with start <= Date <= end (dates already normalized)."""
+
+    async def _aload(self, tickers, start, end):
+        return await asyncio.to_thread(self._load, tickers, start, end)
+
+    def _aggregate(self, tickers, resolution, start, end):
+        # No precomputed bars: resample the daily ones
+        return resample(self.load(tickers, start, end), resolution)
+
+    async def _aaggregate(self, tickers, resolution, start, end):
+        return resample(await self.aload(tickers, start, end), resolution)
+
+
+class YFinanceSource(Source):
+    """yfinance through the on-disk delta cache (only missing ranges are downloaded)."""
+
+    name = "yfinance"
+
+    def __init__(self, cache_dir=None, download=None):
+        super().__init__()
+        self.store = YFinanceCache(cache_dir, download=download)
+
+    def version(self):
+        return self.store.version()
+
+    def _load(self, tickers, start, end):
+        return self.store.table(list(tickers), start or date.today() - timedelta(days=365), end)
+
+
+class AlphaVantageSource(Source):
+    """
+    Alpha Vantage daily bars, one request per ticker.
+
+    Queries reaching further back than the compact window (or without a start)
+    use outputsize=full. Malformed bars are dropped; rate limits and quota
+    errors propagate as the scheduler's exceptions.
+    """
+
+    name = "alphavantage"
+
+    def __init__(self, api_key, api_url=API_URL, fetch=fetch_alpha_vantage_data):
+        super().__init__()
+        self.api_key = api_key
+        self.api_url = api_url
+        self.fetch = fetch
+
+    def _load(self, tickers, start, end):
+        compact = start is not None and start >= date.today() - timedelta(days=COMPACT_DAYS)
+        outputsize = "compact" if compact else "full"
+        records = []
+        for ticker in tickers:
+            rows = self.fetch(ticker, self.api_key, outputsize, api_url=self.api_url)
+            if not rows:
+                continue
+            valid, rejected = validate_records(rows)
+            if rejected:
+                print(f"⚠️ Dropped {rejected} invalid bars for {ticker}")
+            records.extend(valid)
+        table = PriceTable.from_records(records) if records else PriceTable.empty()
+        return TickerIndex(table).select(tickers, start, end)
+
+
+class LocalSource(Source):
+    """A local store file (data/stock_data.col), memory-mapped and indexed once per version."""
+
+    name = "local"
+
+    def __init__(self, path="data/stock_data.col"):
+        super().__init__()
+        self.path = path
+
+    def version(self):
+        return file_validator(self.path)
+
+    def _load(self, tickers, start, end):
+        index = cache.get(
+            ("index", self.path), file_validator(self.path), lambda: TickerIndex(read_store(self.path))
+        )
+        return index.select(tickers, start, end)
+
+    def _aggregate(self, tickers, resolution, start, end):
+        path = os.path.join(os.path.dirname(self.path), AGGREGATE_FILES.get(resolution, ""))
+        if resolution not in AGGREGATE_FILES or not os.path.exists(path):
+            return super()._aggregate(tickers, resolution, start, end)
+        index = cache.get(("index", path), file_validator(path), lambda: TickerIndex(read_store(path)))
+        return index.select(tickers, start, end)
+
+
+class StaticSource(Source):
+    """
+    The published data directory: manifest.json plus per-ticker/year shards.
+
+    Only shards overlapping the query are requested, concurrently and cached
+    by content hash (gzipped wire files when the manifest says so). Works over HTTP in the browser and on local files
+    elsewhere (see fetch.py).
+
+    The backend is asynchronous: load() and aggregate() run it to completion
+    from plain scripts but raise RuntimeError inside a running event loop
+    (marimo cells, Pyodide), where aload() and aaggregate() are the entry points.
+    """
+
+    name = "static"
+
+    def __init__(self, base="./data", manifest=None):
+        super().__init__()
+        self.base = base.rstrip("/")
+        self._manifest = manifest
+
+    async def manifest(self):
+        """manifest.json, fetched once per source (pass `manifest=` if already loaded)."""
+        if self._manifest is None:
+            self._manifest = await fetch(f"{self.base}/manifest.json", parse_json)
+        return self._manifest
+
+    async def _aload(self, tickers, start, end):
+        manifest = await self.manifest()
+        entries = select_shards(manifest, tickers, start=start, end=end)
+        shards = await fetch_all({
+            entry["path"]: shard_request(self.base, manifest, entry) for entry in entries
+        })
+        for shard in shards.values():
+            if isinstance(shard, Exception):
+                raise shard
+        return concat_tables([shard.select(tickers, start, end) for shard in shards.values()])
+
+    async def _aaggregate(self, tickers, resolution, start, end):
+        manifest = await self.manifest()
+        if resolution not in manifest.get("aggregates", {}):
+            return await super()._aaggregate(tickers, resolution, start, end)
+        # One file per resolution for every ticker, cached by content hash like the shards
+        index = await fetch(aggregate_url(self.base, manifest, resolution), parse_index)
+        return index.select(tickers, start, end)
+
+    def _load(self, tickers, start, end):
+        return _run_sync(self._aload(tickers, start, end), "load", "aload")
+
+    def _aggregate(self, tickers, resolution, start, end):
+        return _run_sync(self._aaggregate(tickers, resolution, start, end), "aggregate", "aaggregate")
+
+
+def _run_sync(coroutine, name, async_name):
+    """Run `coroutine` to completion from synchronous code (no event loop may be running)."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+    coroutine.close()
+    raise RuntimeError(
+        f"StaticSource.{name}() cannot run inside an event loop (marimo cells, the browser); "
+        f"use `await source.{async_name}(...)` instead"
+    )
+
+
+SOURCES = {
+    YFinanceSource.name: YFinanceSource,
+    AlphaVantageSource.name: AlphaVantageSource,
+    LocalSource.name: LocalSource,
+    StaticSource.name: StaticSource,
+}
+
+
+def open_source(name, **options):
+    """Create the backend registered as `name` ("yfinance", "alphavantage", "local", "static")."""
+    if name not in SOURCES:
+        raise ValueError(f"Unknown source: {name} (choose from {', '.join(SOURCES)})")
+    return SOURCES[name](**options)
@@ -0,0 +1,271 @@
+"""
+Columnar on-disk price store.
+
+The store keeps one typed NumPy array per column instead of a list of JSON
+rows, so it can be memory-mapped from disk or decoded zero-copy from the
+bytes returned by a browser fetch.
+
+File layout (little endian):
+
+    8 bytes   magic  b"MDSTORE1"
+    4 bytes   uint32 header length
+    N bytes   UTF-8 JSON header (row count, column dtypes/offsets, ticker names)
+    ...       column buffers, each aligned to 64 bytes
+
+Rows are sorted by (Ticker, Date), so every ticker occupies one contiguous
+slice of each column.
+"""
+
+import json
+import os
+
+import numpy as np
+
+from .timing import timeline
+
+MAGIC = b"MDSTORE1"
+ALIGNMENT = 64
+
+# Column name -> on-disk dtype. Ticker holds uint16 codes into `tickers`.
+COLUMNS = {
+    "Date": np.dtype("<M8[D]"),
+    "Ticker": np.dtype("<u2"),
+    "Open": np.dtype("<f8"),
+    "High": np.dtype("<f8"),
+    "Low": np.dtype("<f8"),
+    "Close": np.dtype("<f8"),
+    "Volume": np.dtype("<i8"),
+}
+
+PRICE_COLUMNS = ("Open", "High", "Low", "Close")
+
+
+class PriceTable:
+    """Daily OHLCV bars held as parallel NumPy columns sorted by (Ticker, Date)."""
+
+    def __init__(self, columns, tickers):
+        self.columns = columns
+        self.tickers = list(tickers)
+
+    def __len__(self):
+        return len(self.columns["Date"])
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    @classmethod
+    def empty(cls):
+        return cls({name: np.empty(0, dtype=dtype) for name, dtype in COLUMNS.items()}, [])
+
+    @classmethod
+    def from_arrays(cls, dates, tickers, opens, highs, lows, closes, volumes):
+        """Build a sorted table from unsorted row-aligned arrays; tickers are strings."""
+        names, codes = np.unique(np.asarray(tickers, dtype=str), return_inverse=True)
+        with timeline.span("dates", rows=len(codes)):
+            dates = np.asarray(dates, dtype="datetime64[D]")
+        order = np.lexsort((dates, codes))
+        columns = {
+            "Date": dates[order],
+            "Ticker": codes[order].astype(COLUMNS["Ticker"]),
+            "Open": np.asarray(opens, dtype=COLUMNS["Open"])[order],
+            "High": np.asarray(highs, dtype=COLUMNS["High"])[order],
+            "Low": np.asarray(lows, dtype=COLUMNS["Low"])[order],
+            "Close": np.asarray(closes, dtype=COLUMNS["Close"])[order],
+            "Volume": np.asarray(volumes, dtype=COLUMNS["Volume"])[order],
+        }
+        return cls(columns, names.tolist())
+
+    @classmethod
+    def from_records(cls, records):
+        """Build a table from the row dicts written to stock_data.json."""
+        if not records:
+            return cls.empty()
+        return cls.from_arrays(
+            [r["Date"] for r in records],
+            [r["Ticker"] for r in records],
+            [r["Open"] for r in records],
+            [r["High"] for r in records],
+            [r["Low"] for r in records],
+            [r["Close"] for r in records],
+            [r["Volume"] for r in records],
+        )
+
+    @classmethod
+    def from_frame(cls, df):
+        """Build a table from a long DataFrame with Date/Ticker/OHLC/Volume columns."""
+        return cls.from_arrays(
+            df["Date"].to_numpy(dtype="datetime64[D]"),
+            df["Ticker"].astype(str).to_numpy(),
+            df["Open"].to_numpy(),
+            df["High"].to_numpy(),
+            df["Low"].to_numpy(),
+            df["Close"].to_numpy(),
+            df["Volume"].to_numpy(),
+        )
+
+    def take(self, rows):
+        """New table holding the given row positions (kept in store order)."""
+        return PriceTable({name: col[rows] for name, col in self.columns.items()}, self.tickers)
+
+    def ticker_names(self):
+        """Ticker name for every row."""
+        return np.asarray(self.tickers, dtype=object)[self.columns["Ticker"]]
+
+    def to_frame(self):
+        """Long DataFrame in the dashboard schema (categorical Ticker, Price = Close)."""
+        import pandas as pd
+
+        with timeline.span("dates", rows=len(self)):
+            dates = self.columns["Date"].astype("datetime64[ns]")
+        ticker = pd.Categorical.from_codes(self.columns["Ticker"].astype(np.int32), categories=self.tickers)
+        df = pd.DataFrame({
+            "Date": dates,
+            "Ticker": ticker,
+            "Open": self.columns["Open"],
+            "High": self.columns["High"],
+            "Low": self.columns["Low"],
+            "Close": self.columns["Close"],
+            "Volume": self.columns["Volume"],
+        }, copy=False)
+        df["Price"] = df["Close"]
+        return df
+
+    def to_records(self):
+        """Row dicts in the stock_data.json schema, dates descending per ticker."""
+        dates = np.datetime_as_string(self.columns["Date"], unit="D").tolist()
+        codes = self.columns["Ticker"].tolist()
+        opens = self.columns["Open"].tolist()
+        highs = self.columns["High"].tolist()
+        lows = self.columns["Low"].tolist()
+        closes = self.columns["Close"].tolist()
+        volumes = self.columns["Volume"].tolist()
+
+        records = []
+        bounds = np.flatnonzero(np.diff(self.columns["Ticker"])) + 1
+        starts = [0] + bounds.tolist()
+        stops = bounds.tolist() + [len(self)]
+        for start, stop in zip(starts, stops):
+            for i in range(stop - 1, start - 1, -1):
+                records.append({
+                    "Date": dates[i],
+                    "Ticker": self.tickers[codes[i]],
+                    "Open": opens[i],
+                    "High": highs[i],
+                    "Low": lows[i],
+                    "Close": closes[i],
+                    "Volume": volumes[i],
+                    "Price": closes[i],
+                })
+        return records
+
+
+def concat_tables(tables):
+    """Merge tables with possibly different ticker lists into one sorted table."""
+    tables = [t for t in tables if len(t)]
+    if not tables:
+        return PriceTable.empty()
+    if len(tables) == 1:
+        return tables[0]
+    return PriceTable.from_arrays(
+        np.concatenate([t["Date"] for t in tables]),
+        np.concatenate([t.ticker_names() for t in tables]),
+        *(np.concatenate([t[name] for t in tables]) for name in ("Open", "High", "Low", "Close", "Volume")),
+    )
+
+
+def _pad(n):
+    return (-n) % ALIGNMENT
+
+
+def _layout(rows, base):
+    """Absolute offset of every column when column data starts at `base`."""
+    offsets = []
+    offset = base
+    for dtype in COLUMNS.values():
+        offsets.append(offset)
+        offset += rows * dtype.itemsize
+        offset += _pad(offset)
+    return offsets
+
+
+def encode_store(table):
+    """Serialize a PriceTable to bytes in the columnar store layout."""
+    rows = len(table)
+    header = {"version": 1, "rows": rows, "tickers": table.tickers, "columns": []}
+
+    # Offsets are stored in the header, so settle the header length first
+    base = 0
+    while True:
+        header["columns"] = [
+            {"name": name, "dtype": dtype.str, "offset": offset}
+            for (name, dtype), offset in zip(COLUMNS.items(), _layout(rows, base))
+        ]
+        header_bytes = json.dumps(header, separators=(",", ":")).encode("utf-8")
+        prefix = len(MAGIC) + 4 + len(header_bytes)
+        if prefix + _pad(prefix) == base:
+            break
+        base = prefix + _pad(prefix)
+
+    parts = [MAGIC, np.uint32(len(header_bytes)).tobytes(), header_bytes, b"\0" * _pad(prefix)]
+    for name, dtype in COLUMNS.items():
+        data = np.ascontiguousarray(table.columns[name], dtype=dtype).tobytes()
+        parts.append(data)
+        parts.append(b"\0" * _pad(len(data)))
+    return b"".join(parts)
+
+
+def _read_header(buffer):
+    view = memoryview(buffer)
+    if bytes(view[:len(MAGIC)]) != MAGIC:
+        raise ValueError("Not a columnar price store (bad magic)")
+    size = int(np.frombuffer(view[len(MAGIC):len(MAGIC) + 4], dtype="<u4")[0])
+    start = len(MAGIC) + 4
+    return json.loads(bytes(view[start:start + size]).decode("utf-8"))
+
+
+def decode_store(buffer):
+    """Decode store bytes without copying the column data (np.frombuffer views)."""
+    header = _read_header(buffer)
+    rows = header["rows"]
+    columns = {}
+    for col in header["columns"]:
+        columns[col["name"]] = np.frombuffer(buffer, dtype=np.dtype(col["dtype"]), count=rows, offset=col["offset"])
+    return PriceTable(columns, header["tickers"])
+
+
+def write_store(table, path):
+    """Atomically write a PriceTable to `path`."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(encode_store(table))
+    os.replace(tmp, path)
+
+
+def read_store(path, mmap=True):
+    """Read a store file, memory-mapping the columns unless mmap=False."""
+    if not mmap:
+        with open(path, "rb") as f:
+            return decode_store(f.read())
+
+    with open(path, "rb") as f:
+        prefix = f.read(len(MAGIC) + 4)
+        size = int(np.frombuffer(prefix[len(MAGIC):], dtype="<u4")[0]) if len(prefix) == len(MAGIC) + 4 else 0
+        header = _read_header(prefix + f.read(size))
+    rows = header["rows"]
+    columns = {}
+    for col in header["columns"]:
+        dtype = np.dtype(col["dtype"])
+        if rows == 0:
+            columns[col["name"]] = np.empty(0, dtype=dtype)
+        else:
+            columns[col["name"]] = np.memmap(path, dtype=dtype, mode="r", offset=col["offset"], shape=(rows,))
+    return PriceTable(columns, header["tickers"])
+
+
+def export_json(table, path):
+    """Write the table as stock_data.json (row-per-object) for existing consumers."""
+    with open(path, "w") as f:
+        json.dump(table.to_records(), f, indent=2)
@@ -0,0 +1,118 @@
+"""
+Lightweight timing spans for the data pipeline.
+
+Stages record themselves on the process-level `timeline`:
+
+    with timeline.span("metrics", rows=len(data)) as span:
+        metrics = compute(...)
+        span["tickers"] = len(metrics)
+
+Every span holds its stage name, duration, offset from the start of its run
+and any counters passed in (rows, bytes, url, ...). The package records
+fetch, parse, source loads, the period filter ("filter", TickerIndex.select)
+and date conversions ("dates") on its own; the dashboards add their
+frame-building, metrics and chart stages and call begin_run() once per
+interaction, so the "Performance" panel shows the latest run and
+to_json() exports it. Recording a span costs two perf_counter() calls and
+a dict; history is bounded.
+"""
+
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+MAX_SPANS = 2000
+
+
+def rows_of(value):
+    """Row count of a parsed value (PriceTable, TickerIndex, list), or None."""
+    value = getattr(value, "table", value)
+    try:
+        return len(value)
+    except TypeError:
+        return None
+
+
+class Timeline:
+    """Bounded list of timing spans, grouped into runs."""
+
+    def __init__(self, max_spans=MAX_SPANS):
+        self.spans = deque(maxlen=max_spans)
+        self.run = 0
+        self.label = None
+        self._run_start = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def begin_run(self, label=None):
+        """Start a new run (e.g. one widget interaction); later spans belong to it."""
+        with self._lock:
+            self.run += 1
+            self.label = label
+            self._run_start = time.perf_counter()
+
+    def add(self, stage, seconds, started=None, **fields):
+        """Record a finished stage that took `seconds`."""
+        started = time.perf_counter() - seconds if started is None else started
+        span = {
+            "run": self.run,
+            "stage": stage,
+            "start": started - self._run_start,
+            "seconds": seconds,
+            **{k: v for k, v in fields.items() if v is not None},
+        }
+        with self._lock:
+            self.spans.append(span)
+        return span
+
+    @contextmanager
+    def span(self, stage, **fields):
+        """Time the block; fields set on the yielded dict are recorded with it."""
+        extra = dict(fields)
+        started = time.perf_counter()
+        try:
+            yield extra
+        finally:
+            self.add(stage, time.perf_counter() - started, started=started, **extra)
+
+    def latest(self):
+        """Spans of the current run, in the order they finished."""
+        with self._lock:
+            return [s for s in self.spans if s["run"] == self.run]
+
+    def summary(self, spans=None):
+        """Per-stage totals: count, seconds, rows and bytes, slowest stage first."""
+        totals = {}
+        for s in self.latest() if spans is None else spans:
+            t = totals.setdefault(s["stage"], {"stage": s["stage"], "count": 0, "seconds": 0.0, "rows": 0, "bytes": 0})
+            t["count"] += 1
+            t["seconds"] += s["seconds"]
+            t["rows"] += s.get("rows") or 0
+            t["bytes"] += s.get("bytes") or 0
+        return sorted(totals.values(), key=lambda t: -t["seconds"])
+
+    def rows(self, spans=None):
+        """Display rows (milliseconds, counters, detail) for a table of the current run."""
+        return [{
+            "Stage": s["stage"],
+            "Start ms": round(s["start"] * 1000, 1),
+            "ms": round(s["seconds"] * 1000, 1),
+            "Rows": s.get("rows", ""),
+            "Bytes": s.get("bytes", ""),
+            "Detail": s.get("url") or s.get("source") or s.get("detail", ""),
+        } for s in (self.latest() if spans is None else spans)]
+
+    def to_json(self, spans=None):
+        """JSON export of the current run (or the given spans)."""
+        spans = self.latest() if spans is None else spans
+        return json.dumps({"run": self.run, "label": self.label, "spans": spans,
+                           "summary": self.summary(spans)}, indent=2, default=str)
+
+    def clear(self):
+        with self._lock:
+            self.spans.clear()
+
+
+# Shared by the data layer and every notebook cell in the process
+timeline = Timeline()
@@ -0,0 +1,163 @@
+"""
+Materialized views of the price store, built by the collector.
+
+Every dashboard interaction used to repeat the same work in the browser:
+select the period, compute the metrics table and downsample the chart data.
+Those results only change when the store does, so the collector computes
+them once per run for every period option and publishes them next to the
+shards:
+
+    views/metrics_3M.json   {"period": "3M", "start": ..., "end": ...,
+                             "rows": [{"Ticker": "AAPL", "Total Return": ...}, ...]}
+    views/chart_3M.col      chart-ready rows (min/max per pixel bucket) in the
+                            manifest's encoding (chart_3M.mdw for "wire"),
+                            for every ticker
+
+views/headline.json (fixed path, no manifest lookup needed) holds what the
+web dashboard paints first, before pandas and altair are imported: the S&P
+overview numbers, the default tickers' metrics and a short preview series
+per ticker, all readable with the standard library.
+
+Periods end at the last stored market day rather than "now", so the views
+stay meaningful between collector runs. The views are listed in
+manifest.json with their content hash, so a client downloads a view once per
+version and then only selects tickers and renders.
+"""
+
+import json
+import os
+
+import numpy as np
+
+from .downsample import minmax_indices
+from .index import TickerIndex
+from .metrics import METRICS, segment_stats
+from .store import write_store
+from .wire import EXTENSION, write_wire
+
+VIEW_DIR = "views"
+PERIOD_DAYS = {"1M": 30, "3M": 90, "6M": 180, "1Y": 365}
+CHART_WIDTH = 700
+
+# The web dashboard's default selection and period, shown on first paint
+HEADLINE_TICKERS = ("AAPL", "GOOGL", "MSFT", "AMZN")
+HEADLINE_PERIOD = "3M"
+HEADLINE_POINTS = 60
+HEADLINE_FILE = f"{VIEW_DIR}/headline.json"
+
+
+def period_bounds(table, period):
+    """(start, end) datetime64[D] of `period` ending on the table's last market day."""
+    end = table["Date"].max()
+    return end - np.timedelta64(PERIOD_DAYS[period], "D"), end
+
+
+def _segment_starts(codes):
+    if len(codes) == 0:
+        return np.empty(0, dtype=np.intp)
+    return np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+
+
+def _json_number(value):
+    value = float(value)
+    return None if np.isnan(value) else value
+
+
+def metrics_view(table, period, min_days=2):
+    """JSON payload with one metrics row (see metrics.METRICS) per ticker over `period`."""
+    start, end = period_bounds(table, period)
+    selected = TickerIndex(table).select(table.tickers, start, end)
+    starts = _segment_starts(selected["Ticker"])
+    rows = []
+    if len(starts):
+        stats = segment_stats(selected["Close"], starts, selected["Volume"])
+        values = {name: metric(stats) for name, metric in METRICS.items()}
+        names = [selected.tickers[c] for c in selected["Ticker"][starts]]
+        for i, ticker in enumerate(names):
+            if stats["count"][i] >= min_days:
+                rows.append({"Ticker": ticker, **{name: _json_number(v[i]) for name, v in values.items()}})
+    return {"period": period, "start": str(start), "end": str(end), "rows": rows}
+
+
+def chart_view(table, period, width=CHART_WIDTH):
+    """
+    Store-format table of `period`, downsampled to about `width` rows per ticker.
+
+    Uses the same min/max buckets as downsample_long(), so the dashboard can
+    chart any selection of it as is.
+    """
+    start, end = period_bounds(table, period)
+    selected = TickerIndex(table).select(table.tickers, start, end)
+    starts = _segment_starts(selected["Ticker"])
+    counts = np.diff(np.append(starts, len(selected)))
+    if len(counts) == 0 or counts.max() <= width:
+        return selected
+    return selected.take(minmax_indices(selected["Close"], starts, max(1, width // 2)))
+
+
+def headline_view(table, market_overview=None, tickers=HEADLINE_TICKERS, period=HEADLINE_PERIOD,
+                  points=HEADLINE_POINTS):
+    """
+    First-paint payload: market overview numbers, then metrics and about
+    `points` evenly spaced closes over `period` for each of `tickers` present.
+    """
+    metrics = {row["Ticker"]: row for row in metrics_view(table, period)["rows"]}
+    start, end = period_bounds(table, period)
+    present = [t for t in tickers if t in metrics]
+    selected = TickerIndex(table).select(present, start, end)
+
+    slices = TickerIndex(selected).slices
+    rows = []
+    for ticker in present:
+        lo, hi = slices[ticker]
+        row = metrics[ticker]
+        closes = selected["Close"][lo:hi]
+        step = np.unique(np.linspace(0, len(closes) - 1, min(points, len(closes))).round().astype(np.intp))
+        rows.append({
+            "Ticker": ticker,
+            "Current Price": row["Current Price"],
+            "Total Return": row["Total Return"],
+            "Volatility": row["Volatility"],
+            "closes": np.round(closes[step], 2).tolist(),
+        })
+
+    market = None
+    if market_overview is not None:
+        market = {k: market_overview[k] for k in ("current_price", "change", "change_pct")}
+    return {"period": period, "start": str(start), "end": str(end), "market": market, "rows": rows}
+
+
+def view_path(kind, period, extension=".col"):
+    if kind == "metrics":
+        extension = ".json"
+    return f"{VIEW_DIR}/{kind}_{period}{extension}"
+
+
+def write_views(table, data_dir, width=CHART_WIDTH, encoding="store", market_overview=None):
+    """
+    Write the metrics and chart views of every period under data_dir/views,
+    chart views in `encoding` (see write_shards()), and the headline view.
+
+    Returns {view name: path relative to data_dir} for the manifest.
+    """
+    os.makedirs(os.path.join(data_dir, VIEW_DIR), exist_ok=True)
+    views = {}
+    for period in PERIOD_DAYS:
+        relative = view_path("metrics", period)
+        with open(os.path.join(data_dir, relative), "w") as f:
+            json.dump(metrics_view(table, period), f, separators=(",", ":"))
+        views[f"metrics_{period}"] = relative
+
+        chart = chart_view(table, period, width)
+        if encoding == "wire":
+            relative = view_path("chart", period, EXTENSION)
+            write_wire(chart, os.path.join(data_dir, relative))
+        else:
+            relative = view_path("chart", period)
+            write_store(chart, os.path.join(data_dir, relative))
+        views[f"chart_{period}"] = relative
+
+    with open(os.path.join(data_dir, HEADLINE_FILE), "w") as f:
+        json.dump(headline_view(table, market_overview), f, separators=(",", ":"))
+    views["headline"] = HEADLINE_FILE
+    return views
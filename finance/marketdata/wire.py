@@ -0,0 +1,183 @@
+"""
+Compact wire encoding of a PriceTable for the published data files.
+
+The store format (store.py) is built for memory-mapping: fixed 8-byte
+columns, 64-byte aligned. Over the network most of those bytes are
+redundant, so the files the web dashboard downloads use a smaller layout
+(little endian):
+
+    8 bytes   magic  b"MDWIRE01"
+    4 bytes   uint32 header length
+    N bytes   UTF-8 JSON header: rows, tickers + row count per ticker (the
+              dictionary-encoded Ticker column), first date, price scale,
+              column dtypes
+    ...       column buffers, back to back
+
+    Date      day deltas from the previous row (from `base` for the first)
+    Close     deltas of integer price units (cents unless the data has more
+              decimals) from the previous row
+    Open/High/Low
+              integer units relative to the same row's Close
+    Volume    deltas from the previous row
+
+Every column is stored in the narrowest signed integer type that holds it,
+which is usually int8/int16 for dates and prices. Deltas run across ticker
+boundaries, so decoding is one cumulative sum per column. Files are
+published with gzip (.gz) and, if the `brotli` package is installed, brotli
+(.br) variants; parse_wire() accepts raw or gzipped bytes.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from .store import COLUMNS, PRICE_COLUMNS, PriceTable
+
+MAGIC = b"MDWIRE01"
+EXTENSION = ".mdw"
+VARIANTS = (".gz", ".br")
+
+# Price scales tried in order; prices with more decimals than the last are rounded
+PRICE_DECIMALS = (2, 3, 4)
+
+
+def _narrowest(values):
+    for dtype in ("<i1", "<i2", "<i4"):
+        info = np.iinfo(dtype)
+        if values.min() >= info.min and values.max() <= info.max:
+            return values.astype(dtype)
+    return values.astype("<i8")
+
+
+def price_scale(table):
+    """Smallest power of ten (cents first) that makes every price an integer."""
+    prices = np.concatenate([np.asarray(table[name], dtype=np.float64) for name in PRICE_COLUMNS])
+    for decimals in PRICE_DECIMALS:
+        scaled = prices * 10 ** decimals
+        if np.allclose(scaled, np.round(scaled), rtol=0, atol=1e-6):
+            break
+    return 10 ** decimals
+
+
+def encode_wire(table):
+    """Serialize a PriceTable to bytes in the wire layout."""
+    rows = len(table)
+    header = {
+        "version": 1,
+        "rows": rows,
+        "tickers": table.tickers,
+        "counts": np.bincount(table["Ticker"], minlength=len(table.tickers)).tolist() if rows else [],
+        "base": str(table["Date"][0]) if rows else None,
+        "scale": price_scale(table) if rows else 100,
+        "columns": [],
+    }
+    columns = {}
+    if rows:
+        scale = header["scale"]
+        days = table["Date"].astype(np.int64)
+        columns["Date"] = np.diff(days, prepend=days[0])
+        close = np.round(np.asarray(table["Close"], dtype=np.float64) * scale).astype(np.int64)
+        columns["Close"] = np.diff(close, prepend=0)
+        for name in ("Open", "High", "Low"):
+            columns[name] = np.round(np.asarray(table[name], dtype=np.float64) * scale).astype(np.int64) - close
+        columns["Volume"] = np.diff(np.asarray(table["Volume"], dtype=np.int64), prepend=0)
+        columns = {name: _narrowest(values) for name, values in columns.items()}
+
+    parts = []
+    for name, values in columns.items():
+        header["columns"].append({"name": name, "dtype": values.dtype.str})
+        parts.append(values.tobytes())
+    header_bytes = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    return b"".join([MAGIC, np.uint32(len(header_bytes)).tobytes(), header_bytes, *parts])
+
+
+def decode_wire(buffer):
+    """Decode wire bytes back into a PriceTable (one cumulative sum per column)."""
+    view = memoryview(buffer)
+    if bytes(view[:len(MAGIC)]) != MAGIC:
+        raise ValueError("Not a wire-encoded price table (bad magic)")
+    size = int(np.frombuffer(view[len(MAGIC):len(MAGIC) + 4], dtype="<u4")[0])
+    offset = len(MAGIC) + 4
+    header = json.loads(bytes(view[offset:offset + size]).decode("utf-8"))
+    offset += size
+
+    rows = header["rows"]
+    if rows == 0:
+        return PriceTable({name: np.empty(0, dtype=dtype) for name, dtype in COLUMNS.items()}, header["tickers"])
+    raw = {}
+    for col in header["columns"]:
+        dtype = np.dtype(col["dtype"])
+        raw[col["name"]] = np.frombuffer(buffer, dtype=dtype, count=rows, offset=offset)
+        offset += rows * dtype.itemsize
+
+    scale = header["scale"]
+    close = np.cumsum(raw["Close"], dtype=np.int64)
+    columns = {
+        "Date": (np.datetime64(header["base"], "D").astype(np.int64)
+                 + np.cumsum(raw["Date"], dtype=np.int64)).astype(COLUMNS["Date"]),
+        "Ticker": np.repeat(np.arange(len(header["tickers"]), dtype=COLUMNS["Ticker"]), header["counts"]),
+    }
+    for name in ("Open", "High", "Low"):
+        columns[name] = (close + raw[name]) / scale
+    columns["Close"] = close / scale
+    columns["Volume"] = np.cumsum(raw["Volume"], dtype=np.int64)
+    return PriceTable(columns, header["tickers"])
+
+
+def decompress(body):
+    """Raw wire bytes from a raw or gzipped body."""
+    if bytes(body[:2]) == b"\x1f\x8b":
+        return gzip.decompress(body)
+    return body
+
+
+def compressed_variants(data):
+    """{suffix: bytes} of the precompressed copies published next to a file."""
+    variants = {".gz": gzip.compress(data, compresslevel=9, mtime=0)}
+    try:
+        import brotli
+    except ImportError:
+        return variants
+    variants[".br"] = brotli.compress(data, quality=11)
+    return variants
+
+
+def write_variants(data, path):
+    """
+    Write `data` to `path` plus its .gz/.br variants, each atomically.
+
+    Files whose content is unchanged are left alone. Returns the sha256 of `data`.
+    """
+    digest = hashlib.sha256(data).hexdigest()
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    if _read(path) != data:
+        _write(path, data)
+    for suffix, compressed in compressed_variants(data).items():
+        if _read(path + suffix) != compressed:
+            _write(path + suffix, compressed)
+    return digest
+
+
+def write_wire(table, path):
+    """Encode `table` and write it with its compressed variants; returns the sha256."""
+    return write_variants(encode_wire(table), path)
+
+
+def _read(path):
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def _write(path, data):
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
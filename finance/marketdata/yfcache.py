@@ -0,0 +1,207 @@
+"""
+Persistent on-disk cache with delta fetching for yfinance downloads.
+
+Each ticker's daily bars live in `<cache_dir>/<TICKER>.col` (the columnar
+store format), and `coverage.json` records the date range each ticker has
+been fetched for plus when it was last fetched. A request for
+(tickers, period) then downloads only:
+
+- tickers that were never fetched,
+- the part of the period before a ticker's cached range, and
+- the days since the cached range ended; the current day is refetched only
+  once its TTL has expired, since today's bar changes during the session.
+
+Both delta ranges overlap one cached bar (they run up to the first / from
+the last bar held), so a working download always returns bars for the
+ticker, even for a range of weekends and holidays. A ticker without bars
+in the response therefore counts as a failed download: its coverage is
+left unchanged and the next request tries again.
+
+Tickers missing the same range are downloaded together in one yf.download
+call, and repeat requests make no network calls at all. The dashboards use
+this through sources.YFinanceSource.
+"""
+
+import json
+import os
+import threading
+import time
+from datetime import date, timedelta
+
+import numpy as np
+
+from .cache import cache, file_validator
+from .index import TickerIndex
+from .reshape import table_to_wide, wide_to_table
+from .store import PriceTable, concat_tables, read_store, write_store
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "marketdata", "yfinance")
+
+# Calendar days covered by each yfinance period string
+PERIOD_DAYS = {"1mo": 31, "3mo": 92, "6mo": 183, "1y": 366, "2y": 731, "5y": 1827}
+
+# Seconds before today's (still changing) bar is refetched
+TODAY_TTL = 15 * 60
+
+
+def period_start(period, today=None):
+    today = today or date.today()
+    return today - timedelta(days=PERIOD_DAYS[period])
+
+
+def upsert(existing, new):
+    """Merge `new` into `existing`; rows of `new` replace same (Ticker, Date) rows."""
+    if not len(new):
+        return existing
+    if not len(existing):
+        return new
+    combined = concat_tables([new, existing])
+    # concat_tables sorts stably with `new` first, so the first of each key wins
+    codes = combined["Ticker"]
+    dates = combined["Date"]
+    first = np.r_[True, (codes[1:] != codes[:-1]) | (dates[1:] != dates[:-1])]
+    return combined.take(np.flatnonzero(first))
+
+
+class YFinanceCache:
+    """Delta-fetching cache in front of `yf.download`."""
+
+    def __init__(self, cache_dir=None, download=None, ttl=TODAY_TTL, clock=time.time):
+        self.cache_dir = cache_dir or os.environ.get("MARKETDATA_CACHE_DIR", DEFAULT_CACHE_DIR)
+        self._download = download
+        self.ttl = ttl
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.network_calls = 0
+
+    # -- storage -----------------------------------------------------------
+
+    def _path(self, ticker):
+        return os.path.join(self.cache_dir, f"{ticker}.col")
+
+    def _coverage_path(self):
+        return os.path.join(self.cache_dir, "coverage.json")
+
+    def coverage(self):
+        try:
+            with open(self._coverage_path()) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def version(self):
+        """Validator of the cached data: coverage.json is rewritten after every save()."""
+        try:
+            return file_validator(self._coverage_path())
+        except FileNotFoundError:
+            return None
+
+    def _save_coverage(self, coverage):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp = self._coverage_path() + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(coverage, f, indent=2, sort_keys=True)
+        os.replace(tmp, self._coverage_path())
+
+    def load(self, ticker):
+        """Cached bars for one ticker (memory-mapped, parsed once per file version)."""
+        path = self._path(ticker)
+        if not os.path.exists(path):
+            return PriceTable.empty()
+        return cache.get(("yfcache", path), file_validator(path), lambda: read_store(path))
+
+    # -- planning ----------------------------------------------------------
+
+    def missing_ranges(self, tickers, start, end):
+        """(start, end) ranges to download per ticker; `end` is inclusive."""
+        coverage = self.coverage()
+        now = self.clock()
+        plan = {}
+        for ticker in tickers:
+            entry = coverage.get(ticker)
+            if entry is None:
+                plan[ticker] = [(start, end)]
+                continue
+            c_start = date.fromisoformat(entry["start"])
+            c_end = date.fromisoformat(entry["end"])
+            first_bar = date.fromisoformat(entry.get("first_bar", entry["start"]))
+            last_bar = date.fromisoformat(entry.get("last_bar", entry["end"]))
+            ranges = []
+            if start < c_start:
+                ranges.append((start, first_bar))
+            stale = end >= date.today() and now - entry["fetched_at"] > self.ttl
+            if c_end < end or stale:
+                # Refetch from the last bar: it may have been partial
+                ranges.append((last_bar, end))
+            if ranges:
+                plan[ticker] = ranges
+        return plan
+
+    # -- fetching ----------------------------------------------------------
+
+    def _yf_download(self, tickers, start, end):
+        download = self._download
+        if download is None:
+            import yfinance as yf
+
+            download = yf.download
+        self.network_calls += 1
+        # yfinance's `end` is exclusive
+        return download(tickers, start=start.isoformat(), end=(end + timedelta(days=1)).isoformat(), progress=False)
+
+    def save(self, table, ranges):
+        """
+        Merge downloaded bars into the cache.
+
+        `ranges` maps each requested ticker to the (start, end) range it was
+        downloaded for. Coverage is extended only for tickers that got bars:
+        an empty result is what yf.download returns when it fails.
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        coverage = self.coverage()
+        now = self.clock()
+        for ticker, (lo, hi) in TickerIndex(table).slices.items():
+            if ticker not in ranges or hi == lo:
+                continue
+            bars = upsert(self.load(ticker), table.take(np.arange(lo, hi)))
+            write_store(bars, self._path(ticker))
+
+            r_start, r_end = ranges[ticker]
+            entry = coverage.get(ticker)
+            coverage[ticker] = {
+                "start": min(r_start.isoformat(), entry["start"]) if entry else r_start.isoformat(),
+                "end": max(r_end.isoformat(), entry["end"]) if entry else r_end.isoformat(),
+                "first_bar": str(bars["Date"][0]),
+                "last_bar": str(bars["Date"][-1]),
+                "fetched_at": now,
+            }
+        self._save_coverage(coverage)
+
+    def fetch(self, tickers, start, end):
+        """Download `tickers` for [start, end] in one call and return a PriceTable."""
+        data = self._yf_download(list(tickers), start, end)
+        return wide_to_table(data, list(tickers)) if not data.empty else PriceTable.empty()
+
+    def table(self, tickers, start, end=None):
+        """PriceTable of `tickers` for [start, end] (default: today), topping up the cache first."""
+        end = end or date.today()
+        with self.lock:
+            plan = self.missing_ranges(tickers, start, end)
+
+            # One download per distinct range, covering every ticker that needs it
+            groups = {}
+            for ticker, ranges in plan.items():
+                for r in ranges:
+                    groups.setdefault(r, []).append(ticker)
+            for r, group in groups.items():
+                self.save(self.fetch(group, *r), {ticker: r for ticker in group})
+
+        return TickerIndex(concat_tables([self.load(t) for t in tickers])).select(tickers, start, end)
+
+    def download(self, tickers, period):
+        """
+        Wide (Field, Ticker) frame like `yf.download(tickers, period=period)`,
+        served from the cache and topped up with delta downloads.
+        """
+        table = self.table(tickers, period_start(period))
+        return table_to_wide(table, [t for t in tickers if t in table.tickers])
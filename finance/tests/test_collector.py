@@ -0,0 +1,174 @@
+import json
+import random
+from datetime import date, timedelta
+from urllib.parse import urlencode
+
+import numpy as np
+import pytest
+
+from benchmarks.standin import AV_DAILY, AV_NOTE, StandIn, StandInServer, get
+from marketdata import collector
+from marketdata.alphavantage import API_URL, fetch_alpha_vantage_data, parse_time_series
+from marketdata.scheduler import DailyBudget, RetryableError, RetryPolicy, Scheduler, StopScheduling, TokenBucket
+from marketdata.sources import AlphaVantageSource
+
+UNIVERSE = {symbol: (f"{symbol} Inc", "Information Technology") for symbol in ("AAA", "BBB", "CCC", "DDD")}
+
+
+class ScriptedStandIn(StandIn):
+    """Stand-in whose Alpha Vantage answers start with a scripted (status, body) list per symbol."""
+
+    def __init__(self, **options):
+        super().__init__(universe=UNIVERSE, **options)
+        self.script = {}
+
+    def _alpha_vantage(self, query):
+        queued = self.script.get(query.get("symbol", "").upper())
+        if queued:
+            return queued.pop(0)
+        return super()._alpha_vantage(query)
+
+
+def urllib_fetch(symbol, api_key, outputsize="compact", api_url=API_URL):
+    """fetch_alpha_vantage_data() on the standard library (same classification of responses)."""
+    query = urlencode({"function": "TIME_SERIES_DAILY", "symbol": symbol, "outputsize": outputsize, "apikey": api_key})
+    status, body = get(f"{api_url}?{query}")
+    if status == 429 or status >= 500:
+        raise RetryableError(f"HTTP {status} for {symbol}")
+    if status != 200:
+        return None
+    return parse_time_series(symbol, json.loads(body))
+
+
+@pytest.fixture(params=["requests", "urllib"])
+def fetch(request):
+    if request.param == "requests":
+        pytest.importorskip("requests")
+        return fetch_alpha_vantage_data
+    return urllib_fetch
+
+
+@pytest.fixture
+def standin():
+    return ScriptedStandIn(end=date.today())
+
+
+@pytest.fixture
+def server(standin):
+    with StandInServer(standin) as server:
+        yield server
+
+
+def make_scheduler(limit=100, attempts=3):
+    # One worker keeps the request order (and so the daily-quota cut-off) deterministic
+    retry = RetryPolicy(attempts=attempts, base_delay=0.0, rng=random.Random(0))
+    return Scheduler(TokenBucket(6000, per=60.0), DailyBudget(limit), retry, workers=1, sleep=lambda s: None)
+
+
+def run(server, fetch, tickers, data_dir, scheduler=None):
+    source = AlphaVantageSource("test", api_url=f"{server.url}/query", fetch=fetch)
+    return collector.collect(tickers, source, str(data_dir), scheduler or make_scheduler())
+
+
+def test_collect_backfills_new_tickers(fetch, server, tmp_path):
+    result = run(server, fetch, ["AAA", "BBB"], tmp_path)
+    assert result["successful"] == ["AAA", "BBB"]
+    table = result["table"]
+    assert table.tickers == ["AAA", "BBB"]
+    # Full history for tickers the store has never seen
+    assert len(table) == result["rows_added"] > 2 * 100
+    assert result["calls_used"] == 2
+
+
+@pytest.mark.parametrize("fault", [
+    (200, {"Note": AV_NOTE}),
+    (429, {"error": "Too Many Requests"}),
+    (503, {"error": "Service Unavailable"}),
+])
+def test_collect_retries_rate_limits_and_server_errors(fetch, server, standin, tmp_path, fault):
+    standin.script["AAA"] = [fault, fault]
+    result = run(server, fetch, ["AAA", "BBB"], tmp_path)
+    assert result["successful"] == ["AAA", "BBB"]
+    assert result["calls_used"] == 4
+    assert standin.snapshot()["requests"] == 4
+
+
+def test_collect_gives_up_after_the_retry_limit(fetch, server, standin, tmp_path):
+    standin.script["AAA"] = [(503, {"error": "Service Unavailable"})] * 3
+    result = run(server, fetch, ["AAA", "BBB"], tmp_path)
+    assert result["successful"] == ["BBB"]
+    assert result["table"].tickers == ["BBB"]
+
+
+def test_unknown_symbols_are_not_retried(fetch, server, standin, tmp_path):
+    result = run(server, fetch, ["ZZZZ", "AAA"], tmp_path)
+    assert result["successful"] == ["AAA"]
+    assert standin.snapshot()["requests"] == 2
+
+
+def test_daily_quota_message_stops_the_run(fetch, server, standin, tmp_path):
+    standin.script["CCC"] = [(200, {"Information": AV_DAILY})]
+    result = run(server, fetch, ["AAA", "BBB", "CCC", "DDD"], tmp_path)
+    assert result["successful"] == ["AAA", "BBB"]
+    # DDD is never requested once the quota is reported
+    assert standin.snapshot()["requests"] == 3
+
+
+def test_provider_per_day_limit_stops_the_run(fetch, tmp_path):
+    with StandInServer(ScriptedStandIn(end=date.today(), per_day=2)) as server:
+        result = run(server, fetch, ["AAA", "BBB", "CCC", "DDD"], tmp_path)
+        assert result["successful"] == ["AAA", "BBB"]
+        assert server.standin.snapshot()["requests"] == 3
+
+
+def test_client_budget_caps_calls(fetch, server, standin, tmp_path):
+    result = run(server, fetch, ["AAA", "BBB", "CCC"], tmp_path, make_scheduler(limit=2))
+    assert result["successful"] == ["AAA", "BBB"]
+    assert result["calls_used"] == 2
+    assert standin.snapshot()["requests"] == 2
+
+
+def test_second_run_only_adds_new_days(fetch, server, standin, tmp_path):
+    first = run(server, fetch, ["AAA"], tmp_path)
+    collector.write_outputs(first["table"], str(tmp_path), added=first["added"], export=False)
+    assert collector.load_existing(str(tmp_path)).tickers == ["AAA"]
+
+    # The provider has one more day; the collector asks for the compact window only
+    standin.end = date.today() + timedelta(days=7)
+    second = run(server, fetch, ["AAA"], tmp_path)
+    assert 0 < second["rows_added"] <= 5
+    dates = second["table"]["Date"]
+    assert len(np.unique(dates)) == len(dates)
+    assert len(second["table"]) == len(first["table"]) + second["rows_added"]
+
+
+@pytest.fixture
+def run_main(fetch, server, monkeypatch, tmp_path):
+    monkeypatch.setenv("ALPHA_VANTAGE_API_KEY", "test")
+    monkeypatch.setattr(collector, "AlphaVantageSource",
+                        lambda key, api_url: AlphaVantageSource(key, api_url=api_url, fetch=fetch))
+    return lambda *args: collector.main(["--data-dir", str(tmp_path), "--universe", "",
+                                         "--api-url", f"{server.url}/query", "--no-json-export", *args])
+
+
+def test_main_writes_outputs_without_the_market_ticker(run_main, tmp_path):
+    # SPY is not in this run: the overview is skipped, the bars are still published
+    assert run_main("--tickers", "AAA,BBB") == 0
+    assert collector.load_existing(str(tmp_path)).tickers == ["AAA", "BBB"]
+    assert (tmp_path / "views" / "headline.json").exists()
+    assert not (tmp_path / "market_overview.json").exists()
+    state = collector.load_state(str(tmp_path))
+    assert sorted(state["last_fetched"]) == ["AAA", "BBB"]
+    assert state["budget"]["used"] == 2
+
+
+def test_main_keeps_rotation_when_writing_fails(run_main, monkeypatch, tmp_path):
+    def fail(*args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(collector, "write_outputs", fail)
+    with pytest.raises(OSError):
+        run_main("--tickers", "AAA")
+    state = collector.load_state(str(tmp_path))
+    assert state["budget"]["used"] == 1
+    assert state["last_fetched"] == {}
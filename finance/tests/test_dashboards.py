@@ -0,0 +1,55 @@
+import os
+
+import marimo as mo
+import pytest
+
+import finance_dashboard_web
+from benchmarks.suite import desktop_notebook, web_notebook, widgets, working_directory
+from benchmarks.synthetic import recent_table
+from marketdata.collector import write_outputs
+from marketdata.store import write_store
+
+
+@pytest.fixture(scope="module")
+def data_dir(tmp_path_factory):
+    root = tmp_path_factory.mktemp("dashboards")
+    table = recent_table(4, 100)
+    write_outputs(table, str(root / "data"), export=False)
+    write_store(table, str(root / "data" / "stock_data.col"))
+    with open(root / "data" / "last_updated.json", "w") as f:
+        f.write('{"last_updated": "synthetic"}')
+    return root
+
+
+@pytest.mark.parametrize("tickers", [[], ["NOPE"]], ids=["empty", "unknown"])
+def test_desktop_without_data(data_dir, tickers):
+    # Every cell runs (a failing cell raises), down to the Performance panel
+    defs = desktop_notebook(os.path.join(data_dir, "data"), tickers)
+    assert defs["stock_data"].empty
+    assert defs["selected_aligned"] is None
+    assert "performance" in defs
+
+
+@pytest.mark.parametrize("tickers", [[], ["NOPE"]], ids=["empty", "unknown"])
+def test_web_without_data(data_dir, tickers):
+    with working_directory(data_dir):
+        defs = web_notebook(tickers)
+    assert defs["stock_data"].empty
+    assert "performance" in defs
+
+
+def test_web_paints_from_the_views_alone(data_dir):
+    with working_directory(data_dir):
+        defs = web_notebook(["T000", "T001"])
+    assert not defs["stock_data"].empty
+    assert defs["price_source"].stats["calls"] == 0
+    assert not len(defs["price_table"])
+
+
+def test_web_candlesticks_load_the_daily_bars(data_dir):
+    candlestick = mo.ui.dropdown(options=["line", "area", "candlestick"], value="candlestick")
+    with working_directory(data_dir):
+        _, defs = finance_dashboard_web.app.run(defs={**widgets(["T000", "T001"], "1Y"), "chart_type": candlestick})
+    assert defs["price_source"].stats["calls"] == 1
+    assert defs["price_table"].ticker_names().tolist()[:1] == ["T000"]
+    assert "candles" in defs["price_chart"].text
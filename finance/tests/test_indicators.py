@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from marketdata.indicators import INDICATORS, Indicator, IndicatorEngine
+
+
+@pytest.fixture
+def bars():
+    rng = np.random.default_rng(3)
+    dates = np.arange("2025-01-01", "2025-06-01", dtype="datetime64[D]")
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, len(dates))))
+    return dates, close
+
+
+def assert_outputs(actual, expected):
+    assert actual.keys() == expected.keys()
+    for name in expected:
+        np.testing.assert_allclose(actual[name], expected[name], rtol=1e-9, equal_nan=True)
+
+
+@pytest.mark.parametrize("name", sorted(INDICATORS))
+def test_appended_bars_extend_the_cached_series(bars, name):
+    dates, close = bars
+    indicator = INDICATORS[name]()
+    engine = IndicatorEngine()
+    engine.series("T", dates[:-5], close[:-5], indicator)
+    outputs = engine.series("T", dates, close, indicator)
+    assert (engine.computed, engine.extended) == (1, 1)
+    assert_outputs(outputs, indicator.compute(close)[0])
+    assert engine.series("T", dates, close, indicator) is outputs
+
+
+@pytest.mark.parametrize("name", sorted(INDICATORS))
+def test_revised_closes_are_recomputed(bars, name):
+    dates, close = bars
+    indicator = INDICATORS[name]()
+    engine = IndicatorEngine()
+    engine.series("T", dates, close, indicator)
+
+    # The last bar refetched with a corrected close, same dates
+    revised = close.copy()
+    revised[-1] -= 5
+    assert_outputs(engine.series("T", dates, revised, indicator), indicator.compute(revised)[0])
+
+    # A revised bar followed by a new day
+    revised[-10] += 3
+    longer = np.r_[revised, revised[-1] + 1]
+    outputs = engine.series("T", np.r_[dates, dates[-1] + 1], longer, indicator)
+    assert_outputs(outputs, indicator.compute(longer)[0])
+    assert (engine.computed, engine.extended) == (3, 0)
+
+
+def test_cached_bars_are_a_copy(bars):
+    dates, close = bars
+    indicator = INDICATORS["sma"](20)
+    engine = IndicatorEngine()
+    engine.series("T", dates, close, indicator)
+    close[-1] += 10  # the caller's buffer is reused for the revised data
+    assert_outputs(engine.series("T", dates, close, indicator), indicator.compute(close)[0])
+
+
+def test_indicators_must_implement_compute_and_step():
+    class ComputeOnly(Indicator):
+        name = "compute_only"
+
+        def compute(self, close):
+            return {}, None
+
+    with pytest.raises(TypeError, match="step"):
+        ComputeOnly()
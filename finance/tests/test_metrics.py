@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+
+from marketdata.metrics import metrics_from_wide
+
+
+def test_average_volume_skips_missing_volumes():
+    dates = pd.date_range("2025-01-01", periods=4)
+    close = pd.DataFrame({"A": [1.0, 2.0, 3.0, 4.0], "B": [1.0, np.nan, 2.0, 3.0]}, index=dates)
+    volume = pd.DataFrame({"A": [100.0, np.nan, 300.0, np.nan], "B": [np.nan] * 4}, index=dates)
+    metrics = metrics_from_wide(close, volume).set_index("Ticker")
+    assert metrics.loc["A", "Avg Daily Volume"] == 200.0
+    assert np.isnan(metrics.loc["B", "Avg Daily Volume"])
+
+
+def test_wide_metrics_match_pandas():
+    rng = np.random.default_rng(0)
+    dates = pd.date_range("2025-01-01", periods=60)
+    close = pd.DataFrame(100 * np.cumprod(1 + rng.normal(0, 0.01, (60, 3)), axis=0), index=dates, columns=list("ABC"))
+    close.iloc[[5, 17], 1] = np.nan
+    metrics = metrics_from_wide(close).set_index("Ticker")
+    for ticker in close:
+        prices = close[ticker].dropna()
+        volatility = prices.pct_change().std() * np.sqrt(252) * 100
+        assert np.isclose(metrics.loc[ticker, "Volatility"], volatility)
+        assert np.isclose(metrics.loc[ticker, "Total Return"], (prices.iloc[-1] / prices.iloc[0] - 1) * 100)
+
+
+def test_wide_metrics_without_prices():
+    dates = pd.date_range("2025-01-01", periods=3)
+    close = pd.DataFrame({"A": [np.nan] * 3, "B": [np.nan] * 3}, index=dates)
+    for metrics in (metrics_from_wide(close), metrics_from_wide(close, close), metrics_from_wide(close.iloc[:0])):
+        assert metrics.empty
+        assert list(metrics.columns)[:2] == ["Ticker", "Current Price"]
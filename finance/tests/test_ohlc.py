@@ -0,0 +1,98 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from benchmarks.synthetic import synthetic_table
+from marketdata.collector import merge_bars, write_outputs
+from marketdata.ohlc import extend_aggregate, resample
+from marketdata.sources import LocalSource, StaticSource
+from marketdata.store import concat_tables, write_store
+
+
+def assert_same_table(a, b):
+    assert a.tickers == b.tickers
+    assert len(a) == len(b)
+    for name in ("Date", "Ticker", "Open", "High", "Low", "Close", "Volume"):
+        np.testing.assert_array_equal(a[name], b[name])
+
+
+def split(table, day):
+    """(rows before `day`, rows from `day` on)."""
+    before = table["Date"] < np.datetime64(day)
+    return table.take(np.flatnonzero(before)), table.take(np.flatnonzero(~before))
+
+
+@pytest.mark.parametrize("resolution", ["weekly", "monthly"])
+def test_resample_matches_pandas(resolution):
+    table = synthetic_table(3, 90)
+    frame = table.to_frame().set_index("Date")
+    rule = "W-SUN" if resolution == "weekly" else "MS"
+    bars = resample(table, resolution).to_frame()
+    for ticker, group in frame.groupby("Ticker", observed=True):
+        expected = group.resample(rule).agg({"Open": "first", "High": "max", "Low": "min", "Close": "last",
+                                             "Volume": "sum"}).dropna()
+        got = bars[bars["Ticker"] == ticker]
+        np.testing.assert_allclose(got[["Open", "High", "Low", "Close", "Volume"]].to_numpy(dtype=float),
+                                   expected.to_numpy(dtype=float))
+
+
+@pytest.mark.parametrize("resolution", ["weekly", "monthly"])
+@pytest.mark.parametrize("cut", ["2015-03-04", "2015-03-30", "2015-04-01", "2015-04-06"])
+def test_extend_aggregate_equals_full_rebuild(resolution, cut):
+    daily = synthetic_table(4, 80)
+    existing, new = split(daily, cut)
+    # One ticker only appears in the new rows
+    existing = existing.take(np.flatnonzero(existing.ticker_names() != "T003"))
+    merged, added = merge_bars(existing, new)
+    extended = extend_aggregate(resample(existing, resolution), merged, added, resolution)
+    assert_same_table(extended, resample(merged, resolution))
+
+
+def test_extend_aggregate_without_new_rows_is_unchanged():
+    daily = synthetic_table(2, 30)
+    aggregate = resample(daily, "weekly")
+    assert extend_aggregate(aggregate, daily, daily.take(np.empty(0, dtype=np.intp)), "weekly") is aggregate
+
+
+def test_collector_aggregates_stay_equal_to_a_rebuild(tmp_path):
+    daily = synthetic_table(3, 120)
+    first, rest = split(daily, "2015-04-15")
+    write_outputs(first, str(tmp_path), export=False)
+    merged, added = merge_bars(first, rest)
+    write_outputs(merged, str(tmp_path), added=added, export=False, store=True)
+
+    source = LocalSource(str(tmp_path / "stock_data.col"))
+    for resolution in ("weekly", "monthly"):
+        assert_same_table(source.aggregate(merged.tickers, resolution), resample(merged, resolution))
+
+
+def test_sources_read_the_precomputed_aggregates(tmp_path):
+    daily = synthetic_table(3, 60)
+    write_outputs(daily, str(tmp_path), export=False, store=True)
+    # Mark the published weekly bars, so reading them is told apart from resampling
+    weekly = resample(daily, "weekly")
+    weekly.columns["Volume"] = weekly["Volume"] + 1
+    write_store(weekly, str(tmp_path / "ohlc_weekly.col"))
+
+    tickers = ["T000", "T002"]
+    start = np.datetime64("2015-02-02")
+    expected = weekly.take(np.flatnonzero(np.isin(weekly.ticker_names(), tickers) & (weekly["Date"] >= start)))
+    local = LocalSource(str(tmp_path / "stock_data.col")).aggregate(tickers, "weekly", start=start)
+    assert_same_table(local, expected)
+
+    # The same data published for the web dashboard
+    write_outputs(daily, str(tmp_path / "static"), export=False)
+    write_store(weekly, str(tmp_path / "static" / "ohlc_weekly.col"))
+    static = StaticSource(str(tmp_path / "static"))
+    bars = asyncio.run(static.aaggregate(tickers, "weekly", start=start))
+    assert_same_table(bars, expected)
+
+
+def test_sources_without_aggregates_resample(tmp_path):
+    daily = synthetic_table(2, 40)
+    write_store(daily, str(tmp_path / "stock_data.col"))
+    bars = LocalSource(str(tmp_path / "stock_data.col")).aggregate(daily.tickers, "monthly")
+    assert_same_table(bars, resample(daily, "monthly"))
+    assert_same_table(LocalSource(str(tmp_path / "stock_data.col")).aggregate(daily.tickers, "daily"),
+                      concat_tables([daily]))
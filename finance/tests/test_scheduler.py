@@ -0,0 +1,145 @@
+import random
+
+import pytest
+
+from marketdata.scheduler import (
+    BudgetExhausted,
+    DailyBudget,
+    RetryableError,
+    RetryPolicy,
+    Scheduler,
+    StopScheduling,
+    TokenBucket,
+    plan_rotation,
+)
+
+
+class FakeClock:
+    """Monotonic clock whose sleep() just advances the time."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def scheduler(limit=100, attempts=3, workers=1, per_minute=600):
+    clock = FakeClock()
+    bucket = TokenBucket(per_minute, per=60.0, clock=clock, sleep=clock.sleep)
+    retry = RetryPolicy(attempts=attempts, base_delay=1.0, rng=random.Random(0))
+    return Scheduler(bucket, DailyBudget(limit), retry, workers=workers, sleep=clock.sleep), clock
+
+
+def test_token_bucket_allows_a_burst_then_waits_for_the_rate():
+    clock = FakeClock()
+    bucket = TokenBucket(5, per=60.0, clock=clock, sleep=clock.sleep)
+    for _ in range(5):
+        bucket.acquire()
+    assert clock.sleeps == []
+    bucket.acquire()
+    assert clock.sleeps == [pytest.approx(12.0)]
+
+
+def test_token_bucket_refills_up_to_capacity():
+    clock = FakeClock()
+    bucket = TokenBucket(5, per=60.0, capacity=2, clock=clock, sleep=clock.sleep)
+    clock.now = 3600.0
+    bucket.acquire()
+    bucket.acquire()
+    assert clock.sleeps == []
+    bucket.acquire()
+    assert len(clock.sleeps) == 1
+
+
+def test_daily_budget_raises_once_used_up():
+    budget = DailyBudget(2, used=1)
+    assert budget.remaining == 1
+    budget.take()
+    assert budget.remaining == 0
+    with pytest.raises(BudgetExhausted):
+        budget.take()
+    assert budget.used == 2
+
+
+def test_retry_delay_is_bounded_exponential_backoff():
+    policy = RetryPolicy(base_delay=2.0, max_delay=10.0, rng=random.Random(1))
+    for attempt, cap in [(0, 2.0), (1, 4.0), (2, 8.0), (3, 10.0), (6, 10.0)]:
+        delays = [policy.delay(attempt) for _ in range(50)]
+        assert min(delays) >= 0 and max(delays) <= cap
+
+
+def test_scheduler_retries_retryable_errors_and_counts_every_attempt():
+    sched, clock = scheduler(attempts=3)
+    failures = {"A": 2}
+
+    def call(item):
+        if failures.get(item):
+            failures[item] -= 1
+            raise RetryableError("HTTP 503")
+        return item.lower()
+
+    assert sched.run(call, ["A", "B"]) == {"A": "a", "B": "b"}
+    assert sched.budget.used == 4
+    assert len(clock.sleeps) == 2
+
+
+def test_scheduler_gives_up_after_the_last_attempt():
+    sched, _ = scheduler(attempts=2)
+
+    def call(item):
+        raise RetryableError("rate limited")
+
+    result = sched.run(call, ["A"])
+    assert isinstance(result["A"], RetryableError)
+    assert sched.budget.used == 2
+
+
+def test_permanent_errors_are_not_retried():
+    sched, _ = scheduler()
+
+    def call(item):
+        raise ValueError("bad symbol")
+
+    assert isinstance(sched.run(call, ["A"])["A"], ValueError)
+    assert sched.budget.used == 1
+
+
+def test_stop_scheduling_skips_the_remaining_items():
+    sched, _ = scheduler()
+    called = []
+
+    def call(item):
+        called.append(item)
+        if item == "B":
+            raise StopScheduling("daily quota")
+        return item
+
+    result = sched.run(call, ["A", "B", "C", "D"])
+    assert result["A"] == "A"
+    assert all(isinstance(result[t], StopScheduling) for t in "BCD")
+    assert called == ["A", "B"]
+
+
+def test_budget_exhaustion_stops_the_run():
+    sched, _ = scheduler(limit=2)
+    result = sched.run(str.lower, ["A", "B", "C"])
+    assert result["A"] == "a" and result["B"] == "b"
+    assert isinstance(result["C"], BudgetExhausted)
+
+
+def test_imap_streams_every_item():
+    sched, _ = scheduler(workers=4)
+    assert dict(sched.imap(str.lower, list("ABCDEFGH"), window=3)) == {c: c.lower() for c in "ABCDEFGH"}
+
+
+def test_plan_rotation_pins_first_then_stalest():
+    last = {"B": "2025-08-01", "C": "2025-07-01"}
+    assert plan_rotation(["A", "B", "C", "D"], last, 3, pinned=["SPY"]) == ["SPY", "A", "D"]
+    assert plan_rotation(["A", "B", "C", "D"], last, 4) == ["A", "D", "C", "B"]
+    assert plan_rotation(["A"], {}, 1, pinned=["SPY", "AAPL"]) == ["SPY"]
@@ -0,0 +1,41 @@
+import numpy as np
+
+from benchmarks.synthetic import synthetic_table
+from marketdata.sectors import SectorMap, cached_sector_index, sector_index
+from marketdata.sources import LocalSource
+from marketdata.store import write_store
+
+
+def sector_map(table):
+    names = table.tickers
+    return SectorMap(names, names, ["Tech" if i % 2 else "Energy" for i in range(len(names))])
+
+
+def test_cached_on_the_store_version(tmp_path):
+    path = str(tmp_path / "stock_data.col")
+    daily = synthetic_table(4, 60)
+    sectors = sector_map(daily)
+    write_store(daily, path)
+    source = LocalSource(path)
+
+    table = source.load(daily.tickers)
+    first = cached_sector_index(table, sectors, version=source.version())
+    assert cached_sector_index(source.load(daily.tickers), sectors, version=source.version()) is first
+
+    # Revised closes: same rows and last date, new store version
+    version = source.version()
+    close = daily["Close"].copy()
+    close[10:20] *= 1.1
+    daily.columns["Close"] = close
+    write_store(daily, path)
+    assert source.version() != version
+    revised = cached_sector_index(source.load(daily.tickers), sectors, version=source.version())
+    assert revised is not first
+    assert not np.allclose(revised["Close"], first["Close"])
+    np.testing.assert_allclose(revised["Close"], sector_index(source.load(daily.tickers), sectors)["Close"])
+
+
+def test_without_a_version_nothing_is_cached():
+    daily = synthetic_table(4, 30)
+    sectors = sector_map(daily)
+    assert cached_sector_index(daily, sectors) is not cached_sector_index(daily, sectors)
@@ -0,0 +1,44 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from benchmarks.synthetic import synthetic_table
+from marketdata.collector import write_outputs
+from marketdata.sources import Source, StaticSource
+
+
+@pytest.fixture
+def static(tmp_path):
+    daily = synthetic_table(3, 30)
+    write_outputs(daily, str(tmp_path), export=False)
+    return daily, StaticSource(str(tmp_path))
+
+
+def test_backends_must_implement_load():
+    class Incomplete(Source):
+        name = "incomplete"
+
+    with pytest.raises(TypeError, match="_load"):
+        Incomplete()
+
+
+def test_static_load_outside_an_event_loop(static):
+    daily, source = static
+    table = source.load(["T001"], start=np.datetime64("2015-01-15"))
+    assert table.ticker_names().tolist() == ["T001"] * len(table)
+    assert table["Date"].min() >= np.datetime64("2015-01-15")
+    assert source.aggregate(["T001"], "weekly") is not None
+
+
+def test_static_sync_entry_points_refuse_a_running_loop(static):
+    _, source = static
+
+    async def main():
+        with pytest.raises(RuntimeError, match=r"await source\.aload"):
+            source.load(["T001"])
+        with pytest.raises(RuntimeError, match=r"await source\.aaggregate"):
+            source.aggregate(["T001"], "weekly")
+        return await source.aload(["T001"])
+
+    assert len(asyncio.run(main())) > 0
@@ -0,0 +1,9 @@
+from benchmarks.suite import run_size
+
+
+def test_suite_runs_both_notebooks(tmp_path):
+    # Catches notebook signature changes (e.g. a function becoming async) the suite depends on
+    results = {r["case"]: r for r in run_size(4, 100, 1, str(tmp_path))}
+    for case in ("desktop.create_price_chart", "web.load_real_data", "web.create_price_chart"):
+        assert results[case]["seconds"] > 0
+    assert results["web.create_price_chart"]["spec_bytes"] > 0
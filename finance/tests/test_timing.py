@@ -0,0 +1,18 @@
+from benchmarks.synthetic import synthetic_table
+from marketdata.index import TickerIndex
+from marketdata.store import PriceTable
+from marketdata.timing import timeline
+
+
+def test_filter_and_date_spans():
+    table = synthetic_table(3, 20)
+    timeline.begin_run("test")
+    selected = TickerIndex(table).select(["T001"], start="2015-01-10")
+    selected.to_frame()
+    PriceTable.from_records(selected.to_records())
+
+    spans = {}
+    for span in timeline.latest():
+        spans.setdefault(span["stage"], []).append(span)
+    assert [(s["tickers"], s["rows"]) for s in spans["filter"]] == [(1, len(selected))]
+    assert [s["rows"] for s in spans["dates"]] == [len(selected), len(selected)]
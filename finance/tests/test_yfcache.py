@@ -0,0 +1,153 @@
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import synthetic_table
+from marketdata.index import TickerIndex
+from marketdata.reshape import table_to_wide
+from marketdata.yfcache import YFinanceCache
+
+TODAY = date.today()
+
+
+class FakeDownload:
+    """yf.download stand-in over a fixed table; records every call and can fail on request."""
+
+    def __init__(self, table):
+        self.index = TickerIndex(table)
+        self.calls = []
+        self.fail_next = 0
+        self.drop = set()
+
+    def __call__(self, tickers, start=None, end=None, progress=False):
+        self.calls.append((tuple(tickers), date.fromisoformat(start), date.fromisoformat(end)))
+        if self.fail_next:
+            # yf.download reports network and rate-limit errors as an empty frame
+            self.fail_next -= 1
+            return pd.DataFrame()
+        present = [t for t in tickers if t in self.index and t not in self.drop]
+        # `end` is exclusive, as in yfinance
+        table = self.index.select(present, start, date.fromisoformat(end) - timedelta(days=1))
+        return table_to_wide(table, tickers)
+
+
+@pytest.fixture
+def market():
+    return synthetic_table(4, 400, end=TODAY)
+
+
+@pytest.fixture
+def download(market):
+    return FakeDownload(market)
+
+
+@pytest.fixture
+def store(tmp_path, download):
+    clock = [1_000_000.0]
+    store = YFinanceCache(str(tmp_path), download=download, ttl=900, clock=lambda: clock[0])
+    store.advance = lambda seconds: clock.__setitem__(0, clock[0] + seconds)
+    return store
+
+
+def expected(market, tickers, start, end=TODAY):
+    return TickerIndex(market).select(tickers, start, end)
+
+
+def assert_rows(table, reference):
+    np.testing.assert_array_equal(table.ticker_names(), reference.ticker_names())
+    np.testing.assert_array_equal(table["Date"], reference["Date"])
+    np.testing.assert_allclose(table["Close"], reference["Close"])
+
+
+def test_repeat_request_makes_no_network_call(store, download, market):
+    start = TODAY - timedelta(days=90)
+    first = store.table(["T000", "T001"], start)
+    second = store.table(["T000", "T001"], start)
+    assert len(download.calls) == 1
+    assert_rows(first, expected(market, ["T000", "T001"], start))
+    assert_rows(second, first)
+
+
+def test_new_ticker_downloads_only_that_ticker(store, download, market):
+    start = TODAY - timedelta(days=90)
+    store.table(["T000"], start)
+    table = store.table(["T000", "T002"], start)
+    assert download.calls[1] == (("T002",), start, TODAY + timedelta(days=1))
+    assert_rows(table, expected(market, ["T000", "T002"], start))
+
+
+def test_longer_period_downloads_only_the_earlier_days(store, download, market):
+    store.table(["T000", "T001"], TODAY - timedelta(days=90))
+    first_bar = date.fromisoformat(store.coverage()["T000"]["first_bar"])
+    start = TODAY - timedelta(days=365)
+    table = store.table(["T000", "T001"], start)
+    # One call for both tickers, up to (and including) the first cached bar
+    assert download.calls[1:] == [(("T000", "T001"), start, first_bar + timedelta(days=1))]
+    assert_rows(table, expected(market, ["T000", "T001"], start))
+    store.table(["T000", "T001"], start)
+    assert len(download.calls) == 2
+
+
+def test_last_bar_is_refetched_after_the_ttl(store, download, market):
+    start = TODAY - timedelta(days=30)
+    store.table(["T000"], start)
+    store.advance(600)
+    store.table(["T000"], start)
+    assert len(download.calls) == 1
+
+    # The session goes on: the last bar's close changes upstream
+    index = TickerIndex(market)
+    last = index.slices["T000"][1] - 1
+    market["Close"][last] += 5.0
+    store.advance(600)
+    table = store.table(["T000"], start)
+    last_bar = market["Date"][last].astype(object)
+    assert download.calls[1] == (("T000",), last_bar, TODAY + timedelta(days=1))
+    assert table["Close"][-1] == market["Close"][last]
+
+
+def test_failed_download_is_retried(store, download, market):
+    start = TODAY - timedelta(days=90)
+    download.fail_next = 1
+    assert len(store.table(["T000", "T001"], start)) == 0
+    assert store.coverage() == {}
+    table = store.table(["T000", "T001"], start)
+    assert len(download.calls) == 2
+    assert_rows(table, expected(market, ["T000", "T001"], start))
+
+
+def test_failed_delta_keeps_the_cached_bars(store, download, market):
+    start = TODAY - timedelta(days=90)
+    store.table(["T000"], start)
+    coverage = store.coverage()["T000"]
+    download.fail_next = 1
+    earlier = TODAY - timedelta(days=200)
+    assert_rows(store.table(["T000"], earlier), expected(market, ["T000"], start))
+    assert store.coverage()["T000"] == coverage
+    assert_rows(store.table(["T000"], earlier), expected(market, ["T000"], earlier))
+    assert len(download.calls) == 3
+
+
+def test_tickers_missing_from_the_response_are_retried(store, download, market):
+    start = TODAY - timedelta(days=90)
+    download.drop = {"T001"}
+    table = store.table(["T000", "T001"], start)
+    assert set(table.ticker_names()) == {"T000"}
+    assert "T001" not in store.coverage()
+    download.drop = set()
+    table = store.table(["T000", "T001"], start)
+    assert download.calls[-1][0] == ("T001",)
+    assert_rows(table, expected(market, ["T000", "T001"], start))
+
+
+def test_range_of_weekends_and_holidays_is_covered_after_one_call(store, download, market):
+    # Cached from a Monday; the new period starts on the Saturday before it
+    monday = np.busday_offset(np.datetime64(TODAY - timedelta(days=60)), 0, roll="forward").astype(object)
+    store.table(["T000"], monday)
+    saturday = monday - timedelta(days=2)
+    store.table(["T000"], saturday)
+    store.table(["T000"], saturday)
+    assert len(download.calls) == 2
+    assert store.coverage()["T000"]["start"] == saturday.isoformat()